@@ -0,0 +1,21 @@
+from accounts.models import Account
+from common.filters import (
+    ContainsFilter,
+    Filter,
+    FilterSet,
+    RelatedFilter,
+    SearchFilter,
+)
+
+
+class AccountFilterSet(FilterSet):
+    model = Account
+
+    name = ContainsFilter("name")
+    city = ContainsFilter("city")
+    industry = Filter("industry")
+    tags = RelatedFilter("tags")
+    assigned_to = RelatedFilter("assigned_to")
+    search = SearchFilter()
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
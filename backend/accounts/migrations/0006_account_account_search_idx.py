@@ -0,0 +1,19 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_add_currency_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector(models.Func(models.F('name'), models.Value('[\\W_]+'), models.Value(' '), models.Value('g'), function='REGEXP_REPLACE', output_field=models.TextField()), config='simple', weight='A'), name='account_search_idx'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_account_account_search_idx"),
+    ]
+
+    operations = [
+        add_trigram_indexes("accounts.Account", ("name", "city")),
+    ]
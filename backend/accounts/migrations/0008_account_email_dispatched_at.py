@@ -0,0 +1,46 @@
+# Track when scheduled account emails are dispatched
+
+from django.db import migrations, models
+
+from common.rls import get_set_local_context_sql
+
+
+def mark_scheduled_dispatched(apps, schema_editor):
+    """
+    Scheduled emails so far were sent right away, so none is left to
+    dispatch.
+    """
+    Org = apps.get_model("common", "Org")
+    AccountEmail = apps.get_model("accounts", "AccountEmail")
+    with schema_editor.connection.cursor() as cursor:
+        for org in Org.objects.all():
+            cursor.execute(get_set_local_context_sql(), [str(org.id)])
+            AccountEmail.objects.filter(org_id=org.id, scheduled_later=True).update(
+                dispatched_at=models.F("created_at")
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_account_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountemail",
+            name="dispatched_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="accountemail",
+            index=models.Index(
+                condition=models.Q(("dispatched_at__isnull", True), ("scheduled_later", True)),
+                fields=["org", "scheduled_date_time"],
+                name="account_email_due_idx",
+            ),
+        ),
+        migrations.RunPython(
+            mark_scheduled_dispatched, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Keep one AccountEmailLog per email and contact before making them unique
+
+from django.db import migrations
+
+from common.rls import get_set_local_context_sql
+
+
+def dedupe_email_logs(apps, schema_editor):
+    """Keep the sent log of a contact if any, else its latest one."""
+    Org = apps.get_model("common", "Org")
+    with schema_editor.connection.cursor() as cursor:
+        for org in Org.objects.all():
+            cursor.execute(get_set_local_context_sql(), [str(org.id)])
+            cursor.execute(
+                'DELETE FROM "emailLogs" a USING "emailLogs" b '
+                "WHERE a.org_id = %s AND b.org_id = a.org_id "
+                "AND a.email_id = b.email_id AND a.contact_id = b.contact_id "
+                "AND (a.is_sent, a.created_at, a.id) < (b.is_sent, b.created_at, b.id)",
+                [str(org.id)],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_account_email_dispatched_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_email_logs, reverse_code=migrations.RunPython.noop),
+    ]
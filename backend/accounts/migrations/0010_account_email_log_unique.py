@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-18 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_dedupe_account_email_logs'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='accountemaillog',
+            constraint=models.UniqueConstraint(fields=('email', 'contact'), name='unique_email_log_per_contact'),
+        ),
+    ]
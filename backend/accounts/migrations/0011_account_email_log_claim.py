@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-18 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_account_email_log_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accountemaillog',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='accountemaillog',
+            name='claimed_by',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.utils.translation import pgettext_lazy
 
 from common.base import AssignableMixin, BaseModel
 from common.models import Org, Profile, Tags, Teams
+from common.search import search_index
 from common.utils import COUNTRIES, CURRENCY_CODES, INDCHOICES
 from contacts.models import Contact
 
@@ -14,12 +15,20 @@ from contacts.models import Contact
 # - Removed 'contact_values' property (unused)
 
 
+# Columns of the full-text `search` by weight (common.search)
+ACCOUNT_SEARCH_FIELDS = {"A": ("name",)}
+
+
 class Account(AssignableMixin, BaseModel):
     """
     Account model for CRM - Streamlined for modern sales workflow
     Based on Twenty CRM and Salesforce patterns
     """
 
+    SEARCH_FIELDS = ACCOUNT_SEARCH_FIELDS
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("name", "city")
+
     # Core Account Information
     name = models.CharField(_("Account Name"), max_length=255)
     email = models.EmailField(_("Email"), blank=True, null=True)
@@ -79,6 +88,7 @@ class Account(AssignableMixin, BaseModel):
             models.Index(fields=["name"]),
             models.Index(fields=["industry"]),
             models.Index(fields=["org", "-created_at"]),
+            search_index(ACCOUNT_SEARCH_FIELDS, "account_search_idx"),
         ]
 
     def __str__(self):
@@ -97,6 +107,8 @@ class AccountEmail(BaseModel):
     scheduled_later = models.BooleanField(default=False)
     from_email = models.EmailField()
     rendered_message_body = models.TextField(null=True)
+    # When a scheduled email was handed to the sender (send_scheduled_emails)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
     org = models.ForeignKey(
         Org,
         on_delete=models.CASCADE,
@@ -110,6 +122,12 @@ class AccountEmail(BaseModel):
         ordering = ("-created_at",)
         indexes = [
             models.Index(fields=["org", "-created_at"]),
+            # Scheduled emails not dispatched yet
+            models.Index(
+                fields=["org", "scheduled_date_time"],
+                condition=models.Q(scheduled_later=True, dispatched_at__isnull=True),
+                name="account_email_due_idx",
+            ),
         ]
 
     def __str__(self):
@@ -144,6 +162,9 @@ class AccountEmailLog(BaseModel):
         Contact, related_name="contact_email_log", on_delete=models.SET_NULL, null=True
     )
     is_sent = models.BooleanField(default=False)
+    # Task sending to the contact (accounts.tasks.send_email_chunk), and since when
+    claimed_by = models.CharField(max_length=255, blank=True, default="")
+    claimed_at = models.DateTimeField(blank=True, null=True)
     org = models.ForeignKey(
         Org,
         on_delete=models.CASCADE,
@@ -158,6 +179,11 @@ class AccountEmailLog(BaseModel):
         indexes = [
             models.Index(fields=["org", "-created_at"]),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["email", "contact"], name="unique_email_log_per_contact"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.email.message_subject}"
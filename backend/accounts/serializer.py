@@ -1,16 +1,30 @@
+from django.db.models import Prefetch
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from accounts.models import Account, AccountEmail, AccountEmailLog
 from common.serializer import (
+    ATTACHMENT_RELATION,
+    ORG_RELATION,
+    PROFILE_RELATION,
+    TAG_RELATION,
+    TEAM_RELATION,
+    USER_RELATION,
     AttachmentsSerializer,
     OrganizationSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TagsSerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
     UserSerializer,
 )
-from contacts.serializer import ContactSerializer
+from common.sparse_fields import Relation, SparseFieldsMixin, SparseListSerializer
+from contacts.serializer import (
+    CONTACT_RELATION,
+    ContactSerializer,
+    ContactSummarySerializer,
+)
 
 
 # Note: Removed unused serializer properties that were computed but never used by frontend:
@@ -73,8 +87,88 @@ class AccountSerializer(serializers.ModelSerializer):
         )
 
 
+class AccountListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Account for list rows (see common.sparse_fields)"""
+
+    created_by = UserSerializer(read_only=True)
+    tags = TagsSerializer(read_only=True, many=True)
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    contacts = ContactSummarySerializer(read_only=True, many=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    account_attachment = AttachmentsSerializer(read_only=True, many=True)
+    country_display = serializers.SerializerMethodField()
+
+    @extend_schema_field(str)
+    def get_country_display(self, obj):
+        return obj.get_country_display() if obj.country else None
+
+    class Meta:
+        model = Account
+        list_serializer_class = SparseListSerializer
+        fields = (
+            "id",
+            "name",
+            "email",
+            "phone",
+            "website",
+            "industry",
+            "number_of_employees",
+            "annual_revenue",
+            "currency",
+            "address_line",
+            "city",
+            "state",
+            "postcode",
+            "country",
+            "country_display",
+            "assigned_to",
+            "teams",
+            "contacts",
+            "tags",
+            "description",
+            "created_by",
+            "created_at",
+            "is_active",
+            "org",
+            "account_attachment",
+        )
+        relations = {
+            "created_by": USER_RELATION,
+            "tags": TAG_RELATION,
+            "assigned_to": PROFILE_RELATION,
+            "contacts": CONTACT_RELATION,
+            "teams": TEAM_RELATION,
+            "org": ORG_RELATION,
+            "account_attachment": ATTACHMENT_RELATION,
+        }
+        columns = {"country_display": ("country",)}
+
+
+class AccountSummarySerializer(serializers.ModelSerializer):
+    """Compact account for the list rows of other entities"""
+
+    class Meta:
+        model = Account
+        fields = ("id", "name")
+
+
+ACCOUNT_RELATION = Relation(
+    Account.objects.only("id", "name"),
+    expanded=AccountSerializer,
+    expanded_queryset=Account.objects.select_related(
+        "created_by", "org"
+    ).prefetch_related(
+        "tags",
+        Prefetch("assigned_to", queryset=PROFILE_RELATION.expanded_queryset),
+        Prefetch("contacts", queryset=CONTACT_RELATION.expanded_queryset),
+        Prefetch("teams", queryset=TEAM_RELATION.expanded_queryset),
+    ),
+)
+
+
 class EmailSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
+        kwargs.pop("request_obj", None)
         super().__init__(*args, **kwargs)
 
     class Meta:
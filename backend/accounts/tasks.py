@@ -1,89 +1,256 @@
-from celery import Celery
+import logging
+from datetime import timedelta
+from functools import partial
+
+from celery import chain
+from celery.exceptions import MaxRetriesExceededError
 from django.conf import settings
 from django.core.mail import EmailMessage
-from django.template import Context, Template
-from django.template.loader import render_to_string
+from django.db import connection, transaction
+from django.db.models import Q
+from django.template import Context, Template, TemplateSyntaxError
+from django.utils import timezone
 
 from accounts.models import Account, AccountEmail, AccountEmailLog
-from common.models import Profile
+from common.models import Org
+from common.notifications import MAX_RETRY_DELAY, notify_profiles, send_messages
+from common.rls import get_set_local_context_sql
 from common.tasks import set_rls_context
+from contacts.models import Contact
+from crm.celery import app
 
-app = Celery("redis://")
+logger = logging.getLogger(__name__)
 
 
-@app.task
-def send_email(email_obj_id, org_id):
+def _contact_context(contact):
+    """Template variables of a campaign recipient"""
+    return {
+        "email": contact.email if contact.email else "",
+        "name": (
+            contact.first_name
+            if contact.first_name
+            else ("" + " " + contact.last_name if contact.last_name else "")
+        ),
+    }
+
+
+def _sent_contact_ids(email_obj, contact_ids=None):
+    """Ids of the contacts email_obj was already sent to (one query)"""
+    logs = AccountEmailLog.objects.filter(email=email_obj, is_sent=True)
+    if contact_ids is not None:
+        logs = logs.filter(contact_id__in=contact_ids)
+    return set(logs.values_list("contact_id", flat=True))
+
+
+@app.task(bind=True)
+def send_email(self, email_obj_id, org_id):
+    """
+    Send an account email to its recipients not sent to yet.
+
+    The recipients are split in chunks of ACCOUNT_EMAIL_CHUNK_SIZE, sent by
+    send_email_chunk subtasks in at most ACCOUNT_EMAIL_CONCURRENCY chains
+    running side by side. Sent recipients are logged in AccountEmailLog, so
+    calling this again resumes an interrupted campaign.
+    """
     set_rls_context(org_id)
     email_obj = AccountEmail.objects.filter(id=email_obj_id).first()
-    if email_obj:
-        from_email = email_obj.from_email
-        contacts = email_obj.recipients.all()
-        for contact_obj in contacts:
-            if not AccountEmailLog.objects.filter(
-                email=email_obj, contact=contact_obj, is_sent=True
-            ).exists():
-                html = email_obj.message_body
-                context_data = {
-                    "email": contact_obj.email if contact_obj.email else "",
-                    "name": (
-                        contact_obj.first_name
-                        if contact_obj.first_name
-                        else (
-                            "" + " " + contact_obj.last_name
-                            if contact_obj.last_name
-                            else ""
-                        )
-                    ),
-                }
-                try:
-                    html_content = Template(html).render(Context(context_data))
-                    subject = email_obj.message_subject
-                    msg = EmailMessage(
-                        subject,
-                        html_content,
-                        from_email=from_email,
-                        to=[
-                            contact_obj.email,
-                        ],
-                    )
-                    msg.content_subtype = "html"
-                    res = msg.send()
-                    if res:
-                        email_obj.rendered_message_body = html_content
-                        email_obj.save()
-                        AccountEmailLog.objects.create(
-                            email=email_obj, contact=contact_obj, is_sent=True
-                        )
-                except Exception:
-                    pass
+    if not email_obj:
+        return 0
+    sent = _sent_contact_ids(email_obj)
+    pending = [
+        str(contact_id)
+        for contact_id in email_obj.recipients.order_by("id").values_list(
+            "id", flat=True
+        )
+        if contact_id not in sent
+    ]
+    size = getattr(settings, "ACCOUNT_EMAIL_CHUNK_SIZE", 200)
+    chunks = [pending[i : i + size] for i in range(0, len(pending), size)]
+    lanes = max(1, getattr(settings, "ACCOUNT_EMAIL_CONCURRENCY", 4))
+    for lane in range(min(lanes, len(chunks))):
+        subtasks = chain(
+            *[
+                send_email_chunk.si(str(email_obj.id), contact_ids, org_id)
+                for contact_ids in chunks[lane::lanes]
+            ]
+        )
+        # Eager runs have no broker to hand the chunks to
+        subtasks.apply() if self.request.is_eager else subtasks.apply_async()
+    return len(pending)
 
 
-@app.task
-def send_email_to_assigned_user(recipients, account_id, org_id):
-    """Send Mail To Users When they are assigned to an account"""
+def _claim_recipients(email_obj, contact_ids, owner):
+    """
+    Claim the unsent recipients of email_obj among contact_ids for owner.
+
+    Claimable are the rows nobody claimed, the rows owner claimed before (a
+    retry or redelivery of the same task) and the rows whose claim is older
+    than ACCOUNT_EMAIL_CLAIM_TIMEOUT. Rows claimed concurrently are skipped.
+    Returns the claimed contact ids.
+    """
+    now = timezone.now()
+    timeout = getattr(settings, "ACCOUNT_EMAIL_CLAIM_TIMEOUT", 900)
+    claimable = (
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=now - timedelta(seconds=timeout))
+    )
+    if owner:
+        claimable |= Q(claimed_by=owner)
+    with transaction.atomic():
+        claimed = list(
+            AccountEmailLog.objects.filter(
+                claimable, email=email_obj, contact_id__in=contact_ids, is_sent=False
+            )
+            .select_for_update(skip_locked=True)
+            .values_list("contact_id", flat=True)
+        )
+        AccountEmailLog.objects.filter(
+            email=email_obj, contact_id__in=claimed
+        ).update(claimed_by=owner, claimed_at=now)
+    return claimed
+
+
+@app.task(bind=True)
+def send_email_chunk(self, email_obj_id, contact_ids, org_id):
+    """
+    Send an account email to a chunk of its recipients over one connection.
+
+    Every recipient has an AccountEmailLog row (unique per email and
+    contact), created pending here if missing. The chunk first claims the
+    unsent rows for its task id and commits (_claim_recipients), then marks
+    each contact sent right after its message went out. A chunk running
+    twice, or overlapping another run of the campaign, skips the contacts
+    the other has claimed or sent.
+
+    Delivery is at least once for a single message: if the worker dies
+    between sending one and marking it, the redelivered task sends it
+    again. Contacts left unsent after the retries are released for a resend.
+    """
     set_rls_context(org_id)
-    account = Account.objects.filter(id=account_id).first()
-    if not account:
-        return
-    created_by = account.created_by
-
-    for profile_id in recipients:
-        recipients_list = []
-        profile = Profile.objects.filter(id=profile_id, is_active=True).first()
-        if profile:
-            recipients_list.append(profile.user.email)
-            context = {}
-            context["url"] = settings.DOMAIN_NAME
-            context["user"] = profile.user
-            context["account"] = account
-            context["created_by"] = created_by
-            subject = "Assigned a account for you."
-            html_content = render_to_string(
-                "assigned_to/account_assigned.html", context=context
+    email_obj = AccountEmail.objects.filter(id=email_obj_id).first()
+    if not email_obj:
+        return 0
+    try:
+        template = Template(email_obj.message_body)
+    except TemplateSyntaxError:
+        logger.exception("Account email %s has an invalid template", email_obj_id)
+        return 0
+
+    AccountEmailLog.objects.bulk_create(
+        [
+            AccountEmailLog(
+                email=email_obj, contact_id=contact_id, org_id=email_obj.org_id
+            )
+            for contact_id in contact_ids
+        ],
+        ignore_conflicts=True,
+    )
+    claimed = _claim_recipients(email_obj, contact_ids, self.request.id or "")
+    contacts = Contact.objects.filter(id__in=claimed).exclude(email__isnull=True)
+    messages = {}
+    for contact in contacts.exclude(email="").only("email", "first_name", "last_name"):
+        msg = EmailMessage(
+            email_obj.message_subject,
+            template.render(Context(_contact_context(contact))),
+            from_email=email_obj.from_email,
+            to=[contact.email],
+        )
+        msg.content_subtype = "html"
+        messages[contact.id] = msg
+    if not messages:
+        return 0
+
+    def mark_sent(contact_id):
+        AccountEmailLog.objects.filter(email=email_obj, contact_id=contact_id).update(
+            is_sent=True
+        )
+
+    # Bulk email has its own pace (ACCOUNT_EMAIL_CONCURRENCY), not the
+    # notifications' rate limit
+    unsent, _ = send_messages(messages, org_id, rate_limited=False, on_sent=mark_sent)
+    done = [contact_id for contact_id in messages if contact_id not in unsent]
+    if done:
+        AccountEmail.objects.filter(
+            id=email_obj.id, rendered_message_body__isnull=True
+        ).update(rendered_message_body=messages[done[0]].body)
+
+    if unsent:
+        backoff = getattr(settings, "NOTIFICATION_RETRY_BACKOFF", 30)
+        try:
+            raise self.retry(
+                args=(email_obj_id, [str(contact_id) for contact_id in unsent], org_id),
+                countdown=min(backoff * 2**self.request.retries, MAX_RETRY_DELAY),
+                max_retries=getattr(settings, "NOTIFICATION_MAX_RETRIES", 5),
+            )
+        except MaxRetriesExceededError:
+            # Leave them to a resend, and let the rest of the chain go on
+            AccountEmailLog.objects.filter(
+                email=email_obj, contact_id__in=unsent, is_sent=False
+            ).update(claimed_by="", claimed_at=None)
+            logger.error(
+                "Account email %s not sent to %d contacts", email_obj_id, len(unsent)
+            )
+    return len(done)
+
+
+@app.task
+def send_scheduled_emails(org_id=None):
+    """
+    Hand the due scheduled account emails to send_email.
+
+    Each org's due emails (up to SCHEDULED_EMAIL_BATCH_SIZE, oldest first)
+    are claimed with SELECT ... FOR UPDATE SKIP LOCKED and marked
+    dispatched in one transaction, so dispatchers running side by side
+    never claim the same email. The sends are queued once it commits.
+    """
+    now = timezone.now()
+    batch_size = getattr(settings, "SCHEDULED_EMAIL_BATCH_SIZE", 100)
+    orgs = Org.objects.all() if org_id is None else Org.objects.filter(id=org_id)
+    claimed = 0
+    for org_pk in orgs.values_list("id", flat=True).iterator():
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(get_set_local_context_sql(), [str(org_pk)])
+            due = list(
+                AccountEmail.objects.filter(
+                    org_id=org_pk,
+                    scheduled_later=True,
+                    dispatched_at__isnull=True,
+                    scheduled_date_time__lte=now,
+                )
+                .order_by("scheduled_date_time")
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:batch_size]
             )
+            if not due:
+                continue
+            AccountEmail.objects.filter(id__in=due).update(dispatched_at=now)
+            transaction.on_commit(partial(_queue_emails, due, str(org_pk)))
+        claimed += len(due)
+    return claimed
 
-            msg = EmailMessage(subject, html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
 
+def _queue_emails(email_ids, org_id):
+    for email_id in email_ids:
+        send_email.delay(str(email_id), org_id)
 
+
+@app.task(bind=True)
+def send_email_to_assigned_user(self, recipients, account_id, org_id):
+    """Send Mail To Users When they are assigned to an account"""
+    set_rls_context(org_id)
+    account = Account.objects.select_related("created_by").filter(id=account_id).first()
+    if not account:
+        return 0
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        "Assigned a account for you.",
+        "assigned_to/account_assigned.html",
+        {
+            "url": settings.DOMAIN_NAME,
+            "account": account,
+            "created_by": account.created_by,
+        },
+    )
@@ -0,0 +1,224 @@
+"""
+Tests for the chunked account email campaigns and their scheduling.
+
+Run with: pytest accounts/tests.py -v
+"""
+
+import json
+import smtplib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import override_settings
+from django.utils import timezone
+
+from accounts.models import Account, AccountEmail, AccountEmailLog
+from accounts.tasks import send_email, send_email_chunk, send_scheduled_emails
+from common.tests.base import OrgTestCase
+from contacts.models import Contact
+
+
+class FailOnceBackend(EmailBackend):
+    """locmem backend failing the first message to FAIL_FOR."""
+
+    FAIL_FOR = "contact2@test.com"
+    failed = False
+
+    def send_messages(self, messages):
+        if not FailOnceBackend.failed and self.FAIL_FOR in messages[0].to:
+            FailOnceBackend.failed = True
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        return super().send_messages(messages)
+
+
+@override_settings(ACCOUNT_EMAIL_CHUNK_SIZE=2, ACCOUNT_EMAIL_CONCURRENCY=2)
+class TestAccountEmailCampaign(OrgTestCase):
+    org_name = "Campaign Org"
+
+    def setUp(self):
+        super().setUp()
+        self.account = Account.objects.create(name="Acme", org=self.org)
+        self.contacts = [
+            Contact.objects.create(
+                first_name=f"Contact{i}",
+                last_name="Doe",
+                email=f"contact{i}@test.com" if i < 6 else None,
+                org=self.org,
+            )
+            for i in range(7)
+        ]
+        self.email = AccountEmail.objects.create(
+            from_account=self.account,
+            from_email="sales@test.com",
+            message_subject="News",
+            message_body="<p>Hi {{ name }}</p>",
+            org=self.org,
+        )
+        self.email.recipients.add(*self.contacts)
+        AccountEmailLog.objects.create(
+            email=self.email, contact=self.contacts[0], is_sent=True, org=self.org
+        )
+
+    def test_sends_each_pending_recipient_once(self):
+        send_email.apply((str(self.email.id), str(self.org.id)))
+
+        bodies = {msg.to[0]: msg.body for msg in mail.outbox}
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(
+            sorted(bodies), [f"contact{i}@test.com" for i in range(1, 6)]
+        )
+        self.assertIn("Hi Contact1", bodies["contact1@test.com"])
+        self.assertEqual(
+            AccountEmailLog.objects.filter(email=self.email, is_sent=True).count(), 6
+        )
+        self.email.refresh_from_db()
+        self.assertTrue(self.email.rendered_message_body.startswith("<p>Hi Contact"))
+
+        # A second run resumes with nothing left to send
+        send_email.apply((str(self.email.id), str(self.org.id)))
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_chunk_claims_each_recipient_once(self):
+        ids = [str(contact.id) for contact in self.contacts[:3]]
+        # contacts[0] is sent, contacts[1] left pending by an interrupted run
+        AccountEmailLog.objects.create(
+            email=self.email, contact=self.contacts[1], org=self.org
+        )
+
+        self.assertEqual(
+            send_email_chunk.apply((str(self.email.id), ids, str(self.org.id))).get(),
+            2,
+        )
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            ["contact1@test.com", "contact2@test.com"],
+        )
+        self.assertEqual(
+            AccountEmailLog.objects.filter(email=self.email).count(), 3
+        )
+
+        send_email_chunk.apply((str(self.email.id), ids, str(self.org.id)))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_claimed_recipients_are_skipped_until_abandoned(self):
+        ids = [str(contact.id) for contact in self.contacts[1:3]]
+        now = timezone.now()
+        for contact, claimed_at in (
+            (self.contacts[1], now),
+            (self.contacts[2], now - timedelta(hours=1)),
+        ):
+            AccountEmailLog.objects.create(
+                email=self.email,
+                contact=contact,
+                claimed_by="another-task",
+                claimed_at=claimed_at,
+                org=self.org,
+            )
+
+        send_email_chunk.apply((str(self.email.id), ids, str(self.org.id)))
+
+        self.assertEqual([msg.to[0] for msg in mail.outbox], ["contact2@test.com"])
+        self.assertEqual(
+            list(
+                AccountEmailLog.objects.filter(email=self.email, is_sent=False)
+                .values_list("contact_id", flat=True)
+            ),
+            [self.contacts[1].id],
+        )
+
+    @override_settings(
+        EMAIL_BACKEND="accounts.tests.FailOnceBackend", NOTIFICATION_RETRY_BACKOFF=0
+    )
+    def test_retry_resends_only_unsent_recipients(self):
+        FailOnceBackend.failed = False
+        ids = [str(contact.id) for contact in self.contacts[1:4]]
+
+        send_email_chunk.apply((str(self.email.id), ids, str(self.org.id)))
+
+        self.assertTrue(FailOnceBackend.failed)
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            ["contact1@test.com", "contact2@test.com", "contact3@test.com"],
+        )
+        self.assertFalse(
+            AccountEmailLog.objects.filter(
+                email=self.email, contact_id__in=ids, is_sent=False
+            ).exists()
+        )
+
+
+class TestScheduledAccountEmails(OrgTestCase):
+    org_name = "Schedule Org"
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_profile("schedule-admin@test.com", role="ADMIN")
+        self.account = Account.objects.create(name="Acme", org=self.org)
+        self.contact = Contact.objects.create(
+            first_name="Ada", last_name="Doe", email="ada@test.com", org=self.org
+        )
+
+    def schedule(self, minutes):
+        return AccountEmail.objects.create(
+            from_account=self.account,
+            from_email="sales@test.com",
+            message_subject="Later",
+            message_body="Hi",
+            scheduled_later=True,
+            scheduled_date_time=timezone.now() + timedelta(minutes=minutes),
+            org=self.org,
+        )
+
+    def test_due_emails_are_claimed_once(self):
+        due, later = self.schedule(-5), self.schedule(60)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(send_scheduled_emails.apply().get(), 1)
+        self.assertEqual(len(callbacks), 1)
+
+        due.refresh_from_db()
+        later.refresh_from_db()
+        self.assertIsNotNone(due.dispatched_at)
+        self.assertIsNone(later.dispatched_at)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(send_scheduled_emails.apply().get(), 0)
+        self.assertEqual(callbacks, [])
+
+    def test_schedule_in_the_email_timezone(self):
+        response = self.client_for(self.admin).post(
+            f"/api/accounts/{self.account.id}/create_mail/",
+            {
+                "from_email": "sales@test.com",
+                "message_subject": "Later",
+                "message_body": "Hi {{ name }}",
+                "timezone": "America/New_York",
+                "scheduled_later": "true",
+                "scheduled_date_time": "2030-01-15T09:00:00",
+                "recipients": json.dumps([str(self.contact.id)]),
+            },
+        )
+
+        self.assertFalse(response.json()["error"])
+        email = AccountEmail.objects.get(org=self.org)
+        self.assertEqual(
+            email.scheduled_date_time,
+            datetime(2030, 1, 15, 14, 0, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(list(email.recipients.all()), [self.contact])
+        self.assertEqual(mail.outbox, [])
+
+    def test_invalid_schedule_saves_nothing(self):
+        response = self.client_for(self.admin).post(
+            f"/api/accounts/{self.account.id}/create_mail/",
+            {
+                "from_email": "sales@test.com",
+                "message_subject": "Later",
+                "message_body": "Hi",
+                "scheduled_later": "true",
+                "recipients": json.dumps([str(self.contact.id)]),
+            },
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AccountEmail.objects.filter(org=self.org).exists())
@@ -1,31 +1,46 @@
 import json
 
+import pytz
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.generics import GenericAPIView
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from common.conditional import conditional_detail
+from common.facets import facet_counts
+from common.meta import include_reference_data
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from rest_framework.views import APIView
 
 from accounts import swagger_params
+from accounts.filters import AccountFilterSet
 from accounts.models import Account
 from accounts.serializer import (
     AccountCommentEditSwaggerSerializer,
     AccountCreateSerializer,
     AccountDetailEditSwaggerSerializer,
+    AccountListSerializer,
     AccountSerializer,
     AccountWriteSerializer,
     EmailSerializer,
     EmailWriteSerializer,
     TagsSerializer,
 )
-from common.utils import create_attachment, get_or_create_tags, handle_m2m_assignment
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
+from common.visibility import filter_visible
+from common.utils import (
+    convert_to_custom_timezone,
+    create_attachment,
+    get_or_create_tags,
+    handle_m2m_assignment,
+)
 from accounts.tasks import send_email, send_email_to_assigned_user
 from cases.serializer import CaseSerializer
 from common.models import Attachments, Comment, Profile, Tags, Teams
@@ -47,13 +62,13 @@ from contacts.models import Contact
 from contacts.serializer import ContactSerializer
 from invoices.serializer import InvoiceSerailizer
 from leads.models import Lead
-from leads.serializer import LeadSerializer
+from leads.serializer import LeadListSerializer
 from opportunity.models import SOURCES, STAGES, Opportunity
 from opportunity.serializer import OpportunitySerializer
 from tasks.serializer import TaskSerializer
 
 
-class AccountsListView(APIView, LimitOffsetPagination):
+class AccountsListView(APIView, CRMListPagination):
     permission_classes = (IsAuthenticated, HasOrgContext)
     model = Account
     serializer_class = AccountSerializer
@@ -64,79 +79,72 @@ class AccountsListView(APIView, LimitOffsetPagination):
             "-id"
         )
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
-            queryset = queryset.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-
-        if params:
-            if params.get("name"):
-                queryset = queryset.filter(name__icontains=params.get("name"))
-            if params.get("city"):
-                queryset = queryset.filter(city__icontains=params.get("city"))
-            if params.get("industry"):
-                queryset = queryset.filter(industry__icontains=params.get("industry"))
-            if params.get("tags"):
-                queryset = queryset.filter(tags__in=params.get("tags")).distinct()
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.getlist("assigned_to")
-                ).distinct()
-            if params.get("search"):
-                queryset = queryset.filter(name__icontains=params.get("search"))
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
+            queryset = filter_visible(queryset, self.request.profile)
+
+        queryset = AccountFilterSet(params, queryset).filter_queryset()
 
         context = {}
 
+        # Bucket and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(
+                queryset,
+                buckets={"active": Q(is_active=True), "inactive": Q(is_active=False)},
+                fields=["industry"],
+            )
+        context["facets"] = facets
+
+        options = AccountListSerializer.sparse_options(self.request)
+        queryset = AccountListSerializer.setup_queryset(queryset, **options)
+
         # Account model no longer has status field, return all accounts
         # Filter by is_active instead
         queryset_active = queryset.filter(is_active=True)
-        results_accounts_active = self.paginate_queryset(
-            queryset_active.distinct(), self.request, view=self
+        results_accounts_active, page = self.paginate_list(
+            queryset_active,
+            self.request,
+            "active_accounts",
+            count=facets["buckets"]["active"] if facets else None,
         )
-        if results_accounts_active:
-            offset = queryset_active.filter(
-                id__gte=results_accounts_active[-1].id
-            ).count()
-            if offset == queryset_active.count():
-                offset = None
-        else:
-            offset = 0
-        accounts_active = AccountSerializer(results_accounts_active, many=True).data
+        accounts_active = AccountListSerializer(
+            results_accounts_active, many=True, **options
+        ).data
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
         context["active_accounts"] = {
-            "offset": offset,
+            "offset": page["offset"],
             "open_accounts": accounts_active,
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         # Inactive accounts
         queryset_inactive = queryset.filter(is_active=False)
-        results_accounts_inactive = self.paginate_queryset(
-            queryset_inactive.distinct(), self.request, view=self
+        results_accounts_inactive, inactive_page = self.paginate_list(
+            queryset_inactive,
+            self.request,
+            "closed_accounts",
+            count=facets["buckets"]["inactive"] if facets else None,
         )
-        if results_accounts_inactive:
-            offset = queryset_inactive.filter(
-                id__gte=results_accounts_inactive[-1].id
-            ).count()
-            if offset == queryset_inactive.count():
-                offset = None
-        else:
-            offset = 0
-        accounts_inactive = AccountSerializer(results_accounts_inactive, many=True).data
+        accounts_inactive = AccountListSerializer(
+            results_accounts_inactive, many=True, **options
+        ).data
+
+        context["closed_accounts"] = {
+            "offset": inactive_page["offset"],
+            "close_accounts": accounts_inactive,
+            "next_cursor": inactive_page["next_cursor"],
+            "previous_cursor": inactive_page["previous_cursor"],
+        }
+        if not include_reference_data(self.request):
+            return context
 
         contacts = Contact.objects.filter(org=self.request.profile.org).values(
             "id", "first_name"
         )
         context["contacts"] = contacts
-        context["closed_accounts"] = {
-            "offset": offset,
-            "close_accounts": accounts_inactive,
-        }
         context["teams"] = TeamsSerializer(
             Teams.objects.filter(org=self.request.profile.org), many=True
         ).data
@@ -155,14 +163,18 @@ class AccountsListView(APIView, LimitOffsetPagination):
             Q(status="converted") | Q(status="closed")
         )
         context["users"] = users
-        context["leads"] = LeadSerializer(leads, many=True).data
+        context["leads"] = LeadListSerializer(
+            LeadListSerializer.setup_queryset(leads), many=True
+        ).data
         context["status"] = ["active", "inactive"]  # Maps to is_active field
         return context
 
     @extend_schema(
         tags=["Accounts"],
         operation_id="accounts_list",
-        parameters=swagger_params.account_get_params,
+        parameters=swagger_params.account_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
     )
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(**kwargs)
@@ -367,6 +379,20 @@ class AccountDetailView(APIView):
         operation_id="accounts_retrieve",
         parameters=swagger_params.organization_params,
     )
+    @conditional_detail(
+        Account,
+        related=[
+            ("opportunity.Opportunity", "account"),
+            ("cases.Case", "account"),
+            ("tasks.Task", "account"),
+            ("accounts.AccountEmail", "from_account"),
+            ("invoices.Invoice", "accounts"),
+            ("contacts.Contact", "account_contacts"),
+            ("leads.Lead", "org", "org"),
+            ("common.Tags", "account_tags"),
+            ("common.Profile", "account_assigned_users"),
+        ],
+    )
     def get(self, request, pk, format=None):
         self.account = self.get_object(pk=pk)
         if self.account.org != request.profile.org:
@@ -410,9 +436,6 @@ class AccountDetailView(APIView):
                 users_mention = []
         else:
             users_mention = []
-        leads = Lead.objects.filter(org=self.request.profile.org).exclude(
-            Q(status="converted") | Q(status="closed")
-        )
         account_content_type = ContentType.objects.get_for_model(Account)
         comments = Comment.objects.filter(
             content_type=account_content_type,
@@ -434,25 +457,9 @@ class AccountDetailView(APIView):
                 "opportunity_list": OpportunitySerializer(
                     Opportunity.objects.filter(account=self.account), many=True
                 ).data,
-                "users": ProfileSerializer(
-                    Profile.objects.filter(
-                        is_active=True, org=self.request.profile.org
-                    ).order_by("user__email"),
-                    many=True,
-                ).data,
                 "cases": CaseSerializer(
                     self.account.accounts_cases.all(), many=True
                 ).data,
-                "teams": TeamsSerializer(
-                    Teams.objects.filter(org=self.request.profile.org), many=True
-                ).data,
-                "stages": STAGES,
-                "sources": SOURCES,
-                "countries": COUNTRIES,
-                "currencies": CURRENCY_CODES,
-                "case_types": CASE_TYPE,
-                "case_priority": PRIORITY_CHOICE,
-                "case_status": STATUS_CHOICE,
                 "comment_permission": comment_permission,
                 "tasks": TaskSerializer(
                     self.account.accounts_tasks.all(), many=True
@@ -464,10 +471,36 @@ class AccountDetailView(APIView):
                     self.account.sent_email.all(), many=True
                 ).data,
                 "users_mention": users_mention,
-                "leads": LeadSerializer(leads, many=True).data,
-                "status": ["open", "close"],
             }
         )
+        if include_reference_data(self.request):
+            leads = Lead.objects.filter(org=self.request.profile.org).exclude(
+                Q(status="converted") | Q(status="closed")
+            )
+            context.update(
+                {
+                    "users": ProfileSerializer(
+                        Profile.objects.filter(
+                            is_active=True, org=self.request.profile.org
+                        ).order_by("user__email"),
+                        many=True,
+                    ).data,
+                    "teams": TeamsSerializer(
+                        Teams.objects.filter(org=self.request.profile.org), many=True
+                    ).data,
+                    "stages": STAGES,
+                    "sources": SOURCES,
+                    "countries": COUNTRIES,
+                    "currencies": CURRENCY_CODES,
+                    "case_types": CASE_TYPE,
+                    "case_priority": PRIORITY_CHOICE,
+                    "case_status": STATUS_CHOICE,
+                    "leads": LeadListSerializer(
+                        LeadListSerializer.setup_queryset(leads), many=True
+                    ).data,
+                    "status": ["open", "close"],
+                }
+            )
         return Response(context)
 
     @extend_schema(
@@ -778,31 +811,51 @@ class AccountCreateMailView(APIView):
 
         data = {}
         if serializer.is_valid():
-            email_obj = serializer.save(from_account=account)
-            if scheduled_later not in ["", None, False, "false"]:
-                if scheduled_date_time in ["", None]:
-                    return Response(
-                        {"error": True, "errors": serializer.errors},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-            if data.get("recipients"):
-                contacts = json.loads(data.get("recipients"))
-                for contact in contacts:
-                    obj_contact = Contact.objects.filter(
-                        id=contact, org=request.profile.org
+            scheduled = scheduled_later not in ["", None, False, "false"]
+            if scheduled and scheduled_date_time in ["", None]:
+                return Response(
+                    {
+                        "error": True,
+                        "errors": {"scheduled_date_time": "This field is required."},
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # Sent by send_scheduled_emails. A time without an offset is the
+            # wall time in the email's timezone.
+            scheduled_at = serializer.validated_data.get("scheduled_date_time")
+            if scheduled and parse_datetime(str(scheduled_date_time)).tzinfo is None:
+                try:
+                    scheduled_at = convert_to_custom_timezone(
+                        scheduled_at,
+                        serializer.validated_data.get("timezone", "UTC"),
+                        to_utc=True,
                     )
-                    if obj_contact.exists():
-                        email_obj.recipients.add(contact)
-                    else:
-                        email_obj.delete()
-                        data["recipients"] = "Please enter valid recipient"
-                        return Response({"error": True, "errors": data})
-            if data.get("scheduled_later") != "true":
+                except pytz.UnknownTimeZoneError:
+                    data["timezone"] = "Please enter valid timezone"
+                    return Response({"error": True, "errors": data})
+
+            contacts = []
+            if request.data.get("recipients"):
+                contacts = json.loads(request.data.get("recipients"))
+                try:
+                    valid = Contact.objects.filter(
+                        id__in=contacts, org=request.profile.org
+                    ).count()
+                except ValidationError:
+                    valid = None
+                if valid != len(set(contacts)):
+                    data["recipients"] = "Please enter valid recipient"
+                    return Response({"error": True, "errors": data})
+
+            email_obj = serializer.save(
+                from_account=account,
+                org=request.profile.org,
+                scheduled_later=scheduled,
+                scheduled_date_time=scheduled_at if scheduled else None,
+            )
+            email_obj.recipients.add(*contacts)
+            if not scheduled:
                 send_email.delay(email_obj.id, str(request.profile.org.id))
-            else:
-                email_obj.scheduled_later = True
-                email_obj.scheduled_date_time = scheduled_date_time
             return Response(
                 {"error": False, "message": "Email sent successfully"},
                 status=status.HTTP_200_OK,
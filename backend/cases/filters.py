@@ -0,0 +1,17 @@
+from cases.models import Case
+from common.filters import ContainsFilter, Filter, FilterSet, RelatedFilter
+
+
+class CaseFilterSet(FilterSet):
+    model = Case
+
+    name = ContainsFilter("name")
+    status = Filter("status")
+    priority = Filter("priority")
+    account = Filter("account")
+    case_type = Filter("case_type")
+    assigned_to = RelatedFilter("assigned_to")
+    tags = RelatedFilter("tags")
+    search = ContainsFilter("name")
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0008_solution_solution_search_idx"),
+    ]
+
+    operations = [
+        add_trigram_indexes("cases.Case", ("name",)),
+    ]
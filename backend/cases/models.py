@@ -5,6 +5,7 @@ from django.utils.translation import pgettext_lazy
 from accounts.models import Account
 from common.base import AssignableMixin, BaseModel
 from common.models import Org, Profile, Tags, Teams
+from common.search import search_index
 from common.utils import CASE_TYPE, PRIORITY_CHOICE, STATUS_CHOICE
 from contacts.models import Contact
 
@@ -15,6 +16,9 @@ from contacts.models import Contact
 
 
 class Case(AssignableMixin, BaseModel):
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("name",)
+
     name = models.CharField(pgettext_lazy("Name of the case", "Name"), max_length=64)
     status = models.CharField(choices=STATUS_CHOICE, max_length=64)
     priority = models.CharField(choices=PRIORITY_CHOICE, max_length=64)
@@ -52,6 +56,10 @@ class Case(AssignableMixin, BaseModel):
         return f"{self.name}"
 
 
+# Columns of the full-text `search` by weight (common.search)
+SOLUTION_SEARCH_FIELDS = {"A": ("title",), "B": ("description",)}
+
+
 class Solution(BaseModel):
     """
     Knowledge Base Solution
@@ -60,6 +68,8 @@ class Solution(BaseModel):
     They form a knowledge base for common issues and their resolutions.
     """
 
+    SEARCH_FIELDS = SOLUTION_SEARCH_FIELDS
+
     title = models.CharField(max_length=255)
     description = models.TextField()
 
@@ -86,6 +96,7 @@ class Solution(BaseModel):
             models.Index(fields=["status"]),
             models.Index(fields=["is_published"]),
             models.Index(fields=["org"]),
+            search_index(SOLUTION_SEARCH_FIELDS, "solution_search_idx"),
         ]
 
     def __str__(self):
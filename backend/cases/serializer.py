@@ -1,15 +1,31 @@
 from rest_framework import serializers
 
-from accounts.serializer import AccountSerializer
+from accounts.serializer import (
+    ACCOUNT_RELATION,
+    AccountSerializer,
+    AccountSummarySerializer,
+)
 from cases.models import Case
 from common.serializer import (
+    ORG_RELATION,
+    PROFILE_RELATION,
+    TAG_RELATION,
+    TEAM_RELATION,
+    USER_RELATION,
     OrganizationSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TagsSerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
     UserSerializer,
 )
-from contacts.serializer import ContactSerializer
+from common.sparse_fields import SparseFieldsMixin
+from contacts.serializer import (
+    CONTACT_RELATION,
+    ContactSerializer,
+    ContactSummarySerializer,
+)
 
 
 # Note: Removed unused serializer property:
@@ -47,6 +63,47 @@ class CaseSerializer(serializers.ModelSerializer):
         )
 
 
+class CaseListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Case for list rows (see common.sparse_fields)"""
+
+    account = AccountSummarySerializer(read_only=True)
+    contacts = ContactSummarySerializer(read_only=True, many=True)
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    created_by = UserSerializer(read_only=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    tags = TagsSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Case
+        fields = (
+            "id",
+            "name",
+            "status",
+            "priority",
+            "case_type",
+            "closed_on",
+            "description",
+            "created_by",
+            "created_at",
+            "is_active",
+            "account",
+            "contacts",
+            "teams",
+            "assigned_to",
+            "tags",
+            "org",
+        )
+        relations = {
+            "account": ACCOUNT_RELATION,
+            "contacts": CONTACT_RELATION,
+            "assigned_to": PROFILE_RELATION,
+            "created_by": USER_RELATION,
+            "teams": TEAM_RELATION,
+            "tags": TAG_RELATION,
+            "org": ORG_RELATION,
+        }
+
+
 class CaseCreateSerializer(serializers.ModelSerializer):
     closed_on = serializers.DateField(required=False, allow_null=True)
     org = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -15,6 +15,7 @@ from cases.solution_serializers import (
     SolutionDetailSerializer,
     SolutionSerializer,
 )
+from common.search import SEARCH_RANK, apply_search
 
 
 class SolutionListView(APIView, LimitOffsetPagination):
@@ -58,8 +59,8 @@ class SolutionListView(APIView, LimitOffsetPagination):
             queryset = queryset.filter(is_published=is_published.lower() == "true")
 
         if search:
-            queryset = queryset.filter(title__icontains=search) | queryset.filter(
-                description__icontains=search
+            queryset = apply_search(queryset, search).order_by(
+                f"-{SEARCH_RANK}", "-created_at"
             )
 
         # Paginate
@@ -1,36 +1,42 @@
 import json
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema, inline_serializer
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from rest_framework.views import APIView
 
 from accounts.models import Account
-from accounts.serializer import AccountSerializer
+from accounts.serializer import AccountListSerializer
 from cases import swagger_params
+from cases.filters import CaseFilterSet
 from cases.models import Case
 from cases.serializer import (
     CaseCommentEditSwaggerSerializer,
     CaseCreateSerializer,
     CaseCreateSwaggerSerializer,
     CaseDetailEditSwaggerSerializer,
+    CaseListSerializer,
     CaseSerializer,
 )
 from cases.tasks import send_email_to_assigned_user
+from common.conditional import conditional_detail
+from common.facets import facet_counts
+from common.meta import include_reference_data
 from common.models import Attachments, Comment, Profile, Tags, Teams
 from common.serializer import AttachmentsSerializer, CommentSerializer
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
 from common.utils import CASE_TYPE, PRIORITY_CHOICE, STATUS_CHOICE
+from common.visibility import filter_visible
 from contacts.models import Contact
-from contacts.serializer import ContactSerializer
+from contacts.serializer import ContactListSerializer, ContactSerializer
 
 
-class CaseListView(APIView, LimitOffsetPagination):
+class CaseListView(APIView, CRMListPagination):
     permission_classes = (IsAuthenticated, HasOrgContext)
     model = Case
 
@@ -43,84 +49,72 @@ class CaseListView(APIView, LimitOffsetPagination):
         contacts = Contact.objects.filter(org=self.request.profile.org).order_by("-id")
         profiles = Profile.objects.filter(is_active=True, org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
-            queryset = queryset.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-            accounts = accounts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-            contacts = contacts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
+            queryset = filter_visible(queryset, self.request.profile)
+            accounts = filter_visible(accounts, self.request.profile)
+            contacts = filter_visible(contacts, self.request.profile)
             profiles = profiles.filter(role="ADMIN")
 
-        if params:
-            if params.get("name"):
-                queryset = queryset.filter(name__icontains=params.get("name"))
-            if params.get("status"):
-                queryset = queryset.filter(status=params.get("status"))
-            if params.get("priority"):
-                queryset = queryset.filter(priority=params.get("priority"))
-            if params.get("account"):
-                queryset = queryset.filter(account=params.get("account"))
-            if params.get("case_type"):
-                queryset = queryset.filter(case_type=params.get("case_type"))
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.getlist("assigned_to")
-                ).distinct()
-            if params.get("tags"):
-                queryset = queryset.filter(tags__id__in=params.getlist("tags")).distinct()
-            if params.get("search"):
-                queryset = queryset.filter(name__icontains=params.get("search"))
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
+        queryset = CaseFilterSet(params, queryset).filter_queryset()
 
         context = {}
+        # Total and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(queryset, fields=["status", "priority"])
+        context["facets"] = facets
+
+        options = CaseListSerializer.sparse_options(self.request)
+        results_cases, page = self.paginate_list(
+            CaseListSerializer.setup_queryset(queryset, **options),
+            self.request,
+            "cases",
+            count=facets["total"] if facets else None,
+        )
+        cases = CaseListSerializer(results_cases, many=True, **options).data
 
-        results_cases = self.paginate_queryset(queryset, self.request, view=self)
-        cases = CaseSerializer(results_cases, many=True).data
-
-        if results_cases:
-            offset = queryset.filter(id__gte=results_cases[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
         context.update(
             {
-                "cases_count": self.count,
-                "offset": offset,
+                "cases_count": page["count"],
+                "offset": page["offset"],
+                "next_cursor": page["next_cursor"],
+                "previous_cursor": page["previous_cursor"],
             }
         )
         context["cases"] = cases
+        if not include_reference_data(self.request):
+            return context
+
         context["status"] = STATUS_CHOICE
         context["priority"] = PRIORITY_CHOICE
         context["type_of_case"] = CASE_TYPE
-        context["accounts_list"] = AccountSerializer(accounts, many=True).data
-        context["contacts_list"] = ContactSerializer(contacts, many=True).data
+        context["accounts_list"] = AccountListSerializer(
+            AccountListSerializer.setup_queryset(accounts), many=True
+        ).data
+        context["contacts_list"] = ContactListSerializer(
+            ContactListSerializer.setup_queryset(contacts), many=True
+        ).data
         return context
 
     @extend_schema(
         operation_id="cases_list",
         tags=["Cases"],
-        parameters=swagger_params.cases_list_get_params,
+        parameters=swagger_params.cases_list_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
         responses={200: inline_serializer(
             name="CaseListResponse",
             fields={
-                "cases_count": serializers.IntegerField(),
+                "cases_count": serializers.IntegerField(allow_null=True),
                 "offset": serializers.IntegerField(allow_null=True),
-                "cases": CaseSerializer(many=True),
+                "next_cursor": serializers.CharField(allow_null=True),
+                "previous_cursor": serializers.CharField(allow_null=True),
+                "cases": CaseListSerializer(many=True),
                 "status": serializers.ListField(),
                 "priority": serializers.ListField(),
                 "type_of_case": serializers.ListField(),
-                "accounts_list": AccountSerializer(many=True),
-                "contacts_list": ContactSerializer(many=True),
+                "accounts_list": AccountListSerializer(many=True),
+                "contacts_list": ContactListSerializer(many=True),
+                "facets": serializers.DictField(allow_null=True),
             }
         )},
     )
@@ -381,6 +375,14 @@ class CaseDetailView(APIView):
             }
         )},
     )
+    @conditional_detail(
+        Case,
+        related=[
+            ("contacts.Contact", "case_contacts"),
+            ("common.Tags", "case_tags"),
+            ("common.Profile", "case_assigned_users"),
+        ],
+    )
     def get(self, request, pk, format=None):
         self.cases = self.get_object(pk=pk)
         if not self.cases:
@@ -450,13 +452,18 @@ class CaseDetailView(APIView):
                 "contacts": ContactSerializer(
                     self.cases.contacts.all(), many=True
                 ).data,
-                "status": STATUS_CHOICE,
-                "priority": PRIORITY_CHOICE,
-                "type_of_case": CASE_TYPE,
                 "comment_permission": comment_permission,
                 "users_mention": users_mention,
             }
         )
+        if include_reference_data(self.request):
+            context.update(
+                {
+                    "status": STATUS_CHOICE,
+                    "priority": PRIORITY_CHOICE,
+                    "type_of_case": CASE_TYPE,
+                }
+            )
         return Response(context)
 
     @extend_schema(
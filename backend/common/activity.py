@@ -0,0 +1,171 @@
+"""
+Batched Activity recording.
+
+common.signals records an Activity for every save/delete of a CRM entity.
+Instead of one INSERT per signal, activities are collected in the current
+batch and written with a single bulk_create when the batch closes.
+ActivityBatchMiddleware opens one batch per request; code doing bulk work
+can open its own to suppress or aggregate activities.
+
+Within a batch, repeated events for the same entity and action (e.g. a
+lead saved three times during conversion) are recorded once. Activities
+recorded in a transaction or savepoint opened after the batch must not
+outlive a rollback of it: they are written right away when the batch is
+itself in a transaction, and collected on commit otherwise. Atomic blocks
+without a savepoint (e.g. the one of QuerySet.delete()) don't count, as
+they can only roll back with the enclosing block.
+
+Usage:
+    from common.activity import aggregate_activities, suppress_activities
+
+    with suppress_activities():
+        for lead in leads:
+            lead.save()     # no activities
+
+    with aggregate_activities():
+        for lead in leads:
+            lead.save()     # one "Updated 250 Lead records" activity
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import connection, transaction
+
+from common.models import Activity
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_MODE_RECORD = "record"
+ACTIVITY_MODE_SUPPRESS = "suppress"
+ACTIVITY_MODE_AGGREGATE = "aggregate"
+
+_local = threading.local()
+
+
+def _batch_stack():
+    if not hasattr(_local, "batches"):
+        _local.batches = []
+    return _local.batches
+
+
+def _savepoint_depth():
+    """Transaction and savepoints open on the connection."""
+    if not connection.in_atomic_block:
+        return 0
+    return 1 + sum(1 for sid in connection.savepoint_ids if sid is not None)
+
+
+def write_activities(activities):
+    """Insert activities with one bulk_create."""
+    if not activities:
+        return
+    try:
+        Activity.objects.bulk_create(activities)
+    except Exception as e:
+        logger.error(f"Failed to write {len(activities)} activities: {e}")
+
+
+def aggregate(activities):
+    """Collapse activities into one per (org, user, entity type, action)."""
+    groups = {}
+    for activity in activities:
+        key = (
+            activity.org_id,
+            activity.user_id,
+            activity.entity_type,
+            activity.action,
+        )
+        groups.setdefault(key, []).append(activity)
+
+    result = []
+    for group in groups.values():
+        summary = group[-1]
+        if len(group) > 1:
+            records = f"{len(group)} {summary.entity_type} records"
+            summary.entity_name = records
+            summary.description = f"{summary.get_action_display()} {records}"
+        result.append(summary)
+    return result
+
+
+class ActivityBatch:
+    """Activities collected until the batch is closed."""
+
+    def __init__(self, mode=ACTIVITY_MODE_RECORD, parent=None):
+        self.mode = mode
+        self.parent = parent
+        self.depth = _savepoint_depth()
+        self.activities = {}
+        self.closed = False
+
+    def add(self, activity):
+        if self.mode == ACTIVITY_MODE_SUPPRESS:
+            return
+        if _savepoint_depth() > self.depth:
+            if self.depth:
+                write_activities([activity])
+            else:
+                transaction.on_commit(partial(self.committed, activity))
+            return
+        key = (activity.entity_type, activity.entity_id, activity.action)
+        self.activities[key] = activity
+
+    def committed(self, activity):
+        """Collect an activity whose transaction committed."""
+        if self.closed:
+            write_activities([activity])
+        else:
+            self.add(activity)
+
+    def extend(self, activities):
+        for activity in activities:
+            key = (activity.entity_type, activity.entity_id, activity.action)
+            self.activities.setdefault(key, activity)
+
+    def close(self):
+        """Write the batch, or hand it to the enclosing batch."""
+        activities = list(self.activities.values())
+        self.activities = {}
+        self.closed = True
+        if self.mode == ACTIVITY_MODE_AGGREGATE:
+            activities = aggregate(activities)
+
+        if self.parent is not None and self.parent.depth == self.depth:
+            self.parent.extend(activities)
+        else:
+            write_activities(activities)
+
+
+@contextmanager
+def activity_batch(mode=ACTIVITY_MODE_RECORD):
+    """Collect activities recorded in the block and write them on exit."""
+    stack = _batch_stack()
+    batch = ActivityBatch(mode, parent=stack[-1] if stack else None)
+    stack.append(batch)
+    try:
+        yield batch
+    finally:
+        stack.pop()
+        batch.close()
+
+
+def suppress_activities():
+    """Record no activities in the block (e.g. imports)."""
+    return activity_batch(ACTIVITY_MODE_SUPPRESS)
+
+
+def aggregate_activities():
+    """Record one summary activity per entity type and action in the block."""
+    return activity_batch(ACTIVITY_MODE_AGGREGATE)
+
+
+def record_activity(activity):
+    """Add an unsaved Activity to the current batch, or write it directly."""
+    stack = _batch_stack()
+    if stack:
+        stack[-1].add(activity)
+    else:
+        write_activities([activity])
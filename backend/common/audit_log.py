@@ -14,17 +14,44 @@ Usage:
     audit_log.login_success(user, org, request)
     audit_log.org_switch(user, from_org, to_org, request)
     audit_log.permission_denied(user, org, action, resource, request)
+
+Sinks (settings.AUDIT_LOG_SINK):
+    "buffered"  (default) events are queued in process and written by a
+                background thread with bulk_create once AUDIT_LOG_BATCH_SIZE
+                events are queued or every AUDIT_LOG_FLUSH_INTERVAL seconds.
+                Log file lines are written by the same thread.
+    "celery"    as "buffered", but each batch is handed to the
+                write_security_audit_logs task instead of written in process.
+    "sync"      one INSERT and one log line per event, in the request.
+
+When more than AUDIT_LOG_MAX_QUEUE events are pending, new events are
+dropped and counted (audit_log_buffer.stats()["dropped"]). The buffer is
+flushed at interpreter exit and on Celery worker shutdown. Rows get their
+created_at when they are flushed, at most AUDIT_LOG_FLUSH_INTERVAL seconds
+after the event; the log line keeps the exact event time.
 """
 
+import atexit
 import logging
-
-from django.db import models
+import os
+import threading
+from collections import defaultdict, deque
+
+from celery.signals import worker_process_shutdown, worker_shutdown
+from crum import get_current_user
+from django.conf import settings
+from django.db import connection, models, transaction
 from django.utils import timezone
 
 from common.base import BaseModel
+from common.rls import get_set_local_context_sql
 
 logger = logging.getLogger("security.audit")
 
+AUDIT_LOG_SINK_SYNC = "sync"
+AUDIT_LOG_SINK_BUFFERED = "buffered"
+AUDIT_LOG_SINK_CELERY = "celery"
+
 
 class SecurityAuditLog(BaseModel):
     """
@@ -95,11 +122,176 @@ class SecurityAuditLog(BaseModel):
         return f"{self.event_type} - {self.user} - {self.created_at}"
 
 
+def write_audit_rows(rows):
+    """
+    Bulk insert audit log rows (dicts of SecurityAuditLog field values).
+
+    security_audit_log is protected by RLS, so rows are inserted in one
+    transaction per org with the org context set locally. A failing org
+    does not prevent the others from being written.
+
+    Returns:
+        Number of rows written
+    """
+    rows_by_org = defaultdict(list)
+    for row in rows:
+        rows_by_org[row.get("org_id")].append(SecurityAuditLog(**row))
+
+    written = 0
+    for org_id, entries in rows_by_org.items():
+        try:
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            get_set_local_context_sql(), [str(org_id or "")]
+                        )
+                SecurityAuditLog.objects.bulk_create(entries)
+            written += len(entries)
+        except Exception as e:
+            logger.error(f"Failed to write {len(entries)} audit log entries: {e}")
+    return written
+
+
+class AuditLogBuffer:
+    """
+    In-process queue of audit events, drained by a daemon writer thread.
+
+    Each entry is a row for write_audit_rows() plus an optional LogRecord
+    created at event time, so neither the INSERT nor the log file write
+    happens in the request.
+    """
+
+    def __init__(self):
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._reported_dropped = 0
+
+    @property
+    def batch_size(self):
+        return getattr(settings, "AUDIT_LOG_BATCH_SIZE", 100)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "AUDIT_LOG_FLUSH_INTERVAL", 2)
+
+    @property
+    def max_size(self):
+        return getattr(settings, "AUDIT_LOG_MAX_QUEUE", 10000)
+
+    def put(self, row, record=None):
+        """Queue an event. Returns False if the queue is full and it was dropped."""
+        with self._lock:
+            if len(self._queue) >= self.max_size:
+                self.dropped += 1
+                return False
+            self._queue.append((row, record))
+            pending = len(self._queue)
+
+        self._ensure_writer()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self):
+        """Write everything queued so far. Safe to call from any thread."""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    count = min(len(self._queue), self.batch_size)
+                    batch = [self._queue.popleft() for _ in range(count)]
+                if not batch:
+                    break
+                self._write(batch)
+
+            if self.dropped > self._reported_dropped:
+                logger.warning(
+                    f"Audit log queue full: dropped "
+                    f"{self.dropped - self._reported_dropped} events"
+                )
+                self._reported_dropped = self.dropped
+
+    def stats(self):
+        return {
+            "pending": len(self._queue),
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    def _write(self, batch):
+        for _, record in batch:
+            if record is not None:
+                logger.handle(record)
+
+        rows = [row for row, _ in batch]
+        sink = getattr(settings, "AUDIT_LOG_SINK", AUDIT_LOG_SINK_BUFFERED)
+        if sink == AUDIT_LOG_SINK_CELERY:
+            from common.tasks import write_security_audit_logs
+
+            try:
+                write_security_audit_logs.delay(rows)
+                self.written += len(rows)
+            except Exception as e:
+                self.failed += len(rows)
+                logger.error(f"Failed to queue {len(rows)} audit log entries: {e}")
+            return
+
+        written = write_audit_rows(rows)
+        self.written += written
+        self.failed += len(rows) - written
+
+    def _ensure_writer(self):
+        # Started lazily, and again in a forked child (the thread does not
+        # survive the fork of a preloading master process).
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Audit log writer failed: {e}")
+            finally:
+                # The writer thread owns its own DB connection
+                connection.close()
+
+
+audit_log_buffer = AuditLogBuffer()
+atexit.register(audit_log_buffer.flush)
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def flush_audit_log_buffer(**kwargs):
+    """Write pending audit events before a Celery worker exits."""
+    audit_log_buffer.flush()
+
+
 class AuditLogger:
     """
     Helper class for logging security events.
 
-    Logs to both database (SecurityAuditLog) and Python logger.
+    Logs to both database (SecurityAuditLog) and Python logger, directly or
+    through audit_log_buffer depending on settings.AUDIT_LOG_SINK.
     """
 
     def _get_request_info(self, request):
@@ -136,6 +328,42 @@ class AuditLogger:
         """
         request_info = self._get_request_info(request)
 
+        log_level = logging.INFO if success else logging.WARNING
+        user_email = user.email if user else "anonymous"
+        org_name = org.name if org else "none"
+        message = (
+            f"{event_type} | user={user_email} | org={org_name} | "
+            f"ip={request_info.get('ip_address')} | {description}"
+        )
+
+        sink = getattr(settings, "AUDIT_LOG_SINK", AUDIT_LOG_SINK_BUFFERED)
+        if sink != AUDIT_LOG_SINK_SYNC:
+            # Plain values only: the row may be sent to a Celery task
+            current_user = get_current_user()
+            actor_id = (
+                str(current_user.id)
+                if current_user is not None and not current_user.is_anonymous
+                else None
+            )
+            row = {
+                "event_type": event_type,
+                "user_id": str(user.id) if user else None,
+                "org_id": str(org.id) if org else None,
+                "description": description,
+                "metadata": metadata or {},
+                "success": success,
+                "created_by_id": actor_id,
+                "updated_by_id": actor_id,
+                **request_info,
+            }
+            record = None
+            if logger.isEnabledFor(log_level):
+                record = logger.makeRecord(
+                    logger.name, log_level, __file__, 0, message, None, None
+                )
+            audit_log_buffer.put(row, record)
+            return
+
         # Log to database
         try:
             SecurityAuditLog.objects.create(
@@ -151,15 +379,7 @@ class AuditLogger:
             logger.error(f"Failed to create audit log: {e}")
 
         # Log to Python logger
-        log_level = logging.INFO if success else logging.WARNING
-        user_email = user.email if user else "anonymous"
-        org_name = org.name if org else "none"
-
-        logger.log(
-            log_level,
-            f"{event_type} | user={user_email} | org={org_name} | "
-            f"ip={request_info.get('ip_address')} | {description}",
-        )
+        logger.log(log_level, message)
 
     def login_success(self, user, org, request=None):
         """Log successful login."""
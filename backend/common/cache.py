@@ -0,0 +1,226 @@
+"""
+In-process caches for hot authentication lookups, the dashboard and the
+exchange rates.
+
+These caches live in the memory of a single worker process. They are bounded
+(least recently used entries are evicted first) and every entry expires after
+a TTL, so a change made by another process becomes visible after at most TTL
+seconds. Changes made in this process are applied immediately through the
+signal handlers in common/signals.py.
+
+Usage:
+    from common.cache import (
+        api_key_cache,
+        dashboard_cache,
+        fx_rate_cache,
+        membership_cache,
+    )
+
+    profile = membership_cache.get_profile(user_id, org_id)
+    membership_cache.stats()  # {"hits": ..., "misses": ..., ...}
+    api_key_cache.stats()
+    dashboard_cache.invalidate_org(org_id)
+    fx_rate_cache.clear()
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+# Sentinel returned by TTLCache.get() when the key is absent or expired
+MISSING = object()
+
+
+def clone_profile(profile):
+    """
+    Return a copy of a cached Profile and its loaded Org and User.
+
+    Each request gets its own instances so that views mutating
+    request.profile / request.org cannot leak into the shared cache.
+    """
+    clone = copy.copy(profile)
+    clone.org = copy.copy(profile.org)
+    clone.user = copy.copy(profile.user)
+    return clone
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry.
+
+    A ttl of 0 disables the cache: get() always misses and set() is a no-op.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, key):
+        """Return the cached value for key, or MISSING."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entries if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Delete every entry for which predicate(key, value) is true."""
+        with self._lock:
+            doomed = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in doomed:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Return hit/miss counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class MembershipCache(TTLCache):
+    """
+    Cache of active Profile (with its Org and User) keyed by (user_id, org_id).
+
+    Only active memberships are cached. A missing or inactive membership is
+    never cached, so re-activating a profile takes effect on the next request.
+    """
+
+    @staticmethod
+    def _key(user_id, org_id):
+        return (str(user_id), str(org_id))
+
+    def get_profile(self, user_id, org_id):
+        """
+        Return the active Profile for user_id in org_id.
+
+        Raises:
+            Profile.DoesNotExist: if there is no active membership
+        """
+        from common.models import Profile
+
+        key = self._key(user_id, org_id)
+        profile = self.get(key)
+        if profile is MISSING:
+            profile = Profile.objects.select_related("org", "user").get(
+                user_id=user_id, org_id=org_id, is_active=True
+            )
+            self.set(key, profile)
+        return clone_profile(profile)
+
+    def invalidate_profile(self, user_id, org_id):
+        self.delete(self._key(user_id, org_id))
+
+    def invalidate_org(self, org_id):
+        org_id = str(org_id)
+        self.delete_where(lambda key, profile: key[1] == org_id)
+
+    def invalidate_user(self, user_id):
+        user_id = str(user_id)
+        self.delete_where(lambda key, profile: key[0] == user_id)
+
+
+class APIKeyCache(TTLCache):
+    """
+    Cache of API key digest -> acting admin Profile (with its Org and User).
+
+    Unknown keys are never cached, so random keys cannot flood the cache.
+    """
+
+    def get_profile(self, digest):
+        """Return a copy of the cached Profile for digest, or None."""
+        profile = self.get(digest)
+        if profile is MISSING:
+            return None
+        return clone_profile(profile)
+
+    def invalidate_org(self, org_id):
+        org_id = str(org_id)
+        self.delete_where(lambda key, profile: str(profile.org_id) == org_id)
+
+    def invalidate_user(self, user_id):
+        user_id = str(user_id)
+        self.delete_where(lambda key, profile: str(profile.user_id) == user_id)
+
+
+class DashboardCache(TTLCache):
+    """
+    Cache of dashboard summaries keyed by (org_id, scope, date).
+
+    scope is "org" for admins and the profile id otherwise, as non-admins
+    only count the records they can see. The TTL is the staleness budget
+    for changes made in other processes.
+    """
+
+    @staticmethod
+    def key(org_id, scope, day):
+        return (str(org_id), str(scope), day.isoformat())
+
+    def invalidate_org(self, org_id):
+        org_id = str(org_id)
+        self.delete_where(lambda key, summary: key[0] == org_id)
+
+
+membership_cache = MembershipCache(
+    max_size=getattr(settings, "MEMBERSHIP_CACHE_MAX_SIZE", 10000),
+    ttl=getattr(settings, "MEMBERSHIP_CACHE_TTL", 60),
+)
+
+api_key_cache = APIKeyCache(
+    max_size=getattr(settings, "API_KEY_CACHE_MAX_SIZE", 1000),
+    ttl=getattr(settings, "API_KEY_CACHE_TTL", 30),
+)
+
+# {currency: rate} of common.fx, cleared when the rates are replaced
+fx_rate_cache = TTLCache(max_size=1, ttl=getattr(settings, "FX_RATE_CACHE_TTL", 300))
+
+dashboard_cache = DashboardCache(
+    max_size=getattr(settings, "DASHBOARD_CACHE_MAX_SIZE", 1000),
+    ttl=getattr(settings, "DASHBOARD_CACHE_TTL", 60),
+)
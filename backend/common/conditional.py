@@ -0,0 +1,186 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+
+Views compute a strong ETag for what they are about to return and answer
+304 Not Modified, without building the body, when the client already has
+that version.
+
+The entity detail views are wrapped with @conditional_detail. Their ETag
+is built from one query: the entity's updated_at, the latest updated_at
+and the number of its comments and attachments (and of any related rows
+the view renders), and of the org's profiles and teams. It also covers the
+requesting profile and the query string, since the response depends on
+both. Counts make deletions visible; saving the entity (which every
+update endpoint does, also for M2M changes) bumps updated_at, and so does
+team propagation (common.teams) on the records it reassigns. Linked rows
+that change on their own, such as contacts, tags and assignees, are
+declared as related sources of the view.
+
+Usage:
+    from common.conditional import conditional_detail, make_etag, not_modified
+
+    @conditional_detail(Account, related=[("cases.Case", "account")])
+    def get(self, request, pk, format=None):
+        ...
+
+    etag = make_etag(payload)
+    if not_modified(request, etag):
+        return set_validators(Response(status=304), etag, "private, no-cache")
+    return set_validators(Response(payload), etag, "private, no-cache")
+"""
+
+import functools
+import hashlib
+import json
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Func, IntegerField, OuterRef, Subquery
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+# Detail responses are private and always revalidated
+DETAIL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(value):
+    """Strong ETag of a JSON-serializable value (or of a str/bytes)."""
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, bytes):
+        value = json.dumps(
+            value, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+        ).encode()
+    return quote_etag(hashlib.sha256(value).hexdigest()[:32])
+
+
+def not_modified(request, etag):
+    """True if the request's If-None-Match matches etag."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+def set_validators(response, etag, cache_control):
+    """
+    Set ETag and Cache-Control on response.
+
+    cache_control is a header value, e.g. "private, no-cache".
+    """
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def _latest_and_count(queryset):
+    """Scalar subqueries: latest updated_at and row count of queryset."""
+    queryset = queryset.order_by()
+    return (
+        Subquery(
+            queryset.annotate(value=Func(F("updated_at"), function="MAX")).values(
+                "value"
+            )[:1]
+        ),
+        Subquery(
+            queryset.annotate(
+                value=Func(F("pk"), function="COUNT", output_field=IntegerField())
+            ).values("value")[:1]
+        ),
+    )
+
+
+def detail_etag(request, model, pk, related=()):
+    """
+    ETag of the detail response of model pk for request, or None.
+
+    Args:
+        request: DRF request with profile
+        model: Entity model (with comments/attachments by ContentType)
+        pk: Entity primary key
+        related: (model or "app_label.Model", lookup[, field]) tuples for
+            other rows the response renders: those whose lookup equals the
+            entity's field (default "pk")
+
+    Returns None if the entity does not exist, so that the view answers
+    as it normally would.
+    """
+    from common.models import Attachments, Comment, Profile, Teams
+
+    org = request.profile.org
+    content_type = ContentType.objects.get_for_model(model)
+    sources = {
+        "comments": Comment.objects.filter(
+            content_type=content_type, object_id=OuterRef("pk")
+        ),
+        "attachments": Attachments.objects.filter(
+            content_type=content_type, object_id=OuterRef("pk")
+        ),
+        "profiles": Profile.objects.filter(org=org),
+        "teams": Teams.objects.filter(org=org),
+    }
+    for related_model, lookup, *field in related:
+        if isinstance(related_model, str):
+            related_model = apps.get_model(related_model)
+        name = f"{related_model._meta.label_lower.replace('.', '_')}_{lookup}"
+        sources[name] = related_model._default_manager.filter(
+            **{lookup: OuterRef(field[0] if field else "pk")}
+        )
+
+    annotations = {}
+    for name, queryset in sources.items():
+        latest, count = _latest_and_count(queryset)
+        annotations[f"{name}_at"] = latest
+        annotations[f"{name}_count"] = count
+    try:
+        row = (
+            model._default_manager.filter(pk=pk, org=org)
+            .annotate(**annotations)
+            .values("updated_at", *annotations)
+            .first()
+        )
+    except (ValidationError, ValueError):
+        return None
+    if row is None:
+        return None
+
+    return make_etag(
+        {
+            "entity": [model._meta.label_lower, str(pk)],
+            "profile": [str(request.profile.id), request.profile.role],
+            "query": request.META.get("QUERY_STRING", ""),
+            "validators": row,
+        }
+    )
+
+
+def conditional_detail(model, related=()):
+    """
+    Decorator for detail view get(self, request, pk, ...) methods.
+
+    Answers 304 without running the view when If-None-Match matches the
+    detail_etag(); otherwise runs it and sets ETag/Cache-Control on 200s.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, pk, *args, **kwargs):
+            etag = detail_etag(request, model, pk, related)
+            if etag is not None and not_modified(request, etag):
+                return set_validators(
+                    Response(status=status.HTTP_304_NOT_MODIFIED),
+                    etag,
+                    DETAIL_CACHE_CONTROL,
+                )
+            response = view_method(self, request, pk, *args, **kwargs)
+            if etag is not None and response.status_code == status.HTTP_200_OK:
+                set_validators(response, etag, DETAIL_CACHE_CONTROL)
+            return response
+
+        return wrapper
+
+    return decorator
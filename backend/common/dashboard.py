@@ -0,0 +1,217 @@
+"""
+Dashboard summary for /api/dashboard/.
+
+Counts and money figures come from a handful of grouped aggregates (one
+per entity, opportunities grouped by stage over the amounts in org
+currency, see common.fx) instead of a COUNT/SUM query per figure, and the
+"recent" lists are bounded to DASHBOARD_RECENT_LIMIT rows rendered with
+the compact list serializers.
+
+Summaries are cached per (org, visibility scope, day) in dashboard_cache
+(common.cache). The signal handlers in common/signals.py drop an org's
+summaries whenever one of its records changes; changes made in another
+process show up within DASHBOARD_CACHE_TTL seconds.
+
+Usage:
+    from common.dashboard import get_dashboard
+
+    context = get_dashboard(request.profile, is_admin)
+"""
+
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.utils import timezone
+
+from accounts.models import Account
+from accounts.serializer import AccountListSerializer
+from common.cache import MISSING, dashboard_cache
+from common.models import Activity
+from common.serializer import ActivitySerializer
+from common.utils import STAGES
+from common.visibility import filter_visible
+from contacts.models import Contact
+from contacts.serializer import ContactListSerializer
+from leads.models import Lead
+from leads.serializer import LeadListSerializer
+from opportunity.models import Opportunity
+from opportunity.serializer import OpportunityListSerializer
+from tasks.models import Task
+from tasks.serializer import TaskListSerializer
+
+OPEN_STAGES = ("PROSPECTING", "QUALIFICATION", "PROPOSAL", "NEGOTIATION")
+OPEN_TASK_STATUSES = ("New", "In Progress")
+HOT_LEADS = Q(rating="HOT", status__in=["assigned", "in process"])
+
+
+def get_dashboard(profile, is_admin):
+    """The (possibly cached) dashboard summary of profile."""
+    today = date.today()
+    key = dashboard_cache.key(
+        profile.org_id, "org" if is_admin else profile.id, today
+    )
+    context = dashboard_cache.get(key)
+    if context is MISSING:
+        context = build_dashboard(profile, is_admin, today)
+        dashboard_cache.set(key, context)
+    return context
+
+
+def _recent(serializer_class, queryset, limit):
+    queryset = serializer_class.setup_queryset(queryset.order_by("-created_at"))
+    return serializer_class(queryset[:limit], many=True).data
+
+
+def _decimal(value):
+    return float(value or 0)
+
+
+def build_dashboard(profile, is_admin, today):
+    org = profile.org
+    limit = getattr(settings, "DASHBOARD_RECENT_LIMIT", 10)
+
+    accounts = Account.objects.filter(is_active=True, org=org)
+    contacts = Contact.objects.filter(org=org)
+    leads = Lead.objects.filter(org=org).exclude(status__in=["converted", "closed"])
+    opportunities = Opportunity.objects.filter(org=org)
+    tasks = Task.objects.filter(org=org)
+    if not is_admin:
+        accounts = filter_visible(accounts, profile)
+        contacts = filter_visible(contacts, profile)
+        leads = filter_visible(leads, profile)
+        opportunities = filter_visible(opportunities, profile)
+        tasks = filter_visible(tasks, profile)
+
+    lead_counts = leads.aggregate(
+        count=Count("id"),
+        followups_today=Count("id", filter=Q(next_follow_up=today)),
+        hot_leads=Count("id", filter=HOT_LEADS),
+    )
+    open_tasks = Q(status__in=OPEN_TASK_STATUSES)
+    task_counts = tasks.aggregate(
+        overdue_tasks=Count("id", filter=open_tasks & Q(due_date__lt=today)),
+        tasks_due_today=Count("id", filter=open_tasks & Q(due_date=today)),
+    )
+    # Conversion rate is org-wide, whatever the user can see
+    conversion = Lead.objects.filter(org=org).aggregate(
+        total=Count("id"), converted=Count("id", filter=Q(status="converted"))
+    )
+
+    context = {
+        "accounts_count": accounts.count(),
+        "contacts_count": contacts.count(),
+        "leads_count": lead_counts["count"],
+        "urgent_counts": {
+            "overdue_tasks": task_counts["overdue_tasks"],
+            "tasks_due_today": task_counts["tasks_due_today"],
+            "followups_today": lead_counts["followups_today"],
+            "hot_leads": lead_counts["hot_leads"],
+        },
+    }
+
+    # Money figures add up the amounts converted to the org's currency
+    # (common.fx); amounts without an exchange rate are only counted
+    org_currency = org.default_currency or "USD"
+    first_day_of_month = timezone.now().replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    by_stage = {
+        row["stage"]: row
+        for row in opportunities.order_by()
+        .values("stage")
+        .annotate(
+            count=Count("id"),
+            value=Sum("amount_org_currency"),
+            weighted=Sum(
+                F("amount_org_currency") * F("probability") / 100,
+                output_field=DecimalField(),
+            ),
+            won_this_month=Sum(
+                "amount_org_currency", filter=Q(updated_at__gte=first_day_of_month)
+            ),
+            other_currency=Count(
+                "id", filter=Q(amount__isnull=False, amount_org_currency__isnull=True)
+            ),
+        )
+    }
+    empty = {}
+    context["opportunities_count"] = sum(row["count"] for row in by_stage.values())
+    context["pipeline_by_stage"] = {
+        code: {
+            "count": by_stage.get(code, empty).get("count", 0),
+            "value": _decimal(by_stage.get(code, empty).get("value")),
+            "label": label,
+        }
+        for code, label in STAGES
+    }
+    total_leads = conversion["total"]
+    context["revenue_metrics"] = {
+        "pipeline_value": _decimal(
+            sum(by_stage.get(code, empty).get("value") or 0 for code in OPEN_STAGES)
+        ),
+        "weighted_pipeline": _decimal(
+            sum(by_stage.get(code, empty).get("weighted") or 0 for code in OPEN_STAGES)
+        ),
+        "won_this_month": _decimal(
+            by_stage.get("CLOSED_WON", empty).get("won_this_month")
+        ),
+        "conversion_rate": round(
+            conversion["converted"] / total_leads * 100 if total_leads else 0, 1
+        ),
+        "currency": org_currency,
+        "other_currency_count": sum(
+            row["other_currency"] for row in by_stage.values()
+        ),
+    }
+    context["opportunities_amount"] = _decimal(
+        sum(row["value"] or 0 for row in by_stage.values())
+    )
+
+    context["accounts"] = _recent(AccountListSerializer, accounts, limit)
+    context["contacts"] = _recent(ContactListSerializer, contacts, limit)
+    context["leads"] = _recent(LeadListSerializer, leads, limit)
+    context["opportunities"] = _recent(OpportunityListSerializer, opportunities, limit)
+
+    hot_leads = (
+        leads.filter(HOT_LEADS)
+        .only(
+            "id",
+            "first_name",
+            "last_name",
+            "company_name",
+            "rating",
+            "next_follow_up",
+            "last_contacted",
+        )
+        .order_by("-created_at")[:limit]
+    )
+    context["hot_leads"] = [
+        {
+            "id": str(lead.id),
+            "first_name": lead.first_name,
+            "last_name": lead.last_name,
+            "company": lead.company_name,
+            "rating": lead.rating,
+            "next_follow_up": lead.next_follow_up.isoformat()
+            if lead.next_follow_up
+            else None,
+            "last_contacted": lead.last_contacted.isoformat()
+            if lead.last_contacted
+            else None,
+        }
+        for lead in hot_leads
+    ]
+
+    upcoming_tasks = TaskListSerializer.setup_queryset(
+        tasks.filter(open_tasks, due_date__isnull=False)
+    ).order_by("due_date")[:limit]
+    context["tasks"] = TaskListSerializer(upcoming_tasks, many=True).data
+
+    activities = (
+        Activity.objects.filter(org=org)
+        .select_related("user", "user__user")
+        .order_by("-created_at")[:limit]
+    )
+    context["activities"] = ActivitySerializer(activities, many=True).data
+    return context
@@ -1,14 +1,115 @@
 import logging
 
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
-from common.models import Org, Profile
+from common.cache import api_key_cache, clone_profile
+from common.models import Org, Profile, hash_api_key
 
 logger = logging.getLogger(__name__)
 
 
+class OrgAwareJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that reuses the work done by GetProfileAndOrg.
+
+    The middleware verifies the access token once, loads the user together
+    with the profile and org, and stores the result on the Django request as
+    `jwt_token` / `jwt_user`. This class returns that result instead of
+    decoding the token and fetching the user a second time. Requests that
+    did not go through the middleware (e.g. auth endpoints it skips) fall
+    back to the standard simplejwt behaviour.
+    """
+
+    def authenticate(self, request):
+        django_request = getattr(request, "_request", request)
+        validated_token = getattr(django_request, "jwt_token", None)
+        if validated_token is None:
+            return super().authenticate(request)
+
+        user = getattr(django_request, "jwt_user", None)
+        if user is None:
+            user = self.get_user(validated_token)
+        else:
+            self.check_user(user, validated_token)
+        return user, validated_token
+
+    def get_validated_token_from_request(self, request):
+        """
+        Return the validated access token from the Authorization header.
+
+        Returns None when the header is absent or is not a Bearer token.
+        Raises InvalidToken / AuthenticationFailed like authenticate().
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return self.get_validated_token(raw_token)
+
+    def check_user(self, user, validated_token):
+        """Apply the same checks as JWTAuthentication.get_user() to a loaded user."""
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                jwt_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    "The user's password has been changed.", code="password_changed"
+                )
+
+
+def resolve_api_key(api_key):
+    """
+    Resolve an org API key to the admin Profile that acts on its behalf.
+
+    Shared by GetProfileAndOrg and APIKeyAuthentication. Keys are looked up
+    by their indexed SHA-256 digest, and the org, acting profile and user are
+    fetched in one joined query. Successful resolutions are kept in a short
+    lived in-process cache (common.cache.api_key_cache).
+
+    Returns:
+        Profile with org and user loaded
+
+    Raises:
+        AuthenticationFailed: if the key is unknown or the org has no
+            active admin profile
+    """
+    digest = hash_api_key(api_key)
+    profile = api_key_cache.get_profile(digest)
+    if profile is not None:
+        return profile
+
+    profile = (
+        Profile.objects.select_related("org", "user")
+        .filter(
+            org__api_key_digest=digest,
+            org__is_active=True,
+            role="ADMIN",
+            is_active=True,
+        )
+        .first()
+    )
+    if profile is None:
+        if Org.objects.filter(api_key_digest=digest, is_active=True).exists():
+            logger.error("No active admin profile found for API key org")
+            raise AuthenticationFailed("Invalid API Key configuration")
+        logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
+        raise AuthenticationFailed("Invalid API Key")
+
+    api_key_cache.set(digest, profile)
+    return clone_profile(profile)
+
+
 class APIKeyAuthentication(BaseAuthentication):
     """
     API Key authentication for programmatic/external access.
@@ -16,6 +117,9 @@ class APIKeyAuthentication(BaseAuthentication):
     Authenticates requests with 'Token' header containing an organization API key.
     This is used for service-to-service or programmatic access to the API.
 
+    If GetProfileAndOrg already resolved the key for this request, the
+    resolved profile is reused and no further lookup is made.
+
     Usage:
         curl -H "Token: <org_api_key>" https://api.example.com/endpoint/
     """
@@ -25,29 +129,24 @@ class APIKeyAuthentication(BaseAuthentication):
         if not api_key:
             return None  # Let other auth classes handle this request
 
-        try:
-            organization = Org.objects.get(api_key=api_key, is_active=True)
+        django_request = getattr(request, "_request", request)
+        profile = getattr(django_request, "api_key_profile", None)
+        if profile is None:
+            profile = resolve_api_key(api_key)
 
-            # Get an admin profile for this org to act as the authenticated user
-            profile = Profile.objects.filter(
-                org=organization, role="ADMIN", is_active=True
-            ).first()
+        # Set org context on request for downstream use
+        request.profile = profile
+        request.org = profile.org
+        request.META["org"] = str(profile.org_id)
 
-            if not profile:
-                logger.error(f"No active admin profile found for org {organization.id}")
-                raise AuthenticationFailed("Invalid API Key configuration")
+        logger.debug(f"API key authenticated: org={profile.org_id}")
+        return (profile.user, None)
 
-            # Set org context on request for downstream use
-            request.profile = profile
-            request.org = organization
-            request.META["org"] = str(organization.id)
 
-            logger.debug(f"API key authenticated: org={organization.id}")
-            return (profile.user, None)
+class OrgAwareJWTAuthenticationScheme(SimpleJWTScheme):
+    """OpenAPI schema extension for OrgAwareJWTAuthentication."""
 
-        except Org.DoesNotExist:
-            logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
-            raise AuthenticationFailed("Invalid API Key")
+    target_class = "common.external_auth.OrgAwareJWTAuthentication"
 
 
 class APIKeyAuthenticationScheme(OpenApiAuthenticationExtension):
@@ -0,0 +1,69 @@
+"""
+Facet counts for the CRM list views.
+
+Computes the total, named buckets (e.g. open/closed leads) and per-choice
+counts of fields (status, source, rating, stage, ...) of a filtered
+queryset with one conditional-aggregation query, instead of one COUNT per
+bucket. The list views pass the bucket counts to the paginator
+(CRMListPagination.paginate_list(count=...)) so it doesn't count again.
+
+Rows are counted with COUNT(DISTINCT pk), so querysets that join through
+to-many relations (assigned_to, tags) are counted correctly.
+
+Usage:
+    from common.facets import facet_counts
+
+    facets = facet_counts(
+        queryset,
+        buckets={"open": ~Q(status="closed"), "close": Q(status="closed")},
+        fields=["status", "source", "rating"],
+    )
+    facets["total"]                      # 42
+    facets["buckets"]["open"]            # 30
+    facets["fields"]["status"]["closed"] # 12
+"""
+
+from django.db.models import Count, Q
+
+
+def facet_counts(queryset, buckets=None, fields=()):
+    """
+    Count rows of queryset per bucket and per choice value in one query.
+
+    Args:
+        queryset: Filtered queryset
+        buckets: {name: Q} conditions, each counted separately
+        fields: Names of model fields with choices
+
+    Returns:
+        {"total": int, "buckets": {name: int}, "fields": {field: {value: int}}}
+    """
+    buckets = buckets or {}
+    aggregates = {"total": Count("pk", distinct=True)}
+
+    bucket_aliases = {}
+    for index, (name, condition) in enumerate(buckets.items()):
+        alias = f"bucket_{index}"
+        bucket_aliases[alias] = name
+        aggregates[alias] = Count("pk", distinct=True, filter=condition)
+
+    field_aliases = {}
+    for field_name in fields:
+        field = queryset.model._meta.get_field(field_name)
+        for index, (value, _label) in enumerate(field.flatchoices):
+            alias = f"{field_name}_{index}"
+            field_aliases[alias] = (field_name, value)
+            aggregates[alias] = Count(
+                "pk", distinct=True, filter=Q(**{field_name: value})
+            )
+
+    row = queryset.order_by().aggregate(**aggregates)
+
+    result = {
+        "total": row["total"],
+        "buckets": {name: row[alias] for alias, name in bucket_aliases.items()},
+        "fields": {field_name: {} for field_name in fields},
+    }
+    for alias, (field_name, value) in field_aliases.items():
+        result["fields"][field_name][value] = row[alias]
+    return result
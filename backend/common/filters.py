@@ -0,0 +1,286 @@
+"""
+Index-aware substring filters for the list views.
+
+Django's icontains is `UPPER(col) LIKE UPPER('%value%')`, which a btree
+index can't serve, so each user-typed filter used to be a scan of the
+org's rows. Models now list the columns they may be filtered on by
+substring in TRIGRAM_FIELDS. Their migrations add a pg_trgm GIN index on
+UPPER(col) for each (add_trigram_indexes()), which is exactly what
+icontains compares.
+
+contains_filter() only emits icontains where such an index exists and the
+value is long enough to have a trigram to look up. Shorter values match
+the whole column, case-insensitively (pg_trgm serves equality too); other
+columns only match exactly, which their btree index, if any, serves.
+
+On servers without the pg_trgm extension (e.g. a bare local Postgres) the
+migrations skip the indexes with a warning and the filters still work,
+just without index support.
+
+Usage:
+    class Lead(BaseModel):
+        TRIGRAM_FIELDS = ("first_name", "city")
+
+    # migration
+    operations = [add_trigram_indexes("leads.Lead", ("first_name", "city"))]
+
+    queryset = contains_filter(queryset, "city", params.get("city"))
+
+The list views filter through one declarative FilterSet per entity (in
+the app's filters.py). A FilterSet maps query parameters to filters,
+parses every value with the model field it targets (UUIDs, dates,
+decimals, choices) and answers 400 with all invalid parameters at once.
+M2M filters are EXISTS subqueries on the through table, so they add no
+joins and need no DISTINCT. sql() shows the query that will run.
+
+Usage:
+    class LeadFilterSet(FilterSet):
+        model = Lead
+
+        status = Filter("status")
+        city = ContainsFilter("city")
+        tags = RelatedFilter("tags")
+        created_at__gte = Filter("created_at", "gte")
+
+    queryset = LeadFilterSet(request.query_params, queryset).filter_queryset()
+"""
+
+import logging
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from common.search import apply_search
+
+logger = logging.getLogger(__name__)
+
+# pg_trgm needs one full trigram to use the index for LIKE '%value%'
+MIN_CONTAINS_LENGTH = 3
+
+
+def contains_filter(queryset, field, value):
+    """
+    Filter queryset to rows whose field contains value (case-insensitive).
+
+    Falls back to iexact for values shorter than MIN_CONTAINS_LENGTH, and
+    to exact for fields not in the model's TRIGRAM_FIELDS.
+    """
+    value = value.strip()
+    if field not in getattr(queryset.model, "TRIGRAM_FIELDS", ()):
+        return queryset.filter(**{field: value})
+    if len(value) < MIN_CONTAINS_LENGTH:
+        return queryset.filter(**{f"{field}__iexact": value})
+    return queryset.filter(**{f"{field}__icontains": value})
+
+
+def trigram_index_name(table, field):
+    return f"{table}_{field}_trgm_idx"
+
+
+def add_trigram_indexes(model_label, fields):
+    """
+    Migration operation adding pg_trgm GIN indexes on UPPER(field).
+
+    model_label is "app_label.ModelName".
+
+    Creates the pg_trgm extension if needed. Skipped, with a warning, when
+    the server doesn't provide it.
+    """
+
+    def forwards(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+            )
+            if cursor.fetchone() is None:
+                logger.warning(
+                    "pg_trgm is not available, skipping trigram indexes on %s",
+                    model_label,
+                )
+                return
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+        model = apps.get_model(model_label)
+        table = model._meta.db_table
+        quote = schema_editor.quote_name
+        for field in fields:
+            column = model._meta.get_field(field).column
+            name = quote(trigram_index_name(table, field))
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON {quote(table)} "
+                f"USING gin (UPPER({quote(column)}) gin_trgm_ops)"
+            )
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        table = apps.get_model(model_label)._meta.db_table
+        for field in fields:
+            schema_editor.execute(
+                "DROP INDEX IF EXISTS "
+                f"{schema_editor.quote_name(trigram_index_name(table, field))}"
+            )
+
+    return migrations.RunPython(forwards, backwards)
+
+
+class Filter:
+    """
+    Filter on field__lookup, the value parsed by the model field.
+
+    Values of fields with choices must be one of them (exact lookups).
+    """
+
+    many = False
+
+    def __init__(self, field, lookup="exact"):
+        self.field = field
+        self.lookup = lookup
+
+    def model_field(self, model):
+        return model._meta.get_field(self.field)
+
+    def get_values(self, params, name):
+        """The parameter's non-empty raw values (comma-separated or repeated)."""
+        if not self.many:
+            value = params.get(name, "").strip()
+            return [value] if value else []
+        return [
+            value.strip()
+            for raw in params.getlist(name)
+            for value in raw.split(",")
+            if value.strip()
+        ]
+
+    def parse(self, model, value):
+        field = self.model_field(model)
+        if field.is_relation:
+            field = field.target_field
+        value = field.to_python(value)
+        if field.choices and self.lookup == "exact":
+            if value not in {choice for choice, _ in field.flatchoices}:
+                raise DjangoValidationError(f"Select a valid choice, not {value!r}.")
+        if isinstance(field, models.DateTimeField) and timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+    def apply(self, queryset, value):
+        return queryset.filter(**{f"{self.field}__{self.lookup}": value})
+
+
+class ContainsFilter(Filter):
+    """Substring filter (contains_filter) on all of fields."""
+
+    def __init__(self, *fields):
+        super().__init__(fields[0])
+        self.fields = fields
+
+    def parse(self, model, value):
+        return value
+
+    def apply(self, queryset, value):
+        for field in self.fields:
+            queryset = contains_filter(queryset, field, value)
+        return queryset
+
+
+class SearchFilter(Filter):
+    """Full-text search (common.search) on the model's SEARCH_FIELDS."""
+
+    def __init__(self):
+        super().__init__(None)
+
+    def parse(self, model, value):
+        return value
+
+    def apply(self, queryset, value):
+        return apply_search(queryset, value)
+
+
+class RelatedFilter(Filter):
+    """
+    Rows related to any of the given ids through the M2M field.
+
+    An EXISTS on the through table instead of a join, so rows don't
+    repeat and the queryset needs no DISTINCT.
+    """
+
+    many = True
+
+    def parse(self, model, value):
+        return self.model_field(model).target_field.to_python(value)
+
+    def apply(self, queryset, values):
+        field = self.model_field(queryset.model)
+        through = field.remote_field.through
+        return queryset.filter(
+            Exists(
+                through.objects.filter(
+                    **{
+                        field.m2m_field_name(): OuterRef("pk"),
+                        f"{field.m2m_reverse_field_name()}__in": values,
+                    }
+                )
+            )
+        )
+
+
+class FilterSet:
+    """
+    Query parameter filters of a list view.
+
+    Subclasses set model and declare filters as class attributes; the
+    attribute name is the query parameter.
+    """
+
+    model = None
+    filters = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.filters = {**cls.filters}
+        for name, value in vars(cls).items():
+            if isinstance(value, Filter):
+                cls.filters[name] = value
+
+    def __init__(self, params, queryset):
+        self.params = params
+        self.queryset = queryset
+
+    def clean(self):
+        """
+        Parsed values of the filters present in params.
+
+        Raises ValidationError (400) listing every invalid parameter.
+        """
+        cleaned, errors = {}, {}
+        for name, filter_ in self.filters.items():
+            values = filter_.get_values(self.params, name)
+            if not values:
+                continue
+            try:
+                parsed = [filter_.parse(self.model, value) for value in values]
+            except (DjangoValidationError, ValueError, TypeError) as e:
+                messages = getattr(e, "messages", None) or [str(e)]
+                errors[name] = messages
+                continue
+            cleaned[name] = parsed if filter_.many else parsed[0]
+        if errors:
+            raise ValidationError(errors)
+        return cleaned
+
+    def filter_queryset(self):
+        queryset = self.queryset
+        for name, value in self.clean().items():
+            queryset = self.filters[name].apply(queryset, value)
+        return queryset
+
+    def sql(self):
+        """SQL of the filtered queryset, for inspection and EXPLAIN."""
+        return str(self.filter_queryset().query)
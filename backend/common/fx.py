@@ -0,0 +1,169 @@
+"""
+Exchange rates and amounts normalized to the org's default currency.
+
+Opportunity.amount, Lead.opportunity_amount and Invoice.total_amount each
+have a *_org_currency twin holding the amount converted to the org's
+default currency (amounts without a currency are taken to be in it). The
+twin is NULL when there is no rate for either currency. Pipeline, forecast
+and revenue figures are a plain SUM over the twin, across all currencies.
+
+The twins are kept current:
+- on save, by the pre_save handlers in common/signals.py (convert());
+- on rate changes, by set_rates(), which replaces the ExchangeRate table
+  and recomputes every org's amounts with one UPDATE per model and org;
+- on a change of the org's default currency (normalize_org_amounts()).
+
+Rates are loaded from a local JSON or CSV file (load_rates_file()) with
+`python manage.py load_fx_rates`, and cached per process for
+FX_RATE_CACHE_TTL seconds.
+
+Usage:
+    from common.fx import convert, set_rates
+
+    set_rates({"USD": 1, "EUR": "0.92"})
+    convert(Decimal("100"), "EUR", "USD")  # Decimal("108.70")
+"""
+
+import csv
+import json
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models import Case, DecimalField, F, Q, Value, When
+
+from common.cache import MISSING, fx_rate_cache
+from common.rls import get_set_local_context_sql
+
+# model label -> (amount field, normalized amount field)
+NORMALIZED_AMOUNTS = {
+    "opportunity.Opportunity": ("amount", "amount_org_currency"),
+    "leads.Lead": ("opportunity_amount", "opportunity_amount_org_currency"),
+    "invoices.Invoice": ("total_amount", "total_amount_org_currency"),
+}
+FACTOR_PLACES = Decimal("1e-10")
+CENTS = Decimal("0.01")
+
+
+def get_rates():
+    """{currency: rate} of the ExchangeRate table (cached)."""
+    from common.models import ExchangeRate
+
+    rates = fx_rate_cache.get("rates")
+    if rates is MISSING:
+        rates = dict(ExchangeRate.objects.values_list("currency", "rate"))
+        fx_rate_cache.set("rates", rates)
+    return rates
+
+
+def conversion_factor(from_currency, to_currency, rates=None):
+    """Multiplier from from_currency to to_currency, or None without rates."""
+    if not from_currency or from_currency == to_currency:
+        return Decimal(1)
+    rates = get_rates() if rates is None else rates
+    if from_currency not in rates or to_currency not in rates:
+        return None
+    return (rates[to_currency] / rates[from_currency]).quantize(FACTOR_PLACES)
+
+
+def convert(amount, from_currency, to_currency, rates=None):
+    """amount in to_currency (to the cent), or None if it can't be converted."""
+    if amount is None:
+        return None
+    factor = conversion_factor(from_currency, to_currency, rates)
+    if factor is None:
+        return None
+    return (Decimal(amount) * factor).quantize(CENTS)
+
+
+def normalize_instance(instance, org_currency):
+    """Set instance's normalized amount field from its amount and currency."""
+    amount_field, normalized_field = NORMALIZED_AMOUNTS[instance._meta.label]
+    setattr(
+        instance,
+        normalized_field,
+        convert(getattr(instance, amount_field), instance.currency, org_currency),
+    )
+
+
+def normalized_amount_expression(amount_field, org_currency, rates):
+    """SQL expression of amount_field converted to org_currency."""
+    output_field = DecimalField(max_digits=14, decimal_places=2)
+    whens = [
+        When(
+            Q(currency__isnull=True) | Q(currency="") | Q(currency=org_currency),
+            then=F(amount_field),
+        )
+    ]
+    for currency in rates:
+        factor = conversion_factor(currency, org_currency, rates)
+        if factor is not None and currency != org_currency:
+            whens.append(
+                When(
+                    currency=currency,
+                    then=F(amount_field) * Value(factor, output_field=output_field),
+                )
+            )
+    return Case(*whens, default=Value(None), output_field=output_field)
+
+
+def normalize_org_amounts(org, rates=None):
+    """Recompute the normalized amounts of all of org's records."""
+    rates = get_rates() if rates is None else rates
+    org_currency = org.default_currency or "USD"
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(get_set_local_context_sql(), [str(org.id)])
+        for label, (amount_field, normalized_field) in NORMALIZED_AMOUNTS.items():
+            apps.get_model(label).objects.filter(org=org).update(
+                **{
+                    normalized_field: normalized_amount_expression(
+                        amount_field, org_currency, rates
+                    )
+                }
+            )
+
+
+def set_rates(rates):
+    """
+    Replace the ExchangeRate table with rates ({currency: rate}) and
+    recompute every org's normalized amounts.
+    """
+    from common.models import ExchangeRate, Org
+
+    rates = {currency.upper(): Decimal(str(rate)) for currency, rate in rates.items()}
+    with transaction.atomic():
+        ExchangeRate.objects.exclude(currency__in=rates).delete()
+        ExchangeRate.objects.bulk_create(
+            [ExchangeRate(currency=c, rate=r) for c, r in rates.items()],
+            update_conflicts=True,
+            unique_fields=["currency"],
+            update_fields=["rate", "updated_at"],
+        )
+    fx_rate_cache.clear()
+    transaction.on_commit(fx_rate_cache.clear)
+    for org in Org.objects.iterator():
+        normalize_org_amounts(org, rates)
+
+
+def load_rates_file(path):
+    """
+    {currency: rate} from a local file.
+
+    JSON: {"base": "USD", "rates": {"EUR": 0.92, ...}} (or just the rates
+    object). CSV: currency,rate rows, with or without a header. The base,
+    if given, is added with rate 1.
+    """
+    with open(path, newline="") as f:
+        if str(path).endswith(".json"):
+            data = json.load(f)
+            rates = dict(data.get("rates", data))
+            rates.pop("base", None)
+            if data.get("base"):
+                rates.setdefault(data["base"], 1)
+            return rates
+        return {
+            row[0].strip(): row[1].strip()
+            for row in csv.reader(f)
+            if len(row) >= 2 and row[0].strip().lower() != "currency"
+        }
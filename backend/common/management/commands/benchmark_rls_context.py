@@ -0,0 +1,140 @@
+"""
+Management command to benchmark the RLS context modes of RequireOrgContext.
+
+Runs the same authenticated API request repeatedly through the full
+middleware stack in "session" and "transaction" mode and reports latency
+percentiles and statements issued through Django per request (the
+BEGIN/COMMIT that psycopg2 sends for the transaction mode are not counted,
+but are included in the timings).
+
+Seed data first, then benchmark as the seeded admin:
+    python manage.py seed_data --email admin@example.com --leads 500
+    python manage.py benchmark_rls_context --email admin@example.com
+    python manage.py benchmark_rls_context --email admin@example.com \\
+        --path /api/leads/ --path /api/accounts/ --requests 500
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from common.models import Profile
+from common.serializer import OrgAwareRefreshToken
+
+
+class QueryCounter:
+    """Execute wrapper counting statements sent to the database."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Compare p50/p99 latency of the session and transaction RLS context modes"
+
+    MODES = ["session", "transaction"]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            type=str,
+            required=True,
+            help="Email of a seeded user (its first active org is used)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="API path to request (repeatable, default: /api/leads/)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Measured requests per mode and path (default: 200)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Unmeasured warm-up requests per mode and path (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("RLS context benchmarking requires PostgreSQL")
+
+        profile = (
+            Profile.objects.select_related("user", "org")
+            .filter(user__email=options["email"], is_active=True)
+            .first()
+        )
+        if profile is None:
+            raise CommandError(
+                f"No active profile for {options['email']}. Run seed_data first."
+            )
+
+        token = OrgAwareRefreshToken.for_user_and_org(
+            profile.user, profile.org, profile
+        ).access_token
+        paths = options["paths"] or ["/api/leads/"]
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Benchmarking RLS context modes for org '{profile.org.name}'"
+            )
+        )
+        self.stdout.write(
+            f"{'path':<30} {'mode':<12} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'mean ms':>9} {'queries':>8}"
+        )
+
+        for path in paths:
+            for mode in self.MODES:
+                result = self.run_mode(mode, path, token, options)
+                self.stdout.write(
+                    f"{path:<30} {mode:<12} {result['p50']:>9.2f} "
+                    f"{result['p99']:>9.2f} {result['mean']:>9.2f} "
+                    f"{result['queries']:>8.1f}"
+                )
+
+    def run_mode(self, mode, path, token, options):
+        """Time requests to path with RequireOrgContext in the given mode."""
+        timings = []
+        counter = QueryCounter()
+
+        # A new Client builds its own handler, so the middleware picks up
+        # the overridden mode.
+        with override_settings(RLS_CONTEXT_MODE=mode):
+            client = Client(
+                HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_HOST="localhost"
+            )
+            for _ in range(options["warmup"]):
+                self.request(client, path)
+
+            with connection.execute_wrapper(counter):
+                for _ in range(options["requests"]):
+                    start = time.perf_counter()
+                    self.request(client, path)
+                    timings.append((time.perf_counter() - start) * 1000)
+
+        percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+        return {
+            "p50": percentiles[49],
+            "p99": percentiles[98],
+            "mean": statistics.fmean(timings),
+            "queries": counter.count / len(timings),
+        }
+
+    def request(self, client, path):
+        response = client.get(path)
+        if response.status_code >= 400:
+            raise CommandError(f"GET {path} returned {response.status_code}")
+        return response
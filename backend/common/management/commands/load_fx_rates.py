@@ -0,0 +1,47 @@
+"""
+Management command to load exchange rates from a local file (common.fx).
+
+Replaces the exchange rate table and recomputes every org's amounts in its
+default currency.
+
+Usage:
+    python manage.py load_fx_rates                     # settings.FX_RATES_FILE
+    python manage.py load_fx_rates rates.json
+    python manage.py load_fx_rates rates.csv           # currency,rate rows
+"""
+
+from decimal import InvalidOperation
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.fx import load_rates_file, set_rates
+
+
+class Command(BaseCommand):
+    help = "Load exchange rates from a JSON or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=None,
+            help="Rates file (default: settings.FX_RATES_FILE)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.FX_RATES_FILE
+        try:
+            rates = load_rates_file(path)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read rates from {path}: {e}")
+        if not rates:
+            raise CommandError(f"No rates in {path}")
+
+        try:
+            set_rates(rates)
+        except InvalidOperation:
+            raise CommandError(f"Invalid rate in {path}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Loaded {len(rates)} exchange rates from {path}")
+        )
@@ -0,0 +1,41 @@
+"""
+Management command to write pipeline rollups on demand (common.snapshots).
+
+The snapshot_pipelines Celery task does the same nightly.
+
+Usage:
+    python manage.py snapshot_pipelines                    # all orgs, today
+    python manage.py snapshot_pipelines --org <org id>
+    python manage.py snapshot_pipelines --date 2026-01-31
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.models import Org
+from common.snapshots import snapshot_org
+
+
+class Command(BaseCommand):
+    help = "Write the daily pipeline snapshot rows of every (or one) org"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", help="Only snapshot this org (id)")
+        parser.add_argument(
+            "--date", help="Snapshot date, YYYY-MM-DD (default: today)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError:
+            raise CommandError(f"Invalid date: {options['date']}")
+
+        orgs = Org.objects.all()
+        if options["org"]:
+            orgs = orgs.filter(id=options["org"])
+        for org in orgs.iterator():
+            rows = snapshot_org(org, day)
+            self.stdout.write(f"{org.name}: {rows} rows")
+        self.stdout.write(self.style.SUCCESS("Pipeline snapshots written"))
@@ -0,0 +1,51 @@
+"""
+@mentions in comments.
+
+A member is mentioned by their Profile.handle, which defaults to the local
+part of their email ("@jane" for jane@acme.com) and can be changed on the
+profile. Handles are lowercase and need not be unique: a mention reaches
+every active member of the org with that handle.
+
+parse_mentions() extracts every handle of a text first, so that
+resolve_mentions() looks them all up with one query on the
+(org, handle) index.
+
+Usage:
+    handles = parse_mentions("Thanks @jane, @Bob.")  # ["jane", "bob"]
+    profile_ids = resolve_mentions(org_id, handles)
+"""
+
+import re
+
+# "@" not preceded by a word character, so emails in the text don't match
+MENTION_RE = re.compile(r"(?<![\w@])@([\w.+-]+)")
+HANDLE_RE = re.compile(r"^[\w.+-]+$")
+
+
+def default_handle(email):
+    """Handle of a new profile: the lowercased local part of email."""
+    return (email or "").split("@", 1)[0].lower()[:64]
+
+
+def parse_mentions(text):
+    """Unique lowercased handles mentioned in text, in order."""
+    handles = []
+    for match in MENTION_RE.finditer(text or ""):
+        handle = match.group(1).rstrip(".").lower()
+        if handle and handle not in handles:
+            handles.append(handle)
+    return handles
+
+
+def resolve_mentions(org_id, handles):
+    """Ids of the active profiles of org_id with one of handles."""
+    from common.models import Profile
+
+    if not handles:
+        return []
+    return [
+        str(profile_id)
+        for profile_id in Profile.objects.filter(
+            org_id=org_id, handle__in=handles, is_active=True, user__is_active=True
+        ).values_list("id", flat=True)
+    ]
@@ -0,0 +1,135 @@
+"""
+Reference data bundles served by /api/meta/.
+
+The list and detail views used to embed the same reference data in every
+response: the static choice lists of common.utils (countries, industries,
+statuses, ...) and per-org lookups (tags, users, teams, accounts, contacts,
+open leads). Clients now fetch both once and revalidate them with ETags:
+
+    GET /api/meta/              static choices, public, versioned
+    GET /api/meta/?v=<version>  same, cacheable forever
+    GET /api/meta/lookups/      per-org lookups for the current user
+
+The static bundle's version is a hash of its content, so it changes with
+every deploy that changes a choice list. Views only embed reference data
+when include_reference_data(request) is true: API_INCLUDE_REFERENCE_DATA
+(default True) or ?reference_data=true|false.
+
+Usage:
+    from common.meta import include_reference_data
+
+    if include_reference_data(self.request):
+        context["countries"] = COUNTRIES
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+
+from common.conditional import make_etag
+from common.utils import (
+    CASE_TYPE,
+    COUNTRIES,
+    CURRENCY_CODES,
+    INDCHOICES,
+    LEAD_SOURCE,
+    LEAD_STATUS,
+    OPPORTUNITY_TYPES,
+    PRIORITY_CHOICE,
+    ROLES,
+    SOURCES,
+    STAGES,
+    STATUS_CHOICE,
+)
+from common.visibility import filter_visible
+from tasks.utils import PRIORITY_CHOICES as TASK_PRIORITY_CHOICES
+from tasks.utils import STATUS_CHOICES as TASK_STATUS_CHOICES
+
+REFERENCE_DATA_PARAM = "reference_data"
+
+
+def include_reference_data(request):
+    """Whether a list/detail response should embed reference data."""
+    value = request.query_params.get(REFERENCE_DATA_PARAM)
+    if value is None:
+        return getattr(settings, "API_INCLUDE_REFERENCE_DATA", True)
+    return value.lower() not in ("0", "false", "no")
+
+
+@lru_cache(maxsize=None)
+def static_bundle():
+    """
+    The static choice lists, their version and ETag.
+
+    Returns:
+        (data, etag) where data["version"] identifies the content
+    """
+    data = {
+        "countries": COUNTRIES,
+        "industries": INDCHOICES,
+        "currencies": CURRENCY_CODES,
+        "roles": ROLES,
+        "leads": {"status": LEAD_STATUS, "source": LEAD_SOURCE},
+        "accounts": {"status": ["active", "inactive"]},
+        "opportunities": {
+            "stage": STAGES,
+            "lead_source": SOURCES,
+            "opportunity_type": OPPORTUNITY_TYPES,
+        },
+        "cases": {
+            "status": STATUS_CHOICE,
+            "priority": PRIORITY_CHOICE,
+            "type_of_case": CASE_TYPE,
+        },
+        "tasks": {"status": TASK_STATUS_CHOICES, "priority": TASK_PRIORITY_CHOICES},
+    }
+    etag = make_etag(data)
+    data["version"] = etag.strip('"')[:12]
+    return data, etag
+
+
+def org_lookups(profile):
+    """
+    Per-org lookup lists visible to profile.
+
+    Non-admins only see the accounts, contacts and leads they created or
+    are assigned to, as in the list views.
+    """
+    from accounts.models import Account
+    from common.models import Profile, Tags, Teams
+    from contacts.models import Contact
+    from leads.models import Lead
+
+    org = profile.org
+    accounts = Account.objects.filter(org=org)
+    contacts = Contact.objects.filter(org=org)
+    leads = Lead.objects.filter(org=org).exclude(status__in=["converted", "closed"])
+    if profile.role != "ADMIN" and not profile.is_admin:
+        accounts = filter_visible(accounts, profile)
+        contacts = filter_visible(contacts, profile)
+        leads = filter_visible(leads, profile)
+
+    return {
+        "tags": list(
+            Tags.objects.filter(org=org).order_by("name").values("id", "name", "slug")
+        ),
+        "users": list(
+            Profile.objects.filter(is_active=True, org=org)
+            .order_by("user__email")
+            .values("id", "user__email")
+        ),
+        "teams": list(
+            Teams.objects.filter(org=org).order_by("name").values("id", "name")
+        ),
+        "accounts": list(accounts.order_by("name").values("id", "name")),
+        "contacts": list(
+            contacts.order_by("first_name", "last_name").values(
+                "id", "first_name", "last_name"
+            )
+        ),
+        "leads": list(
+            leads.order_by("first_name", "last_name").values(
+                "id", "first_name", "last_name", "company_name"
+            )
+        ),
+    }
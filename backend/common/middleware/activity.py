@@ -0,0 +1,18 @@
+from common.activity import activity_batch
+
+
+class ActivityBatchMiddleware:
+    """
+    Collect the Activity records created during a request and write them
+    with one bulk_create when the view returns.
+
+    Place it after RequireOrgContext, so the batch is written inside the
+    request's RLS context (and its transaction in "transaction" mode).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with activity_batch():
+            return self.get_response(request)
@@ -7,10 +7,12 @@ from django.contrib.auth import logout
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.utils.functional import SimpleLazyObject
 from rest_framework import status
-from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 
-from common.models import Org, Profile, User
+from common.cache import membership_cache
+from common.external_auth import OrgAwareJWTAuthentication, resolve_api_key
+from common.middleware.route_policy import get_route_registry
+from common.models import Profile, User
 
 logger = logging.getLogger(__name__)
 
@@ -23,31 +25,30 @@ class GetProfileAndOrg(object):
     not from client-provided headers. This prevents org spoofing attacks.
 
     The org context is cryptographically verified as part of the JWT signature.
+
+    Public endpoints are skipped based on the compiled route policies
+    (see route_policy.py) rather than a hard-coded path list.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.jwt_authenticator = OrgAwareJWTAuthentication()
 
     def __call__(self, request):
         self.process_request(request)
         return self.get_response(request)
 
     def process_request(self, request):
-        # Skip JWT validation for authentication endpoints that don't need org context
-        auth_skip_paths = [
-            "/api/auth/login/",
-            "/api/auth/google/",
-            "/api/auth/register/",
-            "/api/auth/refresh-token/",
-            "/api/auth/me/",
-            "/api/auth/switch-org/",
-        ]
-        if request.path in auth_skip_paths:
+        # Skip credential processing for public endpoints (login, register,
+        # token refresh, OAuth callback): views with authentication_classes = []
+        if not get_route_registry().policy_for(request.path).authenticate:
             return
 
         # Initialize request attributes
         request.profile = None
         request.org = None
+        request.jwt_token = None
+        request.jwt_user = None
 
         # Try JWT token first (primary authentication)
         if request.headers.get("Authorization"):
@@ -65,15 +66,19 @@ class GetProfileAndOrg(object):
         Process JWT authentication and extract org context from token.
 
         SECURITY: Org ID is extracted from the signed JWT payload, not headers.
-        """
-        from rest_framework_simplejwt.tokens import AccessToken
 
+        The token is verified once here. The validated token and the user
+        (loaded in the same query as the profile and org) are stored on the
+        request as `jwt_token` / `jwt_user` so that OrgAwareJWTAuthentication
+        can reuse them instead of verifying and loading again.
+        """
         try:
-            auth_header = request.headers.get("Authorization")
-            token_value = auth_header.split(" ")[1]
-
-            # Validate and decode token
-            access_token = AccessToken(token_value)
+            access_token = self.jwt_authenticator.get_validated_token_from_request(
+                request
+            )
+            if access_token is None:
+                return
+            request.jwt_token = access_token
             user_id = access_token["user_id"]
 
             # Get org_id from JWT claim (SECURE - cryptographically signed)
@@ -85,13 +90,14 @@ class GetProfileAndOrg(object):
                 logger.debug(f"JWT token for user {user_id} has no org_id claim")
                 return
 
-            # Validate user membership in the org
+            # Validate user membership in the org (cached per process,
+            # invalidated on Profile/Org/User changes)
             try:
-                profile = Profile.objects.select_related("org").get(
-                    user_id=user_id, org_id=org_id, is_active=True
-                )
+                profile = membership_cache.get_profile(user_id, org_id)
                 request.profile = profile
                 request.org = profile.org
+                request.jwt_user = profile.user
+                request.user = profile.user
                 logger.debug(f"Set org context from JWT: user={user_id}, org={org_id}")
 
             except Profile.DoesNotExist:
@@ -117,25 +123,17 @@ class GetProfileAndOrg(object):
             return
 
     def _process_api_key_auth(self, request, api_key):
-        """Process API key authentication."""
-        try:
-            organization = Org.objects.get(api_key=api_key, is_active=True)
-
-            # Get an admin profile for this org
-            profile = Profile.objects.filter(
-                org=organization, role="ADMIN", is_active=True
-            ).first()
-
-            if not profile:
-                logger.error(f"No active admin profile found for org {organization.id}")
-                raise AuthenticationFailed("Invalid API Key configuration")
+        """
+        Process API key authentication.
 
-            request.profile = profile
-            request.org = organization
-            request.META["org"] = str(organization.id)
+        The resolved profile is stored as `api_key_profile` so that
+        APIKeyAuthentication does not look the key up again.
+        """
+        profile = resolve_api_key(api_key)
 
-            logger.debug(f"Set org context from API key: org={organization.id}")
+        request.profile = profile
+        request.org = profile.org
+        request.api_key_profile = profile
+        request.META["org"] = str(profile.org_id)
 
-        except Org.DoesNotExist:
-            logger.warning(f"Invalid API key attempted: {api_key[:8]}...")
-            raise AuthenticationFailed("Invalid API Key")
+        logger.debug(f"Set org context from API key: org={profile.org_id}")
@@ -17,14 +17,69 @@ Usage in settings.py:
         'common.middleware.rls_context.SetOrgContext',  # After GetProfileAndOrg
         ...
     ]
+
+Context modes (RequireOrgContext, settings.RLS_CONTEXT_MODE):
+    "session"      (default) set_config(..., false) before the view and a
+                   reset afterwards: two extra round-trips per request.
+    "transaction"  the view runs inside transaction.atomic() and the context
+                   is applied with set_config(..., true) (SET LOCAL), folded
+                   into the first statement of the request. No extra
+                   round-trips and safe behind a transaction-mode pooler.
+
+Benchmark both modes with `python manage.py benchmark_rls_context`.
 """
 
 import logging
+import uuid
 
-from django.db import connection
+from django.conf import settings
+from django.db import connection, transaction
+
+from common.middleware.route_policy import get_route_registry
+from common.rls import CONTEXT_VARIABLE, get_set_local_context_sql
 
 logger = logging.getLogger(__name__)
 
+RLS_CONTEXT_MODE_SESSION = "session"
+RLS_CONTEXT_MODE_TRANSACTION = "transaction"
+
+
+class OrgContextInjector:
+    """
+    Database execute wrapper that prepends SET LOCAL of the org context to
+    the first statement run inside the request transaction.
+
+    psycopg2 sends the combined string in a single round-trip, and because
+    it runs inside the already open transaction the setting stays in effect
+    for every later statement until COMMIT/ROLLBACK.
+
+    Usage:
+        with transaction.atomic(), connection.execute_wrapper(
+            OrgContextInjector(org_id)
+        ):
+            ...
+    """
+
+    def __init__(self, org_id):
+        # Validated as a UUID, so it is safe to inline as a literal
+        self.org_id = str(uuid.UUID(str(org_id)))
+        self.applied = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.applied:
+            return execute(sql, params, many, context)
+        self.applied = True
+
+        if getattr(context["cursor"].cursor, "name", None):
+            # Server-side (named) cursors wrap the query in DECLARE, which
+            # cannot be combined with another statement: set it separately.
+            with context["connection"].cursor() as cursor:
+                cursor.execute(get_set_local_context_sql(), [self.org_id])
+            return execute(sql, params, many, context)
+
+        prefix = f"SELECT set_config('{CONTEXT_VARIABLE}', '{self.org_id}', true); "
+        return execute(prefix + sql, params, many, context)
+
 
 class SetOrgContext:
     """
@@ -102,43 +157,37 @@ class RequireOrgContext:
             'common.middleware.rls_context.RequireOrgContext',
             ...
         ]
-    """
 
-    # Paths that don't require org context
-    EXEMPT_PATHS = [
-        "/api/auth/login/",
-        "/api/auth/register/",
-        "/api/auth/refresh-token/",
-        "/api/auth/me/",
-        "/api/auth/switch-org/",
-        "/api/auth/google/",
-        "/api/org/",
-        "/admin/",
-        "/swagger-ui/",
-        "/api/schema/",
-    ]
+    Which paths need org context is declared by the views themselves and
+    compiled once into a path -> policy registry (see route_policy.py), so
+    no URL resolution happens per request.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.mode = getattr(settings, "RLS_CONTEXT_MODE", RLS_CONTEXT_MODE_SESSION)
+        if self.mode not in (RLS_CONTEXT_MODE_SESSION, RLS_CONTEXT_MODE_TRANSACTION):
+            raise ValueError(f"Invalid RLS_CONTEXT_MODE: {self.mode!r}")
 
     def __call__(self, request):
-        # Check if path requires org context
-        if not self._is_exempt(request.path):
-            # Skip check for URLs that don't resolve (let Django return 404)
-            from django.urls import resolve
-            from django.urls.exceptions import Resolver404
-
-            try:
-                resolve(request.path)
-            except Resolver404:
-                return self.get_response(request)
-
-            if not hasattr(request, "org") or request.org is None:
-                from rest_framework.exceptions import PermissionDenied
-
-                raise PermissionDenied(
-                    "Organization context is required. Please login again."
-                )
+        policy = get_route_registry().policy_for(request.path)
+
+        # Skip check for URLs that don't resolve (let Django return 404)
+        if not policy.resolvable:
+            return self.get_response(request)
+
+        if policy.org_required and getattr(request, "org", None) is None:
+            from rest_framework.exceptions import PermissionDenied
+
+            raise PermissionDenied(
+                "Organization context is required. Please login again."
+            )
+
+        if (
+            self.mode == RLS_CONTEXT_MODE_TRANSACTION
+            and getattr(request, "org", None) is not None
+        ):
+            return self._call_in_transaction(request)
 
         # Set org context
         self._set_org_context(request)
@@ -150,9 +199,16 @@ class RequireOrgContext:
 
         return response
 
-    def _is_exempt(self, path):
-        """Check if path is exempt from org context requirement."""
-        return any(path.startswith(exempt) for exempt in self.EXEMPT_PATHS)
+    def _call_in_transaction(self, request):
+        """
+        Run the rest of the request in one transaction with SET LOCAL context.
+
+        Note: the whole view becomes atomic, so writes are committed together
+        when the response is produced (on_commit hooks run at that point).
+        """
+        injector = OrgContextInjector(request.org.id)
+        with transaction.atomic(), connection.execute_wrapper(injector):
+            return self.get_response(request)
 
     def _set_org_context(self, request):
         """Set PostgreSQL session variable (session scope for autocommit mode)."""
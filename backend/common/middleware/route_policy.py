@@ -0,0 +1,171 @@
+"""
+Compiled per-route policies for the org context middleware.
+
+Instead of hard-coded path lists in GetProfileAndOrg and RequireOrgContext,
+each view declares its own requirements and the URLconf is compiled once
+into a registry that maps a request path to a RoutePolicy without calling
+django.urls.resolve() per request.
+
+Views declare their requirements with class attributes or the decorator:
+
+    class MeView(APIView):
+        org_context_required = False   # no org needed (JWT still processed)
+
+    class LoginView(APIView):
+        authentication_classes = []     # no credentials processed, no org
+
+    path("swagger-ui/", org_context_exempt(SpectacularSwaggerView.as_view()))
+
+Defaults: views require org context unless they declare otherwise, or are
+public (authentication_classes = []), or live in an exempt URL namespace.
+
+Usage:
+    from common.middleware.route_policy import get_route_registry
+
+    policy = get_route_registry().policy_for(request.path)
+    if policy.resolvable and policy.org_required: ...
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.urls import URLResolver, get_resolver, get_urlconf
+
+# URL namespaces whose views never need org context (third-party views)
+ORG_CONTEXT_EXEMPT_NAMESPACES = ("admin",)
+
+# Bound on the memoized path -> policy map (detail URLs embed UUIDs)
+POLICY_CACHE_SIZE = 4096
+
+_NAMED_GROUP = re.compile(r"\(\?P<[^>]+>")
+
+
+class RoutePolicy(NamedTuple):
+    resolvable: bool
+    org_required: bool
+    authenticate: bool
+
+
+UNRESOLVABLE = RoutePolicy(resolvable=False, org_required=False, authenticate=True)
+
+
+def org_context_exempt(view):
+    """Mark a view (class or function) as not requiring org context."""
+    view.org_context_required = False
+    return view
+
+
+def _view_classes(callback):
+    """Yield the callback and the view class behind it (Django or DRF)."""
+    yield callback
+    for attr in ("view_class", "cls"):
+        view_class = getattr(callback, attr, None)
+        if view_class is not None:
+            yield view_class
+
+
+def _authenticates(callback):
+    for obj in _view_classes(callback):
+        if isinstance(obj, type) and getattr(obj, "authentication_classes", None) == []:
+            return False
+    return True
+
+
+def _org_required(callback, namespaces, authenticate):
+    if any(ns in ORG_CONTEXT_EXEMPT_NAMESPACES for ns in namespaces):
+        return False
+    for obj in _view_classes(callback):
+        if hasattr(obj, "org_context_required"):
+            return obj.org_context_required
+    return authenticate
+
+
+def _compile(regexes):
+    """Combine route regexes into one alternation (or a list as fallback)."""
+    if not regexes:
+        return []
+    try:
+        return [re.compile("|".join(f"(?:{r})" for r in regexes))]
+    except re.error:
+        return [re.compile(r) for r in regexes]
+
+
+class RoutePolicyRegistry:
+    """
+    Route policies compiled from a URLconf.
+
+    Routes are grouped into runs by policy and each run becomes one combined
+    regex, so looking up a path costs a handful of regex matches. Results
+    are memoized per path in a bounded LRU map.
+    """
+
+    def __init__(self, urlconf=None):
+        # Consecutive routes sharing a policy form one run. Runs are checked
+        # in URLconf order, which preserves Django's first-match semantics.
+        runs = []
+        for regex, callback, namespaces in self._walk(
+            get_resolver(urlconf).url_patterns, "^/", ()
+        ):
+            authenticate = _authenticates(callback)
+            policy = RoutePolicy(
+                resolvable=True,
+                org_required=_org_required(callback, namespaces, authenticate),
+                authenticate=authenticate,
+            )
+            if runs and runs[-1][0] == policy:
+                runs[-1][1].append(regex)
+            else:
+                runs.append((policy, [regex]))
+
+        self._matchers = [(policy, _compile(regexes)) for policy, regexes in runs]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _walk(cls, patterns, prefix, namespaces):
+        for pattern in patterns:
+            regex = _NAMED_GROUP.sub("(?:", pattern.pattern.regex.pattern)
+            regex = prefix + regex.lstrip("^")
+            if isinstance(pattern, URLResolver):
+                child_namespaces = namespaces
+                if pattern.namespace:
+                    child_namespaces = namespaces + (pattern.namespace,)
+                yield from cls._walk(pattern.url_patterns, regex, child_namespaces)
+            else:
+                yield regex, pattern.callback, namespaces
+
+    def policy_for(self, path):
+        with self._lock:
+            policy = self._cache.get(path)
+            if policy is not None:
+                self._cache.move_to_end(path)
+                return policy
+
+        policy = self._match(path)
+
+        with self._lock:
+            self._cache[path] = policy
+            if len(self._cache) > POLICY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return policy
+
+    def _match(self, path):
+        for policy, regexes in self._matchers:
+            if any(regex.match(path) for regex in regexes):
+                return policy
+        return UNRESOLVABLE
+
+
+@lru_cache(maxsize=None)
+def _get_cached_registry(urlconf):
+    return RoutePolicyRegistry(urlconf)
+
+
+def get_route_registry():
+    """Return the compiled registry for the active URLconf."""
+    from django.conf import settings
+
+    return _get_cached_registry(get_urlconf() or settings.ROOT_URLCONF)
@@ -0,0 +1,29 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def populate_api_key_digest(apps, schema_editor):
+    Org = apps.get_model("common", "Org")
+    for org in Org.objects.exclude(api_key="").only("id", "api_key").iterator():
+        Org.objects.filter(pk=org.pk).update(
+            api_key_digest=hashlib.sha256(org.api_key.encode()).hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0008_enable_rls_product_invoice_line_item"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="org",
+            name="api_key_digest",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True, unique=True
+            ),
+        ),
+        migrations.RunPython(populate_api_key_digest, migrations.RunPython.noop),
+    ]
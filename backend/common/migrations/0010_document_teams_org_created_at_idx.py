@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0009_org_api_key_digest'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['org', '-created_at'], name='document_org_id_136692_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teams',
+            index=models.Index(fields=['org', '-created_at'], name='teams_org_id_aca64d_idx'),
+        ),
+    ]
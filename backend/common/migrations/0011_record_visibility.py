@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('common', '0010_document_teams_org_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordVisibility',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_id', models.UUIDField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='record_visibility', to='common.org')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visible_records', to='common.profile')),
+            ],
+            options={
+                'verbose_name': 'Record Visibility',
+                'verbose_name_plural': 'Record Visibility',
+                'db_table': 'record_visibility',
+                'indexes': [models.Index(fields=['content_type', 'object_id'], name='record_visi_content_c136b5_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recordvisibility',
+            constraint=models.UniqueConstraint(fields=('profile', 'content_type', 'object_id'), name='record_visibility_unique'),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Enable RLS on record_visibility, populate it from assigned_to and created_by
+
+from django.db import migrations
+
+from common.rls import (
+    get_disable_policy_sql,
+    get_enable_policy_sql,
+    get_set_local_context_sql,
+)
+
+VISIBILITY_MODELS = (
+    "leads.Lead",
+    "contacts.Contact",
+    "accounts.Account",
+    "opportunity.Opportunity",
+    "cases.Case",
+    "tasks.Task",
+)
+
+
+def populate_record_visibility(apps, schema_editor):
+    """
+    One row per (profile, record) for the records' creators and assignees.
+
+    Runs per org with app.current_org set, so that it also reads the
+    RLS-protected tables when migrating as their (non-superuser) owner.
+    """
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Org = apps.get_model("common", "Org")
+    Profile = apps.get_model("common", "Profile")
+    profile_table = Profile._meta.db_table
+
+    statements = []
+    for label in VISIBILITY_MODELS:
+        model = apps.get_model(label)
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label=model._meta.app_label, model=model._meta.model_name
+        )
+        field = model._meta.get_field("assigned_to")
+        through = field.remote_field.through
+        record_column = through._meta.get_field(field.m2m_field_name()).column
+        profile_column = through._meta.get_field(field.m2m_reverse_field_name()).column
+        table = model._meta.db_table
+        statements.append(
+            (
+                f"""
+                INSERT INTO record_visibility
+                    (org_id, profile_id, content_type_id, object_id)
+                SELECT r.org_id, p.id, %s, r.id
+                FROM "{table}" r
+                JOIN "{profile_table}" p
+                    ON p.user_id = r.created_by_id AND p.org_id = r.org_id
+                WHERE r.org_id = %s
+                UNION
+                SELECT r.org_id, a."{profile_column}", %s, r.id
+                FROM "{through._meta.db_table}" a
+                JOIN "{table}" r ON r.id = a."{record_column}"
+                WHERE r.org_id = %s
+                ON CONFLICT DO NOTHING
+                """,
+                content_type.id,
+            )
+        )
+
+    with schema_editor.connection.cursor() as cursor:
+        for org_id in Org.objects.values_list("id", flat=True):
+            cursor.execute(get_set_local_context_sql(), [str(org_id)])
+            for sql, content_type_id in statements:
+                cursor.execute(sql, [content_type_id, org_id, content_type_id, org_id])
+
+
+def enable_rls_on_record_visibility(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(get_enable_policy_sql("record_visibility"))
+
+
+def disable_rls_on_record_visibility(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(get_disable_policy_sql("record_visibility"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0011_record_visibility"),
+        ("leads", "0012_lead_trigram_indexes"),
+        ("contacts", "0011_contact_trigram_indexes"),
+        ("accounts", "0007_account_trigram_indexes"),
+        ("opportunity", "0006_opportunity_trigram_indexes"),
+        ("cases", "0009_case_trigram_indexes"),
+        ("tasks", "0008_task_trigram_indexes"),
+    ]
+
+    # RLS first: Postgres refuses to ALTER a table with pending (deferred
+    # FK) trigger events, i.e. after inserting rows in the same transaction
+    operations = [
+        migrations.RunPython(
+            enable_rls_on_record_visibility,
+            reverse_code=disable_rls_on_record_visibility,
+        ),
+        migrations.RunPython(
+            populate_record_visibility,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from common.rls import get_disable_policy_sql, get_enable_policy_sql
+
+
+def enable_rls_on_pipeline_snapshot(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(get_enable_policy_sql("pipeline_snapshot"))
+
+
+def disable_rls_on_pipeline_snapshot(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(get_disable_policy_sql("pipeline_snapshot"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0012_populate_record_visibility_and_rls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineSnapshot',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('kind', models.CharField(choices=[('opportunity', 'Opportunity'), ('lead', 'Lead')], max_length=16)),
+                ('stage', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('weighted_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('currency', models.CharField(max_length=3)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_snapshots', to='common.org')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_snapshots', to='common.profile')),
+            ],
+            options={
+                'verbose_name': 'Pipeline Snapshot',
+                'verbose_name_plural': 'Pipeline Snapshots',
+                'db_table': 'pipeline_snapshot',
+                'indexes': [models.Index(fields=['org', 'kind', 'date'], name='pipeline_sn_org_id_c12339_idx')],
+            },
+        ),
+        migrations.RunPython(
+            enable_rls_on_pipeline_snapshot,
+            reverse_code=disable_rls_on_pipeline_snapshot,
+        ),
+    ]
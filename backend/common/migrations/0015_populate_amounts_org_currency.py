@@ -0,0 +1,57 @@
+# Populate the amounts in org currency where no conversion is needed
+
+from django.db import migrations
+from django.db.models import Case, DecimalField, F, Q, Value, When
+
+from common.rls import get_set_local_context_sql
+
+# (model, amount field, field of the amount in org currency)
+AMOUNTS = (
+    ("opportunity.Opportunity", "amount", "amount_org_currency"),
+    ("leads.Lead", "opportunity_amount", "opportunity_amount_org_currency"),
+    ("invoices.Invoice", "total_amount", "total_amount_org_currency"),
+)
+
+
+def populate_amounts_org_currency(apps, schema_editor):
+    """
+    Amounts already in the org's currency (or without one). There are no
+    exchange rates yet; `manage.py load_fx_rates` converts the others.
+    """
+    Org = apps.get_model("common", "Org")
+    with schema_editor.connection.cursor() as cursor:
+        for org in Org.objects.all():
+            cursor.execute(get_set_local_context_sql(), [str(org.id)])
+            org_currency = org.default_currency or "USD"
+            for label, amount_field, normalized_field in AMOUNTS:
+                apps.get_model(label).objects.filter(org_id=org.id).update(
+                    **{
+                        normalized_field: Case(
+                            When(
+                                Q(currency__isnull=True)
+                                | Q(currency="")
+                                | Q(currency=org_currency),
+                                then=F(amount_field),
+                            ),
+                            default=Value(None),
+                            output_field=DecimalField(max_digits=14, decimal_places=2),
+                        )
+                    }
+                )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0014_exchange_rate"),
+        ("invoices", "0004_invoice_amount_org_currency"),
+        ("leads", "0013_lead_amount_org_currency"),
+        ("opportunity", "0007_opportunity_amount_org_currency"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            populate_amounts_org_currency,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
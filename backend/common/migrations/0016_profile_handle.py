@@ -0,0 +1,32 @@
+# Add Profile.handle for @mentions, set to the email's local part
+
+from django.db import migrations, models
+
+
+def populate_handles(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE profile "
+            "SET handle = left(lower(split_part(users.email, '@', 1)), 64) "
+            "FROM users WHERE users.id = profile.user_id AND profile.handle = ''"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0015_populate_amounts_org_currency"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="handle",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(fields=["org", "handle"], name="profile_org_handle_idx"),
+        ),
+        migrations.RunPython(populate_handles, reverse_code=migrations.RunPython.noop),
+    ]
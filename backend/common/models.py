@@ -1,5 +1,6 @@
 import binascii
 import datetime
+import hashlib
 import os
 import time
 import uuid
@@ -87,9 +88,18 @@ def generate_unique_key():
     return str(uuid.uuid4())
 
 
+def hash_api_key(api_key):
+    """Return the SHA-256 hex digest used to look up an org API key."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
 class Org(BaseModel):
     name = models.CharField(max_length=100, blank=True, null=True)
     api_key = models.TextField(default=generate_unique_key, unique=True, editable=False)
+    # Indexed digest of api_key; API key authentication looks orgs up by this
+    api_key_digest = models.CharField(
+        max_length=64, unique=True, null=True, blank=True, editable=False
+    )
     is_active = models.BooleanField(default=True)
 
     # Locale settings
@@ -109,6 +119,13 @@ class Org(BaseModel):
     def __str__(self):
         return str(self.name)
 
+    def save(self, *args, **kwargs):
+        self.api_key_digest = hash_api_key(self.api_key) if self.api_key else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "api_key" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "api_key_digest"}
+        super().save(*args, **kwargs)
+
 
 class Tags(BaseModel):
     """Tags for categorizing CRM entities (Accounts, Leads, Opportunities)"""
@@ -154,6 +171,8 @@ class Profile(BaseModel):
     is_active = models.BooleanField(default=True)
     is_organization_admin = models.BooleanField(default=False)
     date_of_joining = models.DateField(null=True, blank=True)
+    # @mention handle (common.mentions), the email's local part by default
+    handle = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         verbose_name = "Profile"
@@ -161,6 +180,9 @@ class Profile(BaseModel):
         db_table = "profile"
         ordering = ("-created_at",)
         unique_together = [["user", "org"], ["phone", "org"]]
+        indexes = [
+            models.Index(fields=["org", "handle"], name="profile_org_handle_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} <{self.org.name}>"
@@ -380,6 +402,9 @@ class Document(BaseModel):
         verbose_name_plural = "Documents"
         db_table = "document"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["org", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -553,6 +578,108 @@ class Activity(BaseModel):
         return timesince(self.created_at) + " ago"
 
 
+class RecordVisibility(models.Model):
+    """
+    Which non-admin profiles can see a record: its creator and assignees.
+
+    Derived data, maintained by common.visibility from the assigned_to,
+    created_by and delete change points, so it has no audit fields.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    org = models.ForeignKey(
+        Org, on_delete=models.CASCADE, related_name="record_visibility"
+    )
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name="visible_records"
+    )
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+
+    class Meta:
+        verbose_name = "Record Visibility"
+        verbose_name_plural = "Record Visibility"
+        db_table = "record_visibility"
+        constraints = [
+            # Also the index of the list views' semi-join
+            models.UniqueConstraint(
+                fields=["profile", "content_type", "object_id"],
+                name="record_visibility_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["content_type", "object_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} {self.content_type_id} {self.object_id}"
+
+
+class PipelineSnapshot(models.Model):
+    """
+    Daily rollup of an org's opportunities (per stage) and leads (per status).
+
+    Written by common.snapshots; one row per (date, kind, stage) for the
+    whole org (owner null) and one per assigned profile. Amounts are in the
+    org's default currency (common.fx).
+    """
+
+    KIND_CHOICES = (("opportunity", "Opportunity"), ("lead", "Lead"))
+
+    id = models.BigAutoField(primary_key=True)
+    org = models.ForeignKey(
+        Org, on_delete=models.CASCADE, related_name="pipeline_snapshots"
+    )
+    date = models.DateField()
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    stage = models.CharField(max_length=64)
+    owner = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="pipeline_snapshots",
+        blank=True,
+        null=True,
+    )
+    count = models.PositiveIntegerField(default=0)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    weighted_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    currency = models.CharField(max_length=3)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Pipeline Snapshot"
+        verbose_name_plural = "Pipeline Snapshots"
+        db_table = "pipeline_snapshot"
+        indexes = [
+            models.Index(fields=["org", "kind", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.org_id} {self.date} {self.kind} {self.stage}"
+
+
+class ExchangeRate(models.Model):
+    """
+    Units of currency per unit of a common base currency.
+
+    Global reference data, replaced as a whole by common.fx.set_rates().
+    Only ratios between rates are used, so the base itself is not stored.
+    """
+
+    currency = models.CharField(max_length=3, choices=CURRENCY_CODES, unique=True)
+    rate = models.DecimalField(max_digits=20, decimal_places=10)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Exchange Rate"
+        verbose_name_plural = "Exchange Rates"
+        db_table = "exchange_rate"
+        ordering = ("currency",)
+
+    def __str__(self):
+        return f"{self.currency} {self.rate}"
+
+
 class Teams(BaseModel):
     name = models.CharField(max_length=100)
     description = models.TextField()
@@ -564,6 +691,9 @@ class Teams(BaseModel):
         verbose_name_plural = "Teams"
         db_table = "teams"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["org", "-created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.name}"
@@ -0,0 +1,185 @@
+"""
+Email notifications: one pipeline for the "assigned to you" mails.
+
+The assignment tasks of each app (leads, accounts, contacts, cases,
+opportunity, tasks, invoices) only load their record and call
+notify_profiles(), which
+- resolves all recipients with one Profile query (active profiles with an
+  email),
+- renders the template once loaded per batch (Django's cached template
+  loader keeps it compiled across batches),
+- sends every message over one backend connection,
+- stays within NOTIFICATION_RATE_LIMIT emails per org per minute in this
+  worker process; the rest is deferred to a new call of the task when the
+  window resets,
+- retries the task for the recipients not sent when the backend fails,
+  with an exponential backoff from NOTIFICATION_RETRY_BACKOFF seconds (at
+  most an hour), at most NOTIFICATION_MAX_RETRIES times.
+
+A deferred call or retry re-runs the task with its `recipients` argument
+narrowed to the profiles not sent yet, so nobody is mailed twice. Tasks
+mailing more than the profiles pass the arguments marking that part done
+as `follow_up`.
+
+Usage:
+    @app.task(bind=True)
+    def send_email_to_assigned_user(self, recipients, lead_id, org_id):
+        set_rls_context(org_id)
+        lead = Lead.objects.get(id=lead_id)
+        notify_profiles(
+            self, recipients, org_id, "Assigned a lead for you.",
+            "assigned_to/leads_assigned.html", {"lead": lead},
+        )
+"""
+
+import inspect
+import logging
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WINDOW = 60
+MAX_RETRY_DELAY = 3600
+# Errors of the email backend worth a retry
+SEND_ERRORS = (smtplib.SMTPException, OSError)
+
+
+class OrgRateLimiter:
+    """Fixed-window count of the emails sent per org by this process."""
+
+    def __init__(self, window=RATE_LIMIT_WINDOW):
+        self.window = window
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def take(self, org_id, wanted):
+        """
+        Reserve up to wanted sends for org_id in the current window.
+
+        Returns (granted, seconds until the window resets).
+        """
+        limit = getattr(settings, "NOTIFICATION_RATE_LIMIT", 100)
+        now = time.monotonic()
+        with self._lock:
+            started, used = self._windows.get(str(org_id), (now, 0))
+            if now - started >= self.window:
+                started, used = now, 0
+            granted = wanted if limit <= 0 else max(0, min(wanted, limit - used))
+            self._windows[str(org_id)] = (started, used + granted)
+            return granted, max(1, int(started + self.window - now))
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+rate_limiter = OrgRateLimiter()
+
+
+def active_recipients(profile_ids):
+    """{profile id: User} of the active profiles among profile_ids with an email."""
+    from common.models import Profile
+
+    profiles = (
+        Profile.objects.filter(id__in=[str(i) for i in profile_ids], is_active=True)
+        .exclude(user__email="")
+        .select_related("user")
+    )
+    return {str(profile.id): profile.user for profile in profiles}
+
+
+def render_messages(subject, template_name, context, recipients):
+    """
+    {key: html EmailMessage} for recipients ({key: user or address}).
+
+    The template is rendered with context and "user" set to the recipient.
+    """
+    template = get_template(template_name)
+    messages = {}
+    for key, user in recipients.items():
+        body = template.render({**context, "user": user})
+        msg = EmailMessage(subject, body, to=[getattr(user, "email", user)])
+        msg.content_subtype = "html"
+        messages[key] = msg
+    return messages
+
+
+def send_messages(messages, org_id, rate_limited=True, on_sent=None):
+    """
+    Send {key: message} over one connection within org_id's rate limit.
+
+    on_sent(key) is called after each message is sent. Returns (keys not
+    sent, delay): delay is the seconds until the rate limit allows more, or
+    None when a backend error stopped the sending.
+    """
+    keys = list(messages)
+    delay = None
+    if rate_limited:
+        granted, reset_in = rate_limiter.take(org_id, len(keys))
+        if granted < len(keys):
+            delay = reset_in
+        keys = keys[:granted]
+
+    sent = set()
+    if not keys:
+        return list(messages), delay
+    try:
+        with get_connection() as connection:
+            # One message per call on the open connection, so that a failure
+            # tells exactly which recipients are left
+            for key in keys:
+                connection.send_messages([messages[key]])
+                sent.add(key)
+                if on_sent:
+                    on_sent(key)
+    except SEND_ERRORS:
+        logger.exception("Sending notifications of org %s failed", org_id)
+        delay = None
+    return [key for key in messages if key not in sent], delay
+
+
+def _with_recipients(task, recipients, **arguments):
+    """(args, kwargs) of the current task call with recipients and arguments set."""
+    bound = inspect.signature(task.run).bind(*task.request.args, **task.request.kwargs)
+    bound.arguments.update(arguments, recipients=recipients)
+    return bound.args, bound.kwargs
+
+
+def notify_profiles(
+    task, recipients, org_id, subject, template_name, context, follow_up=None
+):
+    """
+    Mail the active profiles among recipients (profile ids) from task.
+
+    Returns the number of messages sent. Unsent recipients are handed to a
+    new call (rate limit) or a retry (backend error) of task, with the task
+    arguments in follow_up ({name: value}) replaced too.
+    """
+    users = active_recipients(recipients)
+    if not users:
+        return 0
+    messages = render_messages(subject, template_name, context, users)
+    # Eager runs have no broker to defer to
+    unsent, delay = send_messages(
+        messages, org_id, rate_limited=not task.request.is_eager
+    )
+    if unsent:
+        args, kwargs = _with_recipients(task, unsent, **(follow_up or {}))
+        if delay is not None:
+            # Deferred, not failed: a fresh call keeps the retry budget
+            task.apply_async(args, kwargs, countdown=delay)
+        else:
+            backoff = getattr(settings, "NOTIFICATION_RETRY_BACKOFF", 30)
+            raise task.retry(
+                args=args,
+                kwargs=kwargs,
+                countdown=min(backoff * 2**task.request.retries, MAX_RETRY_DELAY),
+                max_retries=getattr(settings, "NOTIFICATION_MAX_RETRIES", 5),
+            )
+    return len(messages) - len(unsent)
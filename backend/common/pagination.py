@@ -0,0 +1,205 @@
+"""
+Pagination for the CRM list views.
+
+By default the list views keep the legacy LimitOffsetPagination response
+(`offset`, `*_count`, `per_page`, `page_number`), ordered newest first on
+(created_at, id). They can also be paged by keyset on the same key, which
+needs neither OFFSET nor COUNT and stays fast on deep pages:
+
+    GET /api/leads/?pagination=cursor&page_size=50
+    GET /api/leads/?cursor=<next_cursor from the previous response>
+
+Every paginated list carries `next_cursor` / `previous_cursor`, so clients
+can switch from an offset page to cursors at any point. Cursors are opaque
+and bound to the list they were issued for: in views returning several
+lists (open/closed leads, active/inactive accounts), the other lists start
+from their first page. In cursor mode counts are not computed (null) and
+`page_size` is capped at MAX_PAGE_SIZE.
+
+With ?search= the lists are ordered by rank (common.search) in offset
+mode and carry no cursors; keyset pages stay on (created_at, id).
+
+Counts already known from a facet query (common.facets) can be passed as
+`count`, so the paginator doesn't issue its own COUNT.
+
+Usage:
+    class LeadListView(APIView, CRMListPagination):
+        def get_context_data(self, **kwargs):
+            results, page = self.paginate_list(queryset, self.request, "open_leads")
+            page["count"], page["offset"], page["next_cursor"], ...
+"""
+
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+
+from common.search import SEARCH_RANK
+
+MAX_PAGE_SIZE = 100
+
+
+class CRMListPagination(LimitOffsetPagination):
+    """LimitOffsetPagination with opt-in keyset pagination on (created_at, id)."""
+
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+    known_count = None
+
+    def paginate_list(self, queryset, request, list_key, count=None):
+        """
+        Paginate one list of a list view.
+
+        Args:
+            queryset: Filtered queryset (its ordering is replaced)
+            request: DRF request
+            list_key: Name of the list in the response, cursors are bound to it
+            count: Number of rows in queryset, if already known
+
+        Returns:
+            (results, page) where page has count, offset, next_cursor and
+            previous_cursor
+        """
+        if self.use_cursor(request):
+            return self.paginate_keyset(queryset, request, list_key)
+
+        # Search results (common.search) are ranked; keyset cursors are
+        # on (created_at, id), so ranked pages don't hand any out.
+        ranked = SEARCH_RANK in queryset.query.annotations
+        ordering = (f"-{SEARCH_RANK}", *self.ordering) if ranked else self.ordering
+        self.known_count = count
+        try:
+            results = self.paginate_queryset(
+                queryset.order_by(*ordering), request, view=self
+            )
+        finally:
+            self.known_count = None
+        # Position after this page; None on the last page (legacy contract)
+        if results:
+            offset = self.offset + len(results)
+            if offset >= self.count:
+                offset = None
+        else:
+            offset = 0
+
+        return results, {
+            "count": self.count,
+            "offset": offset,
+            "next_cursor": (
+                self.encode_cursor(list_key, results[-1], reverse=False)
+                if results and offset is not None and not ranked
+                else None
+            ),
+            "previous_cursor": (
+                self.encode_cursor(list_key, results[0], reverse=True)
+                if results and self.offset and not ranked
+                else None
+            ),
+        }
+
+    def paginate_keyset(self, queryset, request, list_key):
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        if cursor is not None and cursor[0] != list_key:
+            cursor = None
+
+        reverse = False
+        if cursor is not None:
+            _, created_at, pk, reverse = cursor
+            # Written so that the created_at range can use the
+            # (org, created_at) indexes; id only breaks ties.
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at)
+                    & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at)
+                    & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+                )
+
+        ordering = ("created_at", "id") if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        has_next = cursor is not None if reverse else has_more
+        has_previous = has_more if reverse else cursor is not None
+
+        # Keep the LimitOffsetPagination attributes the views read
+        self.count = None
+        self.offset = 0
+        self.limit = page_size
+
+        return results, {
+            "count": None,
+            "offset": None,
+            "next_cursor": (
+                self.encode_cursor(list_key, results[-1], reverse=False)
+                if results and has_next
+                else None
+            ),
+            "previous_cursor": (
+                self.encode_cursor(list_key, results[0], reverse=True)
+                if results and has_previous
+                else None
+            ),
+        }
+
+    def get_count(self, queryset):
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+    def use_cursor(self, request):
+        params = request.query_params
+        return (
+            self.cursor_query_param in params
+            or params.get(self.mode_query_param) == "cursor"
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = 0
+        if page_size <= 0:
+            page_size = self.default_limit or self.max_page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, list_key, obj, reverse):
+        payload = json.dumps(
+            {
+                "l": list_key,
+                "t": obj.created_at.isoformat(),
+                "i": str(obj.pk),
+                "r": reverse,
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        """Returns (list_key, created_at, id, reverse) or None."""
+        value = request.query_params.get(self.cursor_query_param)
+        if not value:
+            return None
+        try:
+            payload = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            data = json.loads(payload)
+            created_at = parse_datetime(data["t"])
+            if created_at is None:
+                raise ValueError(data["t"])
+            return data["l"], created_at, uuid.UUID(data["i"]), bool(data["r"])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise NotFound("Invalid cursor")
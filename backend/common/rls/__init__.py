@@ -50,6 +50,8 @@ ORG_SCOPED_TABLES = [
     "tags",
     "address",
     "solution",
+    "record_visibility",
+    "pipeline_snapshot",
     # Boards (Kanban)
     "board",
     "board_column",
@@ -127,6 +129,22 @@ def get_set_context_sql():
     return f"SELECT set_config('{CONTEXT_VARIABLE}', %s, false)"
 
 
+def get_set_local_context_sql():
+    """
+    Returns SQL to set the org context for the current TRANSACTION only.
+
+    Uses set_config with is_local=true (equivalent to SET LOCAL). The value
+    is discarded at COMMIT/ROLLBACK, so no reset is needed and the setting
+    cannot leak to the next client of a transaction-mode connection pooler.
+    Only meaningful inside an explicit transaction.
+
+    Usage:
+        with transaction.atomic():
+            cursor.execute(get_set_local_context_sql(), [org_id])
+    """
+    return f"SELECT set_config('{CONTEXT_VARIABLE}', %s, true)"
+
+
 def get_enable_policy_sql(table):
     """
     Returns SQL to enable RLS on a table with proper policies.
@@ -0,0 +1,100 @@
+"""
+Full-text search for the `search` parameter of the list views.
+
+Searchable models list their columns by weight in SEARCH_FIELDS and
+declare search_index() of them in Meta.indexes: a GIN index on the very
+tsvector expression apply_search() filters on. Postgres keeps the index
+current on every insert/update, and the search is an index scan instead
+of a sequential scan of ILIKE OR-chains.
+
+Text is split into words on anything that isn't a letter or digit, on both
+sides, so "acme" finds "sales@acme.com" and "555 1234" finds
+"+1 555-1234". Each term of the search must match the start of a word.
+
+Matches are annotated with SEARCH_RANK; CRMListPagination orders by it
+(then newest first) in offset mode. Keyset pages keep (created_at, id).
+
+Usage:
+    LEAD_SEARCH_FIELDS = {"A": ("first_name", "last_name"), "B": ("email",)}
+
+    class Lead(BaseModel):
+        SEARCH_FIELDS = LEAD_SEARCH_FIELDS
+
+        class Meta:
+            indexes = [search_index(LEAD_SEARCH_FIELDS, "lead_search_idx")]
+
+    queryset = apply_search(queryset, params.get("search"))
+"""
+
+import functools
+import operator
+import re
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Func, TextField, Value
+
+# No stemming or stop words: names, emails and phone numbers
+SEARCH_CONFIG = "simple"
+SEARCH_DOCUMENT = "search_document"
+SEARCH_RANK = "search_rank"
+MAX_TERMS = 8
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _words(field):
+    """field with every run of non-alphanumerics replaced by a space."""
+    return Func(
+        F(field),
+        Value(r"[\W_]+"),
+        Value(" "),
+        Value("g"),
+        function="REGEXP_REPLACE",
+        output_field=TextField(),
+    )
+
+
+def search_vector(search_fields):
+    """tsvector expression of {weight: (field, ...)}."""
+    vectors = [
+        SearchVector(
+            *[_words(field) for field in fields], config=SEARCH_CONFIG, weight=weight
+        )
+        for weight, fields in sorted(search_fields.items())
+    ]
+    return functools.reduce(operator.add, vectors)
+
+
+def search_index(search_fields, name):
+    """GIN index matching search_vector(search_fields)."""
+    return GinIndex(search_vector(search_fields), name=name)
+
+
+def search_query(text):
+    """Prefix tsquery AND-ing the words of text, or None if it has none."""
+    terms = WORD_RE.findall(text.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+def apply_search(queryset, text):
+    """
+    Filter queryset to rows matching text, annotated with SEARCH_RANK.
+
+    The model must define SEARCH_FIELDS and index them with search_index().
+    """
+    query = search_query(text)
+    if query is None:
+        return queryset.none()
+    vector = search_vector(queryset.model.SEARCH_FIELDS)
+    return (
+        queryset.alias(**{SEARCH_DOCUMENT: vector})
+        .filter(**{SEARCH_DOCUMENT: query})
+        .annotate(**{SEARCH_RANK: SearchRank(vector, query)})
+    )
@@ -3,11 +3,14 @@ import re
 from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import check_password
 from django.contrib.auth.tokens import default_token_generator
+from django.db.models import Prefetch
 from django.utils.http import urlsafe_base64_decode
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from common.mentions import HANDLE_RE
+from common.sparse_fields import GenericRelated, Relation
 from common.utils import CURRENCY_SYMBOLS
 from common.models import (
     Activity,
@@ -265,6 +268,7 @@ class CreateProfileSerializer(serializers.ModelSerializer):
             "has_sales_access",
             "has_marketing_access",
             "is_organization_admin",
+            "handle",
         )
 
     def __init__(self, *args, **kwargs):
@@ -273,6 +277,13 @@ class CreateProfileSerializer(serializers.ModelSerializer):
         self.fields["role"].required = True
         self.fields["phone"].required = True
 
+    def validate_handle(self, handle):
+        if handle and not HANDLE_RE.match(handle):
+            raise serializers.ValidationError(
+                "Use letters, digits and . _ + - only"
+            )
+        return handle.lower()
+
 
 class UserSerializer(serializers.ModelSerializer):
 
@@ -301,10 +312,29 @@ class ProfileSerializer(serializers.ModelSerializer):
             "phone",
             "date_of_joining",
             "is_active",
+            "handle",
             "created_at",
         )
 
 
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    """Compact profile for list rows: id and the user's email and avatar"""
+
+    user_details = serializers.SerializerMethodField()
+
+    @extend_schema_field(dict)
+    def get_user_details(self, obj):
+        return {
+            "id": obj.user.id,
+            "email": obj.user.email,
+            "profile_pic": obj.user.profile_pic,
+        }
+
+    class Meta:
+        model = Profile
+        fields = ("id", "user_details")
+
+
 class AttachmentsSerializer(serializers.ModelSerializer):
     """Serializer for Attachments model using ContentType"""
 
@@ -622,6 +652,7 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
             "phone",
             "date_of_joining",
             "is_active",
+            "handle",
         ]
 
 
@@ -682,6 +713,14 @@ class TeamsSerializer(serializers.ModelSerializer):
         )
 
 
+class TeamSummarySerializer(serializers.ModelSerializer):
+    """Compact team for list rows"""
+
+    class Meta:
+        model = Teams
+        fields = ("id", "name")
+
+
 class TeamCreateSerializer(serializers.ModelSerializer):
 
     def __init__(self, *args, **kwargs):
@@ -725,3 +764,29 @@ class TeamswaggerCreateSerializer(serializers.ModelSerializer):
             "description",
             "users",
         )
+
+
+# Relations shared by the list serializers (common.sparse_fields)
+PROFILE_RELATION = Relation(
+    Profile.objects.select_related("user").only(
+        "id", "user__id", "user__email", "user__profile_pic"
+    ),
+    expanded=ProfileSerializer,
+    expanded_queryset=Profile.objects.select_related("user"),
+)
+TEAM_RELATION = Relation(
+    Teams.objects.only("id", "name"),
+    expanded=TeamsSerializer,
+    expanded_queryset=Teams.objects.select_related("created_by").prefetch_related(
+        Prefetch("users", queryset=Profile.objects.select_related("user"))
+    ),
+)
+TAG_RELATION = Relation(Tags.objects.only("id", "name", "slug"))
+USER_RELATION = Relation(User.objects.only("id", "email", "profile_pic"))
+# Rendered as its id unless expanded
+ORG_RELATION = Relation(None, expanded=OrganizationSerializer)
+# Rendered only on ?expand=
+COMMENT_RELATION = GenericRelated(Comment.objects.select_related("content_type"))
+ATTACHMENT_RELATION = GenericRelated(
+    Attachments.objects.select_related("content_type")
+)
@@ -3,32 +3,53 @@ Django signals for automatic activity tracking across CRM entities.
 
 This module registers post_save and post_delete signals on all major CRM models
 to automatically create Activity records when entities are created, updated, or deleted.
+Activities are collected per request and written in one batch (see common.activity).
+
+It also keeps the per-process membership and API key caches (common.cache)
+in sync with Profile, Org and User changes, drops cached dashboard
+summaries (common.dashboard) when an org's records change, and keeps the
+RecordVisibility rows (common.visibility) in sync with record creation,
+assignment and deletion.
+
+The amounts normalized to the org's currency (common.fx) are set on save
+and recomputed when an org changes its default currency.
 """
 
-from crum import get_current_request
-from django.db.models.signals import post_delete, post_save
+from crum import get_current_request, get_current_user
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from common.models import Activity
+from common.activity import record_activity
+from common.cache import api_key_cache, dashboard_cache, membership_cache
+from common.fx import NORMALIZED_AMOUNTS, normalize_instance, normalize_org_amounts
+from common.mentions import default_handle
+from common.models import Activity, Org, RecordVisibility
+from common.visibility import VISIBILITY_MODELS, clear_visibility, sync_visibility
 
 
 def get_entity_name(instance):
     """Get a display name for an entity instance"""
+    # Only use field values that are already loaded: deferred fields and
+    # __str__ (e.g. Profile.__str__) can trigger queries.
+    values = instance.__dict__
     # Try common name attributes
-    if hasattr(instance, "name") and instance.name:
-        return str(instance.name)
-    if hasattr(instance, "title") and instance.title:
-        return str(instance.title)
-    if hasattr(instance, "first_name"):
-        name = f"{instance.first_name or ''} {instance.last_name or ''}".strip()
+    if values.get("name"):
+        return str(values["name"])
+    if values.get("title"):
+        return str(values["title"])
+    if "first_name" in values:
+        name = f"{values['first_name'] or ''} {values.get('last_name') or ''}".strip()
         if name:
             return name
-    if hasattr(instance, "email") and instance.email:
-        return str(instance.email)
-    if hasattr(instance, "subject") and instance.subject:
-        return str(instance.subject)
-    # Fallback to string representation
-    return str(instance)[:100]
+    if values.get("email"):
+        return str(values["email"])
+    if values.get("subject"):
+        return str(values["subject"])
+    # Fallback to model name and primary key
+    return f"{instance._meta.verbose_name} {instance.pk}"[:100]
 
 
 def create_activity(instance, action, entity_type):
@@ -44,21 +65,27 @@ def create_activity(instance, action, entity_type):
     if not profile:
         return
 
-    # Get org from instance or profile
-    org = getattr(instance, "org", None)
-    if not org:
-        org = getattr(profile, "org", None)
-    if not org:
+    # Get org from instance or profile (ids only, no related object loads)
+    org_id = getattr(instance, "org_id", None) or profile.org_id
+    if not org_id:
         return
 
-    # Create activity record
-    Activity.objects.create(
-        user=profile,
-        action=action,
-        entity_type=entity_type,
-        entity_id=instance.id,
-        entity_name=get_entity_name(instance),
-        org=org,
+    # bulk_create skips BaseModel.save(), so set the audit fields here
+    user = get_current_user()
+    user_id = user.id if user is not None and not user.is_anonymous else None
+
+    # Queue activity record (written in bulk when the request's batch closes)
+    record_activity(
+        Activity(
+            user_id=profile.id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=instance.id,
+            entity_name=get_entity_name(instance),
+            org_id=org_id,
+            created_by_id=user_id,
+            updated_by_id=user_id,
+        )
     )
 
 
@@ -144,3 +171,160 @@ def invoice_post_save(sender, instance, created, **kwargs):
 @receiver(post_delete, sender="invoices.Invoice")
 def invoice_post_delete(sender, instance, **kwargs):
     create_activity(instance, "DELETE", "Invoice")
+
+
+# Membership cache invalidation
+def _invalidate_membership(user_id, org_id):
+    membership_cache.invalidate_profile(user_id, org_id)
+    # Drop it again once the transaction commits, in case a concurrent
+    # request re-cached the pre-commit row in the meantime.
+    transaction.on_commit(
+        lambda: membership_cache.invalidate_profile(user_id, org_id)
+    )
+
+
+def _invalidate_org(org_id):
+    membership_cache.invalidate_org(org_id)
+    api_key_cache.invalidate_org(org_id)
+    dashboard_cache.invalidate_org(org_id)
+
+
+def _invalidate_user(user_id):
+    membership_cache.invalidate_user(user_id)
+    api_key_cache.invalidate_user(user_id)
+
+
+@receiver(post_save, sender="common.Profile")
+@receiver(post_delete, sender="common.Profile")
+def profile_membership_changed(sender, instance, **kwargs):
+    _invalidate_membership(instance.user_id, instance.org_id)
+    # The acting admin for the org's API key may have changed
+    api_key_cache.invalidate_org(instance.org_id)
+    transaction.on_commit(lambda: api_key_cache.invalidate_org(instance.org_id))
+
+
+@receiver(post_save, sender="common.Org")
+@receiver(post_delete, sender="common.Org")
+def org_membership_changed(sender, instance, **kwargs):
+    _invalidate_org(instance.id)
+    transaction.on_commit(lambda: _invalidate_org(instance.id))
+
+
+@receiver(post_save, sender="common.User")
+@receiver(post_delete, sender="common.User")
+def user_membership_changed(sender, instance, **kwargs):
+    _invalidate_user(instance.id)
+    transaction.on_commit(lambda: _invalidate_user(instance.id))
+
+
+# Dashboard cache invalidation (common.dashboard)
+def _invalidate_dashboard(org_id):
+    dashboard_cache.invalidate_org(org_id)
+    transaction.on_commit(lambda: dashboard_cache.invalidate_org(org_id))
+
+
+def dashboard_record_changed(sender, instance, **kwargs):
+    _invalidate_dashboard(instance.org_id)
+
+
+# Record visibility (common.visibility)
+def record_visibility_saved(sender, instance, created, update_fields=None, **kwargs):
+    # created_by and org are only set on creation
+    if created or (update_fields and {"created_by", "org"} & set(update_fields)):
+        sync_visibility(sender, [instance.pk])
+
+
+def record_visibility_deleted(sender, instance, **kwargs):
+    clear_visibility(sender, [instance.pk])
+
+
+def record_assignment_changed(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    _invalidate_dashboard(instance.org_id)
+    if not reverse:
+        sync_visibility(type(instance), [instance.pk])
+    elif action == "post_clear":
+        # profile.<model>_assigned_users.clear(): the records it could see
+        content_type = ContentType.objects.get_for_model(model)
+        sync_visibility(
+            model,
+            RecordVisibility.objects.filter(
+                profile=instance, content_type=content_type
+            ).values_list("object_id", flat=True),
+        )
+    else:
+        sync_visibility(model, pk_set)
+
+
+for label in VISIBILITY_MODELS:
+    visibility_model = apps.get_model(label)
+    post_save.connect(record_visibility_saved, sender=visibility_model)
+    post_delete.connect(record_visibility_deleted, sender=visibility_model)
+    post_save.connect(dashboard_record_changed, sender=visibility_model)
+    post_delete.connect(dashboard_record_changed, sender=visibility_model)
+    m2m_changed.connect(
+        record_assignment_changed,
+        sender=visibility_model._meta.get_field("assigned_to").remote_field.through,
+    )
+
+
+@receiver(post_save, sender="common.Profile")
+def profile_visibility_created(sender, instance, created, **kwargs):
+    # Records the user created in this org before the profile existed
+    if not created:
+        return
+    for label in VISIBILITY_MODELS:
+        model = apps.get_model(label)
+        sync_visibility(
+            model,
+            model._default_manager.filter(
+                org_id=instance.org_id, created_by_id=instance.user_id
+            ).values_list("pk", flat=True),
+        )
+
+
+# Amounts in the org's currency (common.fx)
+def normalized_amount_saving(sender, instance, **kwargs):
+    if sender._meta.get_field("org").is_cached(instance):
+        org_currency = instance.org.default_currency
+    else:
+        org_currency = (
+            Org.objects.filter(pk=instance.org_id)
+            .values_list("default_currency", flat=True)
+            .first()
+        )
+    normalize_instance(instance, org_currency or "USD")
+
+
+for label in NORMALIZED_AMOUNTS:
+    pre_save.connect(normalized_amount_saving, sender=apps.get_model(label))
+
+
+@receiver(pre_save, sender="common.Profile")
+def profile_handle_saving(sender, instance, **kwargs):
+    """Default the @mention handle to the email's local part"""
+    instance.handle = (instance.handle or default_handle(instance.user.email)).lower()
+
+
+@receiver(pre_save, sender="common.Org")
+def org_currency_changing(sender, instance, update_fields=None, **kwargs):
+    instance._currency_changed = False
+    if instance._state.adding or (
+        update_fields is not None and "default_currency" not in update_fields
+    ):
+        return
+    previous = (
+        Org.objects.filter(pk=instance.pk)
+        .values_list("default_currency", flat=True)
+        .first()
+    )
+    instance._currency_changed = previous != instance.default_currency
+
+
+@receiver(post_save, sender="common.Org")
+def org_currency_changed(sender, instance, created, **kwargs):
+    if getattr(instance, "_currency_changed", False):
+        normalize_org_amounts(instance)
@@ -0,0 +1,153 @@
+"""
+Pipeline history: daily rollups and week-over-week trends.
+
+snapshot_org() writes one day's PipelineSnapshot rows for an org: count,
+amount and weighted amount of its opportunities per stage and the count of
+its leads per status, for the whole org (owner null) and per assigned
+profile. It replaces the rows of that day, so it can be re-run at will. The
+snapshot_pipelines task runs it nightly for every org (CELERY_BEAT_SCHEDULE)
+and `python manage.py snapshot_pipelines` on demand.
+
+The trend endpoints only read the rollups: trend() takes the last snapshot
+of each ISO week and reports its value and the change from the week
+before. Won revenue is the amount in CLOSED_WON, so its weekly change is
+what was won that week.
+
+Usage:
+    from common.snapshots import snapshot_org, trend
+
+    snapshot_org(org)
+    trend(org, "pipeline", weeks=12)
+"""
+
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+
+from common.dashboard import OPEN_STAGES
+from common.models import PipelineSnapshot
+from common.rls import get_set_local_context_sql
+
+# metric -> (kind, stages summed or None for all, value)
+TREND_METRICS = {
+    "pipeline": ("opportunity", OPEN_STAGES, "amount"),
+    "won": ("opportunity", ("CLOSED_WON",), "amount"),
+    "leads": ("lead", None, "count"),
+}
+DEFAULT_TREND_WEEKS = 12
+MAX_TREND_WEEKS = 104
+
+
+def _rollup(queryset, field, aggregates):
+    """(stage, owner, aggregates) for the whole org and per assignee."""
+    queryset = queryset.order_by()
+    for row in queryset.values(field).annotate(**aggregates):
+        yield row.pop(field), None, row
+    for row in (
+        queryset.filter(assigned_to__isnull=False)
+        .values(field, "assigned_to")
+        .annotate(**aggregates)
+    ):
+        yield row.pop(field), row.pop("assigned_to"), row
+
+
+def snapshot_org(org, day=None):
+    """Replace org's PipelineSnapshot rows of day (default today)."""
+    from leads.models import Lead
+    from opportunity.models import Opportunity
+
+    day = day or date.today()
+    currency = org.default_currency or "USD"
+    sources = (
+        (
+            "opportunity",
+            _rollup(
+                Opportunity.objects.filter(org=org),
+                "stage",
+                {
+                    "count": Count("id"),
+                    "total_amount": Sum("amount_org_currency"),
+                    "weighted_amount": Sum(
+                        F("amount_org_currency") * F("probability") / 100,
+                        output_field=DecimalField(),
+                    ),
+                },
+            ),
+        ),
+        (
+            "lead",
+            _rollup(Lead.objects.filter(org=org), "status", {"count": Count("id")}),
+        ),
+    )
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(get_set_local_context_sql(), [str(org.id)])
+        rows = [
+            PipelineSnapshot(
+                org=org,
+                date=day,
+                kind=kind,
+                stage=stage or "",
+                owner_id=owner,
+                count=values["count"],
+                amount=values.get("total_amount") or 0,
+                weighted_amount=values.get("weighted_amount") or 0,
+                currency=currency,
+            )
+            for kind, rollup in sources
+            for stage, owner, values in rollup
+        ]
+        PipelineSnapshot.objects.filter(org=org, date=day).delete()
+        PipelineSnapshot.objects.bulk_create(rows)
+    return len(rows)
+
+
+def trend(org, metric, weeks=DEFAULT_TREND_WEEKS, owner=None, today=None):
+    """
+    Weekly points of metric from the rollups, oldest first.
+
+    owner limits it to one profile's assigned records. Each point is
+    {"week", "date", "value", "count", "change"}; change is None for the
+    first point.
+    """
+    kind, stages, value = TREND_METRICS[metric]
+    today = today or date.today()
+    start = today - timedelta(weeks=weeks) - timedelta(days=today.weekday())
+    # Every snapshot day, 0 where none of stages had rows
+    in_stages = Q(stage__in=stages) if stages is not None else Q()
+    days = (
+        PipelineSnapshot.objects.filter(
+            org=org, kind=kind, date__gte=start, owner=owner
+        )
+        .order_by("date")
+        .values("date")
+        .annotate(
+            total_count=Sum("count", filter=in_stages, default=0),
+            total_amount=Sum("amount", filter=in_stages, default=0),
+        )
+    )
+
+    # The last snapshot of each ISO week
+    by_week = {}
+    for row in days:
+        year, week, _ = row["date"].isocalendar()
+        by_week[(year, week)] = row
+
+    points, previous = [], None
+    for (year, week), row in sorted(by_week.items()):
+        current = (
+            float(row["total_amount"]) if value == "amount" else row["total_count"]
+        )
+        points.append(
+            {
+                "week": f"{year}-W{week:02d}",
+                "date": row["date"].isoformat(),
+                "value": current,
+                "count": row["total_count"],
+                "change": None if previous is None else current - previous,
+            }
+        )
+        previous = current
+    return points
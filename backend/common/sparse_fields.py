@@ -0,0 +1,226 @@
+"""
+Compact list serializers with sparse fieldsets.
+
+The CRM list views render their rows with a *ListSerializer: the scalar
+fields of the row plus compact stubs of its relations (assigned_to as
+id + email, teams as id + name, ...). The list queryset is set up to match
+the serializer exactly: .only() the columns it renders and one prefetch per
+relation, selecting only the stub columns.
+
+Clients can narrow or widen a list per request:
+
+    GET /api/leads/?fields=id,first_name,last_name,status
+    GET /api/leads/?expand=assigned_to,contacts
+
+`fields` limits each row to the listed fields (`id` is always kept) and
+loads only those columns. `expand` renders the listed relations with their
+full detail serializers instead of stubs. Both take comma separated names
+and may be repeated; unknown names are ignored.
+
+Comments and attachments (GenericRelated) are only rendered on ?expand=,
+e.g. ?expand=lead_comments,lead_attachment, and are loaded with one query
+per page by SparseListSerializer.
+
+Usage:
+    class LeadListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+        assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+
+        class Meta:
+            model = Lead
+            fields = ("id", "first_name", "assigned_to", ...)
+            relations = {
+                "assigned_to": Relation(
+                    Profile.objects.select_related("user").only(...),
+                    expanded=ProfileSerializer,
+                ),
+            }
+
+    options = LeadListSerializer.sparse_options(request)
+    queryset = LeadListSerializer.setup_queryset(queryset, **options)
+    LeadListSerializer(queryset, many=True, **options).data
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Manager, Prefetch
+from rest_framework import serializers
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+# Always rendered and loaded: row identity and the pagination key
+REQUIRED_FIELDS = ("id",)
+REQUIRED_COLUMNS = ("id", "created_at")
+
+
+def parse_names(request, param):
+    """Comma separated and/or repeated query parameter as a list of names."""
+    names = []
+    for value in request.query_params.getlist(param):
+        names.extend(name.strip() for name in value.split(",") if name.strip())
+    return names
+
+
+class Relation:
+    """
+    A relation rendered by a list serializer.
+
+    Args:
+        queryset: Queryset the stub is prefetched with, or None for a
+            forward relation rendered as its primary key
+        expanded: Serializer class rendering the relation on ?expand=
+        expanded_queryset: Queryset the expanded serializer is prefetched
+            with (defaults to the related model's default manager)
+    """
+
+    # Rendered only on ?expand=
+    deferred = False
+
+    def __init__(self, queryset, expanded=None, expanded_queryset=None):
+        self.queryset = queryset
+        self.expanded = expanded
+        self.expanded_queryset = expanded_queryset
+
+    def get_queryset(self, field, expanded):
+        if expanded and self.expanded is not None:
+            if self.expanded_queryset is not None:
+                return self.expanded_queryset.all()
+            return field.related_model._default_manager.all()
+        if self.queryset is None:
+            return None
+        return self.queryset.all()
+
+
+class GenericRelated(Relation):
+    """
+    Objects attached to the row by content_type and object_id (comments,
+    attachments), rendered by the field declared on the serializer.
+
+    The models have no relation to prefetch them through, so they are only
+    rendered on ?expand= and loaded by SparseListSerializer.
+
+    Args:
+        queryset: Queryset of the attached objects
+    """
+
+    deferred = True
+
+    def attach(self, name, instances):
+        """Set name on each of instances to its attached objects (one query)."""
+        if not instances:
+            return
+        attached = {instance.pk: [] for instance in instances}
+        for obj in self.queryset.filter(
+            content_type=ContentType.objects.get_for_model(instances[0]),
+            object_id__in=list(attached),
+        ):
+            attached[obj.object_id].append(obj)
+        for instance in instances:
+            setattr(instance, name, attached[instance.pk])
+
+
+class SparseListSerializer(serializers.ListSerializer):
+    """
+    List serializer loading the GenericRelated relations of its rows.
+
+    Set as Meta.list_serializer_class of list serializers declaring one.
+    """
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, Manager) else data)
+        relations = getattr(self.child.Meta, "relations", {})
+        for name in self.child.fields:
+            relation = relations.get(name)
+            if relation is not None and relation.deferred:
+                relation.attach(name, instances)
+        return super().to_representation(instances)
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin for compact list rows with ?fields= / ?expand=.
+
+    Meta.relations maps relation field names to Relation. Meta.columns
+    maps non-model fields (properties, method fields) to the columns they
+    read.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        relations = getattr(self.Meta, "relations", {})
+        for name in expand or ():
+            relation = relations.get(name)
+            if relation is None or relation.expanded is None:
+                continue
+            if name not in self.fields:
+                continue
+            many = isinstance(self.fields[name], serializers.ListSerializer)
+            self.fields[name] = relation.expanded(read_only=True, many=many)
+        for name, relation in relations.items():
+            if relation.deferred and name not in (expand or ()):
+                self.fields.pop(name, None)
+        if fields:
+            for name in set(self.fields) - set(fields) - set(REQUIRED_FIELDS):
+                self.fields.pop(name)
+
+    @classmethod
+    def sparse_options(cls, request):
+        """{"fields": [...] or None, "expand": [...]} parsed from the request."""
+        return {
+            "fields": parse_names(request, FIELDS_PARAM) or None,
+            "expand": parse_names(request, EXPAND_PARAM),
+        }
+
+    @classmethod
+    def setup_queryset(cls, queryset, fields=None, expand=()):
+        """
+        Load exactly what the serializer renders.
+
+        Replaces any select_related/prefetch_related of queryset with
+        .only() of the rendered columns and one prefetch per rendered
+        relation.
+        """
+        opts = queryset.model._meta
+        relations = getattr(cls.Meta, "relations", {})
+        extra_columns = getattr(cls.Meta, "columns", {})
+
+        names = [
+            name
+            for name in cls.Meta.fields
+            if not fields or name in fields or name in REQUIRED_FIELDS
+        ]
+        columns = set(REQUIRED_COLUMNS)
+        prefetches = []
+        for name in names:
+            columns.update(extra_columns.get(name, ()))
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_one or field.one_to_one:
+                columns.add(name)
+            elif field.concrete and not field.many_to_many:
+                columns.add(name)
+                continue
+            if name in relations:
+                related_queryset = relations[name].get_queryset(
+                    field, name in expand
+                )
+                if related_queryset is not None:
+                    prefetches.append(Prefetch(name, queryset=related_queryset))
+            elif field.many_to_many:
+                # Rendered as a list of primary keys
+                related = field.related_model
+                prefetches.append(
+                    Prefetch(
+                        name,
+                        queryset=related._default_manager.only(related._meta.pk.name),
+                    )
+                )
+
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .only(*columns)
+            .prefetch_related(*prefetches)
+        )
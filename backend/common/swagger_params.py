@@ -42,3 +42,19 @@ teams_list_get_params = [
     OpenApiParameter("created_by", OpenApiTypes.STR, OpenApiParameter.QUERY),
     OpenApiParameter("assigned_users", OpenApiTypes.STR, OpenApiParameter.QUERY),
 ]
+
+# Keyset pagination for the CRM list views (common.pagination)
+cursor_pagination_params = [
+    OpenApiParameter(
+        "pagination", OpenApiTypes.STR, OpenApiParameter.QUERY, enum=["cursor"]
+    ),
+    OpenApiParameter("cursor", OpenApiTypes.STR, OpenApiParameter.QUERY),
+    OpenApiParameter("page_size", OpenApiTypes.INT, OpenApiParameter.QUERY),
+]
+
+# Sparse fieldsets of the CRM list views (common.sparse_fields): comma
+# separated field names to return / relations to return in full
+sparse_fieldset_params = [
+    OpenApiParameter("fields", OpenApiTypes.STR, OpenApiParameter.QUERY),
+    OpenApiParameter("expand", OpenApiTypes.STR, OpenApiParameter.QUERY),
+]
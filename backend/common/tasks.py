@@ -1,6 +1,5 @@
 import datetime
 
-from celery import Celery
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import EmailMessage
@@ -10,10 +9,14 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
-from common.models import Comment, Profile, Teams, User
+from common.audit_log import write_audit_rows
+from common.mentions import parse_mentions, resolve_mentions
+from common.models import Comment, Org, Profile, Teams, User
+from common.notifications import notify_profiles
+from common.snapshots import snapshot_org
+from common.teams import propagate_team
 from common.token_generator import account_activation_token
-
-app = Celery("redis://")
+from crm.celery import app
 
 
 def set_rls_context(org_id):
@@ -75,74 +78,46 @@ def send_email_to_new_user(user_id):
         msg.send()
 
 
-@app.task
-def send_email_user_mentions(
-    comment_id,
-    called_from,
-    org_id=None,
-):
+# Subject of the mention emails per app the comment was posted from
+MENTION_SUBJECTS = {
+    "accounts": "New comment on Account. ",
+    "contacts": "New comment on Contact. ",
+    "leads": "New comment on Lead. ",
+    "opportunity": "New comment on Opportunity. ",
+    "cases": "New comment on Case. ",
+    "tasks": "New comment on Task. ",
+    "invoices": "New comment on Invoice. ",
+}
+
+
+@app.task(bind=True)
+def send_email_user_mentions(self, comment_id, called_from, org_id=None, recipients=None):
     """Send Mail To Mentioned Users In The Comment"""
     # Set RLS context for org-scoped queries
     set_rls_context(org_id)
 
-    comment = Comment.objects.filter(id=comment_id).first()
-    if comment:
-        comment_text = comment.comment
-        comment_text_list = comment_text.split()
-        recipients = []
-        for comment_text in comment_text_list:
-            if comment_text.startswith("@"):
-                if comment_text.strip("@").strip(",") not in recipients:
-                    if User.objects.filter(
-                        username=comment_text.strip("@").strip(","), is_active=True
-                    ).exists():
-                        email = (
-                            User.objects.filter(
-                                username=comment_text.strip("@").strip(",")
-                            )
-                            .first()
-                            .email
-                        )
-                        recipients.append(email)
-
-        context = {}
-        context["commented_by"] = comment.commented_by
-        context["comment_description"] = comment.comment
-        subject = None
-        if called_from == "accounts":
-            subject = "New comment on Account. "
-        elif called_from == "contacts":
-            subject = "New comment on Contact. "
-        elif called_from == "leads":
-            subject = "New comment on Lead. "
-        elif called_from == "opportunity":
-            subject = "New comment on Opportunity. "
-        elif called_from == "cases":
-            subject = "New comment on Case. "
-        elif called_from == "tasks":
-            subject = "New comment on Task. "
-        elif called_from == "invoices":
-            subject = "New comment on Invoice. "
-        if subject:
-            context["url"] = settings.DOMAIN_NAME
-        else:
-            context["url"] = ""
-        # subject = 'Django CRM : comment '
-        if recipients:
-            for recipient in recipients:
-                recipients_list = [
-                    recipient,
-                ]
-                context["mentioned_user"] = recipient
-                html_content = render_to_string("comment_email.html", context=context)
-                msg = EmailMessage(
-                    subject,
-                    html_content,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=recipients_list,
-                )
-                msg.content_subtype = "html"
-                msg.send()
+    comment = (
+        Comment.objects.select_related("commented_by__user")
+        .filter(id=comment_id)
+        .first()
+    )
+    if not comment:
+        return 0
+    if recipients is None:
+        recipients = resolve_mentions(comment.org_id, parse_mentions(comment.comment))
+    subject = MENTION_SUBJECTS.get(called_from)
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        subject,
+        "comment_email.html",
+        {
+            "commented_by": comment.commented_by,
+            "comment_description": comment.comment,
+            "url": settings.DOMAIN_NAME if subject else "",
+        },
+    )
 
 
 @app.task
@@ -261,119 +236,56 @@ def resend_activation_link_to_user(
             msg.send()
 
 
-@app.task
-def remove_users(removed_users_list, team_id, org_id=None):
-    # Set RLS context for org-scoped queries
-    set_rls_context(org_id)
+def _team_progress(task):
+    """progress() callback of propagate_team reporting to the task's result."""
 
-    removed_users_list = [i for i in removed_users_list if i.isdigit()]
-    users_list = Profile.objects.filter(id__in=removed_users_list)
-    if users_list.exists():
-        team = Teams.objects.filter(id=team_id).first()
-        if team:
-            accounts = team.account_teams.all()
-            for account in accounts:
-                for user in users_list:
-                    account.assigned_to.remove(user)
-
-            contacts = team.contact_teams.all()
-            for contact in contacts:
-                for user in users_list:
-                    contact.assigned_to.remove(user)
-
-            leads = team.lead_teams.all()
-            for lead in leads:
-                for user in users_list:
-                    lead.assigned_to.remove(user)
-
-            opportunities = team.oppurtunity_teams.all()
-            for opportunity in opportunities:
-                for user in users_list:
-                    opportunity.assigned_to.remove(user)
-
-            cases = team.cases_teams.all()
-            for case in cases:
-                for user in users_list:
-                    case.assigned_to.remove(user)
-
-            docs = team.document_teams.all()
-            for doc in docs:
-                for user in users_list:
-                    doc.shared_to.remove(user)
-
-            tasks = team.tasks_teams.all()
-            for task in tasks:
-                for user in users_list:
-                    task.assigned_to.remove(user)
-
-            invoices = team.invoices_teams.all()
-            for invoice in invoices:
-                for user in users_list:
-                    invoice.assigned_to.remove(user)
+    def progress(done, total):
+        if task.request.id and not task.request.is_eager:
+            task.update_state(state="PROGRESS", meta={"done": done, "total": total})
 
+    return progress
 
-@app.task
-def update_team_users(team_id, org_id=None):
-    """this function updates assigned_to field on all models when a team is updated"""
+
+@app.task(bind=True)
+def remove_users(self, removed_users_list, team_id, org_id=None):
+    """Unassign removed team members from all of the team's records"""
     # Set RLS context for org-scoped queries
     set_rls_context(org_id)
 
     team = Teams.objects.filter(id=team_id).first()
-    if team:
-        teams_members = team.users.all()
-
-        accounts = team.account_teams.all()
-        for account in accounts:
-            account_assigned_to_users = account.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in account_assigned_to_users:
-                    account.assigned_to.add(team_member)
-
-        contacts = team.contact_teams.all()
-        for contact in contacts:
-            contact_assigned_to_users = contact.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in contact_assigned_to_users:
-                    contact.assigned_to.add(team_member)
-
-        leads = team.lead_teams.all()
-        for lead in leads:
-            lead_assigned_to_users = lead.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in lead_assigned_to_users:
-                    lead.assigned_to.add(team_member)
-
-        opportunities = team.oppurtunity_teams.all()
-        for opportunity in opportunities:
-            opportunity_assigned_to_users = opportunity.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in opportunity_assigned_to_users:
-                    opportunity.assigned_to.add(team_member)
-
-        cases = team.cases_teams.all()
-        for case in cases:
-            case_assigned_to_users = case.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in case_assigned_to_users:
-                    case.assigned_to.add(team_member)
-
-        docs = team.document_teams.all()
-        for doc in docs:
-            doc_assigned_to_users = doc.shared_to.all()
-            for team_member in teams_members:
-                if team_member not in doc_assigned_to_users:
-                    doc.shared_to.add(team_member)
-
-        tasks = team.tasks_teams.all()
-        for task in tasks:
-            task_assigned_to_users = task.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in task_assigned_to_users:
-                    task.assigned_to.add(team_member)
-
-        invoices = team.invoices_teams.all()
-        for invoice in invoices:
-            invoice_assigned_to_users = invoice.assigned_to.all()
-            for team_member in teams_members:
-                if team_member not in invoice_assigned_to_users:
-                    invoice.assigned_to.add(team_member)
+    if not team:
+        return 0
+    profile_ids = Profile.objects.filter(
+        id__in=[str(i) for i in removed_users_list], org_id=team.org_id
+    ).values_list("id", flat=True)
+    return propagate_team(
+        team, "remove", profile_ids=profile_ids, progress=_team_progress(self)
+    )
+
+
+@app.task(bind=True)
+def update_team_users(self, team_id, org_id=None):
+    """Assign the team's members to all of the team's records"""
+    # Set RLS context for org-scoped queries
+    set_rls_context(org_id)
+
+    team = Teams.objects.filter(id=team_id).first()
+    if not team:
+        return 0
+    return propagate_team(team, "add", progress=_team_progress(self))
+
+
+@app.task
+def write_security_audit_logs(rows):
+    """Write a batch of buffered security audit events (AUDIT_LOG_SINK=celery)"""
+    return write_audit_rows(rows)
+
+
+@app.task
+def snapshot_pipelines(day=None, org_id=None):
+    """Nightly pipeline rollups of every org, or of org_id (common.snapshots)"""
+    day = datetime.date.fromisoformat(day) if day else None
+    orgs = Org.objects.all()
+    if org_id:
+        orgs = orgs.filter(id=org_id)
+    return sum(snapshot_org(org, day) for org in orgs.iterator())
@@ -0,0 +1,150 @@
+"""
+Set-based propagation of team membership to the team's records.
+
+Members of a team are assigned to (shared, for documents) every record the
+team is attached to. When the team changes, update_team_users and
+remove_users (common.tasks) bring the assignments in line with one
+INSERT ... ON CONFLICT DO NOTHING or one DELETE per model and chunk of
+TEAM_PROPAGATION_CHUNK_SIZE records, instead of an add()/remove() per
+record and member.
+
+These writes bypass the m2m_changed signals, so the RecordVisibility rows
+of the changed records are re-synced per chunk (common.visibility) and
+their updated_at is bumped, which the detail views' ETags depend on
+(common.conditional). They run in a Celery worker, which can't reach the
+web processes' dashboard cache: dashboard summaries catch up within
+DASHBOARD_CACHE_TTL seconds.
+
+Usage:
+    propagate_team(team, "add", progress=callback)
+    propagate_team(team, "remove", profile_ids=[...])
+"""
+
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from common.visibility import VISIBILITY_MODELS, sync_visibility
+
+logger = logging.getLogger(__name__)
+
+# (model label, field team members are assigned to)
+TEAM_ASSIGNMENTS = (
+    ("accounts.Account", "assigned_to"),
+    ("contacts.Contact", "assigned_to"),
+    ("leads.Lead", "assigned_to"),
+    ("opportunity.Opportunity", "assigned_to"),
+    ("cases.Case", "assigned_to"),
+    ("common.Document", "shared_to"),
+    ("tasks.Task", "assigned_to"),
+    ("invoices.Invoice", "assigned_to"),
+)
+
+
+def _m2m_columns(field):
+    """(table, record column, target column) of an M2M field's through table."""
+    through = field.remote_field.through
+    return (
+        through._meta.db_table,
+        through._meta.get_field(field.m2m_field_name()).column,
+        through._meta.get_field(field.m2m_reverse_field_name()).column,
+    )
+
+
+def _team_records(model, team):
+    """Through rows linking the team to model's records."""
+    field = model._meta.get_field("teams")
+    return field.remote_field.through.objects.filter(
+        **{field.m2m_reverse_field_name(): team.pk}
+    )
+
+
+def _record_id_chunks(model, team):
+    """Ids of model's records the team is attached to, keyset-paginated."""
+    chunk_size = getattr(settings, "TEAM_PROPAGATION_CHUNK_SIZE", 1000)
+    record_id = f"{model._meta.get_field('teams').m2m_field_name()}_id"
+    records = _team_records(model, team).order_by(record_id)
+    last = None
+    while True:
+        page = records.filter(**{f"{record_id}__gt": last}) if last else records
+        chunk = [str(pk) for pk in page.values_list(record_id, flat=True)[:chunk_size]]
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def _assign(field, record_ids, profile_ids):
+    table, record_column, profile_column = _m2m_columns(field)
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(table)} ({quote(record_column)}, "
+            f"{quote(profile_column)}) "
+            "SELECT r.id, p.id FROM unnest(%s::uuid[]) AS r(id) "
+            "CROSS JOIN unnest(%s::uuid[]) AS p(id) "
+            f"ON CONFLICT DO NOTHING RETURNING {quote(record_column)}",
+            [record_ids, profile_ids],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _unassign(field, record_ids, profile_ids):
+    table, record_column, profile_column = _m2m_columns(field)
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(table)} "
+            f"WHERE {quote(record_column)} = ANY(%s::uuid[]) "
+            f"AND {quote(profile_column)} = ANY(%s::uuid[]) "
+            f"RETURNING {quote(record_column)}",
+            [record_ids, profile_ids],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def propagate_team(team, action, profile_ids=None, progress=None):
+    """
+    Assign ("add") or unassign ("remove") profiles on all of team's records.
+
+    profile_ids defaults to the team's members. progress(done, total) is
+    called after each chunk. Returns the number of records changed.
+    """
+    if profile_ids is None:
+        profile_ids = team.users.values_list("id", flat=True)
+    profile_ids = [str(profile_id) for profile_id in profile_ids]
+    if not profile_ids:
+        return 0
+    write = _assign if action == "add" else _unassign
+
+    models = [(apps.get_model(label), name) for label, name in TEAM_ASSIGNMENTS]
+    total = sum(_team_records(model, team).count() for model, _ in models)
+    done = changed = 0
+    for model, name in models:
+        field = model._meta.get_field(name)
+        for record_ids in _record_id_chunks(model, team):
+            with transaction.atomic():
+                changed_ids = write(field, record_ids, profile_ids)
+                model._default_manager.filter(pk__in=changed_ids).update(
+                    updated_at=timezone.now()
+                )
+                if model._meta.label in VISIBILITY_MODELS:
+                    sync_visibility(model, changed_ids)
+            done += len(record_ids)
+            changed += len(changed_ids)
+            if progress:
+                progress(done, total)
+        logger.info(
+            "Team %s: %s %d profiles, %d/%d records done (%s)",
+            team.pk,
+            action,
+            len(profile_ids),
+            done,
+            total,
+            model._meta.label,
+        )
+
+    return changed
@@ -0,0 +1,34 @@
+"""
+Shared setup for tests working in a single organization.
+"""
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.models import Org, Profile, User
+from common.serializer import OrgAwareRefreshToken
+
+
+class OrgTestCase(TestCase):
+    """Base test case with one org, its members and API clients acting as them"""
+
+    org_name = "Test Org"
+
+    def setUp(self):
+        self.org = Org.objects.create(name=self.org_name)
+
+    def create_profile(self, email, role="USER", is_active=True):
+        """An org member with a new user."""
+        return Profile.objects.create(
+            user=User.objects.create_user(email=email, password="testpass123"),
+            org=self.org,
+            role=role,
+            is_active=is_active,
+        )
+
+    def client_for(self, profile):
+        """An API client authenticated as profile in its org."""
+        token = OrgAwareRefreshToken.for_user_and_org(profile.user, profile.org)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        return client
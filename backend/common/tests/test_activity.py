@@ -0,0 +1,106 @@
+"""
+Tests for batched Activity recording from common.signals.
+
+Run with: pytest common/tests/test_activity.py -v
+"""
+
+from crum import set_current_request
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from common.activity import activity_batch, aggregate_activities, suppress_activities
+from common.models import Activity, Org, Profile, User
+
+
+class TestActivityBatching(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Activity Org")
+        self.user = User.objects.create_user(
+            email="activity@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+
+        request = RequestFactory().get("/api/accounts/")
+        request.user = self.user
+        request.profile = self.profile
+        set_current_request(request)
+        self.addCleanup(set_current_request, None)
+
+    def test_batch_written_once_on_close(self):
+        with activity_batch():
+            account = Account.objects.create(name="Batched", org=self.org)
+            account.save()
+            account.save()
+            Account.objects.create(name="Batched 2", org=self.org)
+            self.assertFalse(Activity.objects.exists())
+
+        activities = Activity.objects.filter(org=self.org)
+        self.assertEqual(
+            sorted(activities.values_list("action", flat=True)),
+            ["CREATE", "CREATE", "UPDATE"],
+        )
+        self.assertEqual(activities.filter(entity_id=account.id).count(), 2)
+        self.assertEqual(activities.first().created_by, self.user)
+
+    def test_deletes_written_in_one_insert(self):
+        accounts = [
+            Account.objects.create(name=f"Deleted {i}", org=self.org) for i in range(3)
+        ]
+        Activity.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            with activity_batch():
+                for account in accounts:
+                    account.delete()
+
+        inserts = [
+            q for q in queries.captured_queries
+            if q["sql"].startswith('INSERT INTO "activity"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Activity.objects.filter(action="DELETE").count(), 3)
+
+    def test_rolled_back_savepoint_drops_its_activities(self):
+        with activity_batch():
+            Account.objects.create(name="Kept", org=self.org)
+            try:
+                with transaction.atomic():
+                    Account.objects.create(name="Rolled back", org=self.org)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(
+            list(Activity.objects.values_list("entity_name", flat=True)), ["Kept"]
+        )
+
+    def test_entity_name_needs_no_queries(self):
+        account = Account.objects.create(name="No Queries", org=self.org)
+
+        with activity_batch():
+            with self.assertNumQueries(1):
+                account.save()
+
+        self.assertEqual(
+            Activity.objects.get(action="UPDATE").entity_name, "No Queries"
+        )
+
+    def test_suppress_activities(self):
+        with activity_batch():
+            with suppress_activities():
+                Account.objects.create(name="Imported", org=self.org)
+
+        self.assertFalse(Activity.objects.exists())
+
+    def test_aggregate_activities(self):
+        with aggregate_activities():
+            for i in range(3):
+                Account.objects.create(name=f"Bulk {i}", org=self.org)
+
+        activity = Activity.objects.get()
+        self.assertEqual(activity.action, "CREATE")
+        self.assertEqual(activity.entity_name, "3 Account records")
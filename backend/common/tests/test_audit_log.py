@@ -0,0 +1,61 @@
+"""
+Tests for the buffered security audit log sink.
+
+Run with: pytest common/tests/test_audit_log.py -v
+"""
+
+from unittest.mock import patch
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from common.audit_log import AuditLogBuffer, SecurityAuditLog, audit_log
+from common.models import Org, User
+
+
+class TestBufferedAuditLog(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Audit Org")
+        self.user = User.objects.create_user(
+            email="audit@test.com", password="testpass123"
+        )
+        self.request = RequestFactory().post("/api/auth/login/")
+
+        # A private buffer without the writer thread, flushed explicitly
+        self.buffer = AuditLogBuffer()
+        patchers = [
+            patch("common.audit_log.audit_log_buffer", self.buffer),
+            patch.object(AuditLogBuffer, "_ensure_writer"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_events_written_on_flush(self):
+        with self.assertNumQueries(0):
+            audit_log.login_success(self.user, self.org, self.request)
+            audit_log.token_refresh(self.user, self.org, self.request)
+
+        self.assertFalse(SecurityAuditLog.objects.exists())
+
+        self.buffer.flush()
+
+        logs = SecurityAuditLog.objects.filter(org=self.org, user=self.user)
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(self.buffer.stats()["written"], 2)
+        self.assertEqual(self.buffer.stats()["pending"], 0)
+
+    @override_settings(AUDIT_LOG_MAX_QUEUE=1)
+    def test_full_queue_drops_and_counts(self):
+        audit_log.login_success(self.user, self.org, self.request)
+        audit_log.login_success(self.user, self.org, self.request)
+
+        self.assertEqual(self.buffer.stats()["dropped"], 1)
+        self.buffer.flush()
+        self.assertEqual(SecurityAuditLog.objects.count(), 1)
+
+    @override_settings(AUDIT_LOG_SINK="sync")
+    def test_sync_sink_writes_immediately(self):
+        audit_log.login_success(self.user, self.org, self.request)
+
+        self.assertEqual(SecurityAuditLog.objects.count(), 1)
+        self.assertEqual(self.buffer.stats()["pending"], 0)
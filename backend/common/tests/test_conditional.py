@@ -0,0 +1,88 @@
+"""
+Tests for conditional GET on the entity detail views.
+
+Run with: pytest common/tests/test_conditional.py -v
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.models import Comment, Org, Profile, Tags, User
+from common.serializer import OrgAwareRefreshToken
+from contacts.models import Contact
+from leads.models import Lead
+
+
+class TestConditionalDetail(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Conditional Org")
+        self.user = User.objects.create_user(
+            email="conditional@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+        self.lead = Lead.objects.create(
+            first_name="Cond", last_name="Lead", status="assigned", org=self.org
+        )
+        self.url = f"/api/leads/{self.lead.id}/"
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_comment_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        Comment.objects.create(
+            comment="New",
+            content_type=ContentType.objects.get_for_model(Lead),
+            object_id=self.lead.id,
+            commented_by=self.profile,
+            org=self.org,
+        )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["comments"]), 1)
+
+    def test_update_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.lead.title = "Updated"
+        self.lead.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_linked_contact_and_tag_changes_etag(self):
+        contact = Contact.objects.create(first_name="Ada", org=self.org)
+        tag = Tags.objects.create(name="Hot", org=self.org)
+        self.lead.contacts.add(contact)
+        self.lead.tags.add(tag)
+
+        for linked, field in ((contact, "first_name"), (tag, "name")):
+            etag = self.client.get(self.url)["ETag"]
+            setattr(linked, field, "Renamed")
+            linked.save()
+
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+
+    def test_other_org_entity(self):
+        other = Lead.objects.create(
+            first_name="Other", org=Org.objects.create(name="Other Org")
+        )
+
+        response = self.client.get(f"/api/leads/{other.id}/")
+        self.assertNotIn("ETag", response)
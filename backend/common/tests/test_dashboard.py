@@ -0,0 +1,79 @@
+"""
+Tests for the aggregated, cached dashboard summary (/api/dashboard/).
+
+Run with: pytest common/tests/test_dashboard.py -v
+"""
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from common.cache import dashboard_cache, fx_rate_cache
+from common.tests.base import OrgTestCase
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+
+@override_settings(DASHBOARD_RECENT_LIMIT=3)
+class TestDashboard(OrgTestCase):
+    org_name = "Dashboard Org"
+
+    def setUp(self):
+        dashboard_cache.clear()
+        fx_rate_cache.clear()
+        super().setUp()
+        self.admin = self.create_profile("dashboard-admin@test.com", role="ADMIN")
+        self.user = self.create_profile("dashboard-user@test.com")
+        for i in range(5):
+            Lead.objects.create(first_name=f"Lead {i}", org=self.org, rating="HOT")
+        Opportunity.objects.create(
+            name="Deal A", stage="PROSPECTING", amount=100, probability=50,
+            currency="USD", org=self.org,
+        )
+        Opportunity.objects.create(
+            name="Deal B", stage="PROSPECTING", amount=300, probability=10,
+            org=self.org,
+        )
+        Opportunity.objects.create(
+            name="Deal C", stage="PROPOSAL", amount=999, currency="EUR",
+            org=self.org,
+        )
+
+    def test_aggregates(self):
+        response = self.client_for(self.admin).get("/api/dashboard/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["leads_count"], 5)
+        self.assertEqual(len(data["leads"]), 3)
+        self.assertEqual(data["opportunities_count"], 3)
+        self.assertEqual(data["opportunities_amount"], 400)
+        self.assertEqual(data["pipeline_by_stage"]["PROSPECTING"]["count"], 2)
+        self.assertEqual(data["pipeline_by_stage"]["PROSPECTING"]["value"], 400)
+        self.assertEqual(data["pipeline_by_stage"]["PROPOSAL"]["value"], 0)
+        self.assertEqual(data["revenue_metrics"]["pipeline_value"], 400)
+        self.assertEqual(data["revenue_metrics"]["weighted_pipeline"], 80)
+        self.assertEqual(data["revenue_metrics"]["other_currency_count"], 1)
+
+    def test_cached_until_records_change(self):
+        client = self.client_for(self.admin)
+        client.get("/api/dashboard/")
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get("/api/dashboard/")
+        self.assertFalse(
+            any('"lead"' in query["sql"] for query in queries.captured_queries)
+        )
+
+        Lead.objects.create(first_name="Fresh", org=self.org)
+        self.assertEqual(client.get("/api/dashboard/").json()["leads_count"], 6)
+
+    def test_non_admin_scope(self):
+        Lead.objects.filter(first_name="Lead 0").get().assigned_to.add(self.user)
+
+        admin_data = self.client_for(self.admin).get("/api/dashboard/").json()
+        user_data = self.client_for(self.user).get("/api/dashboard/").json()
+
+        self.assertEqual(admin_data["leads_count"], 5)
+        self.assertEqual(user_data["leads_count"], 1)
+        self.assertEqual(user_data["opportunities_count"], 0)
@@ -0,0 +1,81 @@
+"""
+Tests for facet counts computed in one aggregate query.
+
+Run with: pytest common/tests/test_facets.py -v
+"""
+
+from django.db.models import Q
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.facets import facet_counts
+from common.models import Org, Profile, User
+from common.serializer import OrgAwareRefreshToken
+from leads.models import Lead
+
+
+class TestFacetCounts(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Facet Org")
+        self.user = User.objects.create_user(
+            email="facets@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+        for status, rating in [
+            ("assigned", "HOT"),
+            ("assigned", "COLD"),
+            ("closed", "HOT"),
+            (None, None),
+        ]:
+            Lead.objects.create(
+                first_name="Facet",
+                last_name=str(status),
+                status=status,
+                rating=rating,
+                org=self.org,
+            )
+
+    def test_buckets_and_fields_in_one_query(self):
+        queryset = Lead.objects.filter(org=self.org)
+
+        with self.assertNumQueries(1):
+            facets = facet_counts(
+                queryset,
+                buckets={"open": ~Q(status="closed"), "close": Q(status="closed")},
+                fields=["status", "rating"],
+            )
+
+        self.assertEqual(facets["total"], 4)
+        self.assertEqual(facets["buckets"], {"open": 3, "close": 1})
+        self.assertEqual(facets["fields"]["status"]["assigned"], 2)
+        self.assertEqual(facets["fields"]["rating"]["HOT"], 2)
+        self.assertEqual(facets["fields"]["rating"]["WARM"], 0)
+
+    def test_joined_rows_counted_once(self):
+        other = Profile.objects.create(
+            user=User.objects.create_user(email="other@test.com", password="x"),
+            org=self.org,
+        )
+        lead = Lead.objects.filter(status="closed").get()
+        lead.assigned_to.add(self.profile, other)
+
+        queryset = Lead.objects.filter(
+            assigned_to__in=[self.profile, other]
+        )
+        facets = facet_counts(queryset, buckets={"close": Q(status="closed")})
+
+        self.assertEqual(facets["total"], 1)
+        self.assertEqual(facets["buckets"]["close"], 1)
+
+    def test_lead_list_uses_facet_counts(self):
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+        data = client.get("/api/leads/").json()
+
+        self.assertEqual(data["open_leads"]["leads_count"], 3)
+        self.assertEqual(data["close_leads"]["leads_count"], 1)
+        self.assertEqual(data["facets"]["fields"]["rating"]["HOT"], 2)
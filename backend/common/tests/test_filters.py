@@ -0,0 +1,143 @@
+"""
+Tests for the index-aware substring filters and the list FilterSets.
+
+Run with: pytest common/tests/test_filters.py -v
+"""
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from common.filters import contains_filter
+from common.models import Org, Profile, Tags, User
+from common.serializer import OrgAwareRefreshToken
+from contacts.models import Contact
+from leads.filters import LeadFilterSet
+from leads.models import Lead
+
+
+def trigram_indexes_installed():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class TestContainsFilter(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Filter Org")
+        self.user = User.objects.create_user(
+            email="filter@test.com", password="testpass123"
+        )
+        Profile.objects.create(user=self.user, org=self.org, role="ADMIN", is_active=True)
+        Contact.objects.create(
+            first_name="Ada", last_name="Lovelace", city="London", org=self.org
+        )
+        Contact.objects.create(
+            first_name="Al", last_name="Turing", city="Wilmslow", org=self.org
+        )
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def first_names(self, queryset):
+        return sorted(queryset.values_list("first_name", flat=True))
+
+    def test_substring_on_indexed_field(self):
+        queryset = Contact.objects.filter(org=self.org)
+
+        self.assertEqual(
+            self.first_names(contains_filter(queryset, "city", "ond")), ["Ada"]
+        )
+        self.assertEqual(
+            self.first_names(contains_filter(queryset, "city", "LOW")), ["Al"]
+        )
+
+    def test_short_value_matches_whole_field(self):
+        queryset = Contact.objects.filter(org=self.org)
+
+        self.assertEqual(
+            self.first_names(contains_filter(queryset, "first_name", "al")), ["Al"]
+        )
+
+    def test_unindexed_field_matches_exactly(self):
+        queryset = Contact.objects.filter(org=self.org)
+
+        self.assertEqual(
+            self.first_names(contains_filter(queryset, "last_name", "Turin")), []
+        )
+        self.assertEqual(
+            self.first_names(contains_filter(queryset, "last_name", "Turing")), ["Al"]
+        )
+
+    def test_contacts_city_filter(self):
+        response = self.client.get("/api/contacts/", {"city": "lond"})
+
+        self.assertEqual(response.status_code, 200)
+        contacts = response.json()["results"]
+        self.assertEqual([contact["first_name"] for contact in contacts], ["Ada"])
+
+        response = self.client.get("/api/contacts/", {"assigned_to": "me"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("assigned_to", response.json())
+
+    def test_index_is_usable(self):
+        if not trigram_indexes_installed():
+            self.skipTest("pg_trgm is not installed")
+        queryset = contains_filter(Contact.objects.all(), "city", "ondo")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("contacts_city_trgm_idx", plan)
+
+
+class TestFilterSet(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="FilterSet Org")
+        self.hot = Tags.objects.create(name="Hot", org=self.org)
+        self.cold = Tags.objects.create(name="Cold", org=self.org)
+        for name, tags in [("Both", [self.hot, self.cold]), ("Cold", [self.cold])]:
+            lead = Lead.objects.create(
+                first_name=name, status="assigned", rating="HOT", org=self.org
+            )
+            lead.tags.set(tags)
+        Lead.objects.create(first_name="None", status="in process", org=self.org)
+
+    def filter(self, query):
+        return LeadFilterSet(QueryDict(query), Lead.objects.filter(org=self.org))
+
+    def first_names(self, query):
+        return sorted(
+            self.filter(query).filter_queryset().values_list("first_name", flat=True)
+        )
+
+    def test_related_filter_is_exists(self):
+        query = f"tags={self.hot.id}&tags={self.cold.id}"
+
+        self.assertEqual(self.first_names(query), ["Both", "Cold"])
+        self.assertEqual(self.first_names(f"tags={self.hot.id}"), ["Both"])
+        sql = self.filter(query).sql()
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_typed_values(self):
+        self.assertEqual(self.first_names("status=in process"), ["None"])
+        self.assertEqual(
+            self.first_names("rating=HOT&created_at__gte=2000-01-01"), ["Both", "Cold"]
+        )
+        self.assertEqual(self.first_names("status="), ["Both", "Cold", "None"])
+
+    def test_invalid_values(self):
+        with self.assertRaises(ValidationError) as raised:
+            self.filter(
+                "tags=nope&status=unknown&created_at__gte=yesterday"
+            ).filter_queryset()
+
+        self.assertEqual(
+            set(raised.exception.detail), {"tags", "status", "created_at__gte"}
+        )
@@ -0,0 +1,62 @@
+"""
+Tests for exchange rates and the amounts normalized to the org's currency.
+
+Run with: pytest common/tests/test_fx.py -v
+"""
+
+import json
+import tempfile
+from decimal import Decimal
+
+from django.test import TestCase
+
+from common.cache import fx_rate_cache
+from common.fx import convert, load_rates_file, set_rates
+from common.models import Org
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+
+class TestFX(TestCase):
+    def setUp(self):
+        # The rates are rolled back after each test, the cache is not
+        self.addCleanup(fx_rate_cache.clear)
+        set_rates({"USD": 1, "EUR": "0.5", "GBP": "0.25"})
+        self.org = Org.objects.create(name="FX Org", default_currency="USD")
+
+    def test_convert(self):
+        self.assertEqual(convert(Decimal("10"), "EUR", "USD"), Decimal("20.00"))
+        self.assertEqual(convert(Decimal("10"), "EUR", "GBP"), Decimal("5.00"))
+        self.assertEqual(convert(Decimal("10"), None, "USD"), Decimal("10.00"))
+        self.assertIsNone(convert(Decimal("10"), "JPY", "USD"))
+
+    def test_amount_normalized_on_save(self):
+        deal = Opportunity.objects.create(
+            name="Deal", amount=100, currency="EUR", org=self.org
+        )
+        lead = Lead.objects.create(
+            first_name="Lead", opportunity_amount=10, currency="GBP", org=self.org
+        )
+
+        self.assertEqual(deal.amount_org_currency, Decimal("200.00"))
+        self.assertEqual(lead.opportunity_amount_org_currency, Decimal("40.00"))
+
+    def test_rate_and_org_currency_changes_renormalize(self):
+        deal = Opportunity.objects.create(
+            name="Deal", amount=100, currency="EUR", org=self.org
+        )
+
+        set_rates({"USD": 1, "EUR": "0.8"})
+        deal.refresh_from_db()
+        self.assertEqual(deal.amount_org_currency, Decimal("125.00"))
+
+        self.org.default_currency = "EUR"
+        self.org.save()
+        deal.refresh_from_db()
+        self.assertEqual(deal.amount_org_currency, Decimal("100.00"))
+
+    def test_load_rates_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"base": "USD", "rates": {"EUR": 0.9}}, f)
+
+        self.assertEqual(load_rates_file(f.name), {"EUR": 0.9, "USD": 1})
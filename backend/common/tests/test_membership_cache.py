@@ -0,0 +1,127 @@
+"""
+Tests for the per-process membership and API key caches used by
+GetProfileAndOrg and APIKeyAuthentication.
+
+Run with: pytest common/tests/test_membership_cache.py -v
+"""
+
+from django.test import RequestFactory, TestCase
+from rest_framework.exceptions import AuthenticationFailed
+
+from common.cache import TTLCache, api_key_cache, membership_cache
+from common.external_auth import resolve_api_key
+from common.middleware.get_company import GetProfileAndOrg
+from common.models import Org, Profile, User, hash_api_key
+from common.serializer import OrgAwareRefreshToken
+
+
+class TestTTLCache(TestCase):
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIs(cache.get("b"), cache.get("missing"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_zero_ttl_disables_cache(self):
+        cache = TTLCache(max_size=10, ttl=0)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.stats()["size"], 0)
+
+
+class TestMembershipCache(TestCase):
+    def setUp(self):
+        membership_cache.clear()
+        self.org = Org.objects.create(name="Cached Org")
+        self.user = User.objects.create_user(
+            email="cached@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+        self.token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.factory = RequestFactory()
+
+    def _request(self):
+        request = self.factory.get(
+            "/api/leads/", HTTP_AUTHORIZATION=f"Bearer {self.token.access_token}"
+        )
+        GetProfileAndOrg(lambda r: r)(request)
+        return request
+
+    def test_second_request_hits_cache(self):
+        self._request()
+        hits = membership_cache.hits
+
+        with self.assertNumQueries(0):
+            request = self._request()
+
+        self.assertEqual(request.profile, self.profile)
+        self.assertEqual(request.org, self.org)
+        self.assertEqual(membership_cache.hits, hits + 1)
+
+    def test_cached_instances_are_not_shared(self):
+        first = self._request()
+        second = self._request()
+
+        self.assertIsNot(first.profile, second.profile)
+        self.assertIsNot(first.org, second.org)
+
+    def test_deactivated_profile_takes_effect_immediately(self):
+        self._request()
+
+        self.profile.is_active = False
+        self.profile.save()
+
+        self.assertIsNone(self._request().profile)
+
+    def test_org_change_invalidates_entries(self):
+        self._request()
+
+        self.org.name = "Renamed Org"
+        self.org.save()
+
+        self.assertEqual(self._request().org.name, "Renamed Org")
+
+
+class TestAPIKeyResolution(TestCase):
+    def setUp(self):
+        api_key_cache.clear()
+        self.org = Org.objects.create(name="API Org")
+        self.user = User.objects.create_user(
+            email="apiadmin@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+
+    def test_digest_is_stored(self):
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.api_key_digest, hash_api_key(self.org.api_key))
+
+    def test_resolution_is_cached(self):
+        self.assertEqual(resolve_api_key(self.org.api_key), self.profile)
+
+        with self.assertNumQueries(0):
+            profile = resolve_api_key(self.org.api_key)
+
+        self.assertEqual(profile.org, self.org)
+        self.assertEqual(profile.user, self.user)
+
+    def test_unknown_key_rejected(self):
+        with self.assertRaises(AuthenticationFailed):
+            resolve_api_key("not-a-real-key")
+
+    def test_demoted_admin_invalidates_cache(self):
+        resolve_api_key(self.org.api_key)
+
+        self.profile.role = "USER"
+        self.profile.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            resolve_api_key(self.org.api_key)
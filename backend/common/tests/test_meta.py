@@ -0,0 +1,66 @@
+"""
+Tests for the /api/meta/ reference data bundles.
+
+Run with: pytest common/tests/test_meta.py -v
+"""
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from common.models import Org, Profile, Tags, User
+from common.serializer import OrgAwareRefreshToken
+
+
+class TestMetaBundles(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Meta Org")
+        self.user = User.objects.create_user(
+            email="meta@test.com", password="testpass123"
+        )
+        Profile.objects.create(user=self.user, org=self.org, role="ADMIN", is_active=True)
+        Tags.objects.create(name="First", org=self.org)
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def test_static_bundle(self):
+        response = APIClient().get("/api/meta/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("countries", response.json())
+        self.assertTrue(response["Cache-Control"].startswith("public, max-age="))
+
+        etag = response["ETag"]
+        response = APIClient().get("/api/meta/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_versioned_url_is_immutable(self):
+        version = APIClient().get("/api/meta/").json()["version"]
+
+        response = APIClient().get("/api/meta/", {"v": version})
+
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_lookups_revalidate(self):
+        response = self.client.get("/api/meta/lookups/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([tag["name"] for tag in response.json()["tags"]], ["First"])
+        etag = response["ETag"]
+
+        response = self.client.get("/api/meta/lookups/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Tags.objects.create(name="Second", org=self.org)
+        response = self.client.get("/api/meta/lookups/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["tags"]), 2)
+
+    def test_list_reference_data_flag(self):
+        self.assertIn("countries", self.client.get("/api/leads/").json())
+        data = self.client.get("/api/leads/", {"reference_data": "false"}).json()
+        self.assertNotIn("countries", data)
+        self.assertIn("open_leads", data)
+
+        with override_settings(API_INCLUDE_REFERENCE_DATA=False):
+            self.assertNotIn("countries", self.client.get("/api/leads/").json())
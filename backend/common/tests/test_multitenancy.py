@@ -122,6 +122,47 @@ class TestMiddlewareOrgValidation(MultiTenancyBaseTestCase):
         # Middleware should not set profile when membership is revoked
         self.assertIsNone(getattr(request, "profile", None))
 
+    def test_jwt_verified_once_per_request(self):
+        """Middleware and DRF authentication should share one token verification"""
+        from common.external_auth import OrgAwareJWTAuthentication
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user_a, self.org_a)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+        with patch.object(
+            OrgAwareJWTAuthentication,
+            "get_validated_token",
+            autospec=True,
+            side_effect=OrgAwareJWTAuthentication.get_validated_token,
+        ) as verify, patch.object(
+            OrgAwareJWTAuthentication,
+            "get_user",
+            autospec=True,
+            side_effect=OrgAwareJWTAuthentication.get_user,
+        ) as get_user:
+            response = self.client.get("/api/auth/profile/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(verify.call_count, 1)
+        self.assertEqual(get_user.call_count, 0)
+
+    def test_route_policies_declared_by_views(self):
+        """Org requirement comes from the views, not hard-coded path lists"""
+        from common.middleware.route_policy import get_route_registry
+
+        registry = get_route_registry()
+        lead_detail = registry.policy_for(f"/api/leads/{self.org_a.id}/")
+        login = registry.policy_for("/api/auth/login/")
+        me = registry.policy_for("/api/auth/me/")
+
+        self.assertTrue(lead_detail.org_required)
+        self.assertFalse(login.authenticate)
+        self.assertFalse(login.org_required)
+        self.assertTrue(me.authenticate)
+        self.assertFalse(me.org_required)
+        self.assertFalse(registry.policy_for("/admin/").org_required)
+        self.assertFalse(registry.policy_for("/api/no-such-route/").resolvable)
+
     def test_api_key_scoped_to_org(self):
         """API key authentication should be scoped to specific org"""
         request = self.factory.get("/api/leads/", HTTP_TOKEN=self.org_a.api_key)
@@ -585,6 +626,29 @@ class TestRLSIntegration(MultiTenancyBaseTestCase):
 
             self.assertEqual(context, str(self.org_a.id))
 
+    def test_transaction_mode_sets_local_context(self):
+        """Transaction mode should apply app.current_org with SET LOCAL."""
+        if not self.is_postgres:
+            self.skipTest("RLS requires PostgreSQL")
+
+        from django.db import connection
+        from django.test import override_settings
+
+        from common.middleware.rls_context import RequireOrgContext
+
+        def view(request):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT current_setting('app.current_org', true)")
+                return cursor.fetchone()[0]
+
+        request = self.factory.get("/api/leads/")
+        request.org = self.org_a
+
+        with override_settings(RLS_CONTEXT_MODE="transaction"):
+            context = RequireOrgContext(view)(request)
+
+        self.assertEqual(context, str(self.org_a.id))
+
     def test_rls_status_check(self):
         """Verify RLS is enabled on key tables."""
         if not self.is_postgres:
@@ -0,0 +1,162 @@
+"""
+Tests for the notification pipeline: assignment emails and @mentions.
+
+Run with: pytest common/tests/test_notifications.py -v
+"""
+
+import smtplib
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account
+from common.mentions import parse_mentions
+from common.models import Comment
+from common.notifications import rate_limiter, send_messages
+from common.tasks import send_email_user_mentions
+from common.tests.base import OrgTestCase
+from invoices.models import Invoice
+from invoices.tasks import send_email as send_invoice_email
+from leads.models import Lead
+from leads.tasks import send_email_to_assigned_user
+
+
+class FailOnceBackend(EmailBackend):
+    """locmem backend failing the first message to FAIL_FOR."""
+
+    FAIL_FOR = "notify1@test.com"
+    failed = False
+
+    def send_messages(self, messages):
+        if not FailOnceBackend.failed and self.FAIL_FOR in messages[0].to:
+            FailOnceBackend.failed = True
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        return super().send_messages(messages)
+
+
+class TestNotifications(OrgTestCase):
+    org_name = "Notify Org"
+
+    def setUp(self):
+        rate_limiter.clear()
+        self.addCleanup(rate_limiter.clear)
+        super().setUp()
+        self.profiles = [
+            self.create_profile(f"notify{i}@test.com", is_active=i < 3)
+            for i in range(4)
+        ]
+        self.lead = Lead.objects.create(
+            first_name="Ada", title="Big lead", org=self.org
+        )
+        self.recipients = [str(profile.id) for profile in self.profiles]
+
+    def test_assignment_emails(self):
+        result = send_email_to_assigned_user.apply(
+            (self.recipients, str(self.lead.id), str(self.org.id))
+        )
+
+        self.assertEqual(result.get(), 3)
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            ["notify0@test.com", "notify1@test.com", "notify2@test.com"],
+        )
+        self.assertIn("Big lead", mail.outbox[0].body)
+
+    @override_settings(
+        EMAIL_BACKEND="common.tests.test_notifications.FailOnceBackend",
+        NOTIFICATION_RETRY_BACKOFF=0,
+    )
+    def test_retry_sends_the_rest_once(self):
+        FailOnceBackend.failed = False
+
+        send_email_to_assigned_user.apply(
+            (self.recipients, str(self.lead.id), str(self.org.id))
+        )
+
+        self.assertTrue(FailOnceBackend.failed)
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            ["notify0@test.com", "notify1@test.com", "notify2@test.com"],
+        )
+
+    @override_settings(NOTIFICATION_RATE_LIMIT=2)
+    def test_rate_limit_per_org(self):
+        messages = {i: EmailMessage("Hi", "Body", to=[f"r{i}@test.com"]) for i in range(3)}
+
+        unsent, delay = send_messages(messages, self.org.id)
+        self.assertEqual(unsent, [2])
+        self.assertGreater(delay, 0)
+
+        unsent, _ = send_messages({0: messages[0]}, self.org.id)
+        self.assertEqual(unsent, [0])
+        unsent, _ = send_messages({0: messages[0]}, "another-org")
+        self.assertEqual(unsent, [])
+        self.assertEqual(len(mail.outbox), 3)
+
+    @override_settings(NOTIFICATION_RATE_LIMIT=1)
+    def test_deferred_invoice_mail_skips_accounts(self):
+        invoice = Invoice.objects.create(invoice_title="Q3", org=self.org)
+        invoice.accounts.add(
+            Account.objects.create(name="Acme", email="billing@acme.com", org=self.org)
+        )
+        args = (str(invoice.id), self.recipients[:3], str(self.org.id))
+
+        # The invoices app routes no URLs to reverse here
+        with patch("invoices.tasks.reverse", return_value="/invoices/"), patch.object(
+            send_invoice_email, "apply_async"
+        ) as deferred:
+            # Called, not applied: eager runs bypass the rate limit
+            send_invoice_email(*args)
+            while deferred.call_args:
+                rate_limiter.clear()
+                call = deferred.call_args
+                deferred.reset_mock()
+                send_invoice_email(*call.args[0], **call.args[1])
+
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            [
+                "billing@acme.com",
+                "notify0@test.com",
+                "notify1@test.com",
+                "notify2@test.com",
+            ],
+        )
+
+    def test_mentions(self):
+        self.profiles[2].handle = "Grace"
+        self.profiles[2].save()
+        comment = Comment.objects.create(
+            content_type=ContentType.objects.get_for_model(Lead),
+            object_id=self.lead.id,
+            comment="@notify0, @NOTIFY1 and @grace. cc @notify3 @nobody x@notify0",
+            commented_by=self.profiles[0],
+            org=self.org,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            result = send_email_user_mentions.apply(
+                (str(comment.id), "leads", str(self.org.id))
+            )
+
+        self.assertEqual(result.get(), 3)
+        self.assertEqual(
+            sorted(msg.to[0] for msg in mail.outbox),
+            ["notify0@test.com", "notify1@test.com", "notify2@test.com"],
+        )
+        self.assertEqual(mail.outbox[0].subject, "New comment on Lead. ")
+        profile_queries = [q for q in queries.captured_queries if '"profile"' in q["sql"]]
+        self.assertLessEqual(len(profile_queries), 3)
+
+    def test_parse_mentions(self):
+        self.assertEqual(
+            parse_mentions("Hi @Jane.Doe, @bob! mail jane@acme.com @jane.doe."),
+            ["jane.doe", "bob"],
+        )
+        self.assertEqual(self.profiles[0].handle, "notify0")
@@ -0,0 +1,78 @@
+"""
+Tests for the keyset (cursor) pagination of the CRM list views.
+
+Run with: pytest common/tests/test_pagination.py -v
+"""
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.models import Org, Profile, Teams, User
+from common.serializer import OrgAwareRefreshToken
+
+
+class TestCursorPagination(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Paging Org")
+        self.user = User.objects.create_user(
+            email="paging@test.com", password="testpass123"
+        )
+        Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+        self.teams = [
+            Teams.objects.create(name=f"Team {i}", description="", org=self.org)
+            for i in range(25)
+        ]
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def _get(self, **params):
+        response = self.client.get("/api/teams/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_walk_forward_and_back(self):
+        seen = []
+        data = self._get(pagination="cursor", page_size=10)
+        pages = [data]
+        while data["next_cursor"]:
+            data = self._get(cursor=data["next_cursor"], page_size=10)
+            pages.append(data)
+        for page in pages:
+            seen.extend(team["id"] for team in page["teams"])
+
+        self.assertEqual([len(page["teams"]) for page in pages], [10, 10, 5])
+        self.assertEqual(len(set(seen)), 25)
+        self.assertIsNone(pages[0]["previous_cursor"])
+        self.assertIsNone(pages[-1]["teams_count"])
+
+        previous = self._get(cursor=pages[-1]["previous_cursor"], page_size=10)
+        self.assertEqual(previous["teams"], pages[1]["teams"])
+
+    def test_page_size_is_capped(self):
+        Teams.objects.bulk_create(
+            [Teams(name=f"Bulk {i}", description="", org=self.org) for i in range(100)]
+        )
+
+        data = self._get(pagination="cursor", page_size=1000)
+
+        self.assertEqual(len(data["teams"]), 100)
+
+    def test_legacy_offset_shape(self):
+        data = self._get(offset=20)
+
+        self.assertEqual(data["teams_count"], 25)
+        self.assertEqual(len(data["teams"]), 5)
+        self.assertIsNone(data["offset"])
+
+        data = self._get(offset=0)
+        self.assertEqual(data["offset"], 10)
+        self.assertIsNotNone(data["next_cursor"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/api/teams/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
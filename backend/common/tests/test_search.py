@@ -0,0 +1,70 @@
+"""
+Tests for full-text `search` on the list views.
+
+Run with: pytest common/tests/test_search.py -v
+"""
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from common.models import Org, Profile, User
+from common.search import apply_search
+from common.serializer import OrgAwareRefreshToken
+from contacts.models import Contact
+from leads.models import Lead
+
+
+class TestSearch(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Search Org")
+        self.user = User.objects.create_user(
+            email="search@test.com", password="testpass123"
+        )
+        Profile.objects.create(user=self.user, org=self.org, role="ADMIN", is_active=True)
+        Lead.objects.create(
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@engines.io",
+            status="assigned",
+            org=self.org,
+        )
+        Lead.objects.create(
+            first_name="Charles",
+            last_name="Babbage",
+            company_name="Ada Engines",
+            phone="+44 20-7946-0958",
+            status="assigned",
+            org=self.org,
+        )
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def search_leads(self, search):
+        response = self.client.get("/api/leads/", {"search": search})
+        self.assertEqual(response.status_code, 200)
+        return [lead["first_name"] for lead in response.json()["open_leads"]["open_leads"]]
+
+    def test_ranked_prefix_match(self):
+        # Name (weight A) ranks above company (also A) + email (B)
+        self.assertEqual(self.search_leads("ada"), ["Ada", "Charles"])
+        self.assertEqual(self.search_leads("lovel"), ["Ada"])
+        self.assertEqual(self.search_leads("engines babb"), ["Charles"])
+
+    def test_email_and_phone_words(self):
+        self.assertEqual(self.search_leads("engines.io"), ["Ada"])
+        self.assertEqual(self.search_leads("7946 0958"), ["Charles"])
+        self.assertEqual(self.search_leads("@@"), [])
+
+    def test_index_is_usable(self):
+        Contact.objects.create(first_name="Grace", last_name="Hopper", org=self.org)
+        queryset = apply_search(Contact.objects.all(), "hop")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        self.assertIn("contact_search_idx", plan)
+        self.assertEqual([c.last_name for c in queryset], ["Hopper"])
@@ -0,0 +1,82 @@
+"""
+Tests for the pipeline snapshots and the trend endpoints.
+
+Run with: pytest common/tests/test_snapshots.py -v
+"""
+
+from datetime import date, timedelta
+
+from common.models import PipelineSnapshot
+from common.snapshots import snapshot_org, trend
+from common.tests.base import OrgTestCase
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+
+class TestPipelineSnapshots(OrgTestCase):
+    org_name = "Snapshot Org"
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.create_profile("snapshot-admin@test.com", role="ADMIN")
+        self.user = self.create_profile("snapshot-user@test.com")
+        self.deal = Opportunity.objects.create(
+            name="Deal", stage="PROSPECTING", amount=100, probability=50, org=self.org
+        )
+        self.deal.assigned_to.add(self.user)
+        Lead.objects.create(first_name="Lead", status="assigned", org=self.org)
+
+        self.monday = date(2026, 10, 12)
+        self.last_week = self.monday - timedelta(weeks=1)
+
+    def test_snapshot_rows(self):
+        snapshot_org(self.org, self.monday)
+        snapshot_org(self.org, self.monday)  # re-runs replace the day's rows
+
+        rows = PipelineSnapshot.objects.filter(org=self.org, date=self.monday)
+        org_row = rows.get(kind="opportunity", owner=None)
+        self.assertEqual((org_row.stage, org_row.count), ("PROSPECTING", 1))
+        self.assertEqual((org_row.amount, org_row.weighted_amount), (100, 50))
+        self.assertTrue(rows.filter(kind="opportunity", owner=self.user).exists())
+        self.assertEqual(rows.get(kind="lead", owner=None).stage, "assigned")
+
+    def test_trend_week_over_week(self):
+        snapshot_org(self.org, self.last_week)
+        Opportunity.objects.filter(pk=self.deal.pk).update(stage="CLOSED_WON")
+        snapshot_org(self.org, self.monday)
+
+        pipeline = trend(self.org, "pipeline", today=self.monday)
+        won = trend(self.org, "won", today=self.monday)
+
+        self.assertEqual([p["value"] for p in pipeline], [100, 0])
+        self.assertEqual(pipeline[1]["change"], -100)
+        self.assertEqual([p["value"] for p in won], [0, 100])
+        self.assertIsNone(won[0]["change"])
+        self.assertEqual(won[1]["change"], 100)
+
+    def test_trend_endpoint_scopes_non_admins(self):
+        snapshot_org(self.org)
+        Lead.objects.create(first_name="Other", org=self.org)
+        snapshot_org(self.org)
+
+        admin = self.client_for(self.admin).get("/api/dashboard/trends/leads/")
+        user = self.client_for(self.user).get("/api/dashboard/trends/leads/")
+
+        self.assertEqual(admin.status_code, 200)
+        self.assertEqual(admin.json()["points"][-1]["value"], 2)
+        self.assertEqual(user.json()["points"], [])
+
+    def test_unknown_metric(self):
+        response = self.client_for(self.admin).get("/api/dashboard/trends/nope/")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_owner(self):
+        client = self.client_for(self.admin)
+        for owner in ("abc", "00000000-0000-0000-0000-000000000000"):
+            response = client.get(
+                "/api/dashboard/trends/pipeline/", {"owner": owner}
+            )
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()["errors"], "Unknown owner")
@@ -0,0 +1,146 @@
+"""
+Tests for the compact list serializers and ?fields= / ?expand=.
+
+Run with: pytest common/tests/test_sparse_fields.py -v
+"""
+
+import re
+from pathlib import Path
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from common.models import Comment, Org, Profile, Tags, Teams, User
+from common.serializer import OrgAwareRefreshToken
+from contacts.models import Contact
+from leads.models import Lead
+
+
+LEADS_PAGE = (
+    Path(settings.BASE_DIR).parent / "frontend/src/routes/(app)/leads/+page.server.js"
+)
+
+
+class TestSparseFields(TestCase):
+    def setUp(self):
+        self.org = Org.objects.create(name="Sparse Org")
+        self.user = User.objects.create_user(
+            email="sparse@test.com", password="testpass123"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, org=self.org, role="ADMIN", is_active=True
+        )
+        self.team = Teams.objects.create(name="Sparse Team", org=self.org)
+        self.team.users.add(self.profile)
+        self.tag = Tags.objects.create(name="Sparse", org=self.org)
+        self.contact = Contact.objects.create(
+            first_name="Sparse", last_name="Contact", org=self.org
+        )
+        self.create_leads(3)
+
+        token = OrgAwareRefreshToken.for_user_and_org(self.user, self.org)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def create_leads(self, count):
+        for i in range(count):
+            lead = Lead.objects.create(
+                first_name="Sparse",
+                last_name=str(i),
+                status="assigned",
+                org=self.org,
+            )
+            lead.assigned_to.add(self.profile)
+            lead.teams.add(self.team)
+            lead.tags.add(self.tag)
+            lead.contacts.add(self.contact)
+        # BaseModel.save() takes created_by from the current request
+        Lead.objects.filter(org=self.org).update(created_by=self.user)
+
+    def get_leads(self, **params):
+        response = self.client.get("/api/leads/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["open_leads"]["open_leads"]
+
+    def test_compact_rows(self):
+        lead = self.get_leads()[0]
+
+        self.assertEqual(
+            lead["assigned_to"][0]["user_details"]["email"], "sparse@test.com"
+        )
+        self.assertNotIn("role", lead["assigned_to"][0])
+        self.assertEqual(
+            lead["teams"], [{"id": str(self.team.id), "name": "Sparse Team"}]
+        )
+        self.assertEqual(lead["contacts"][0]["first_name"], "Sparse")
+        self.assertEqual(lead["tags"][0]["name"], "Sparse")
+        self.assertEqual(lead["created_by"]["email"], "sparse@test.com")
+
+    def test_queries_do_not_grow_with_rows(self):
+        self.get_leads()
+        with CaptureQueriesContext(connection) as few:
+            self.get_leads()
+        self.create_leads(6)
+        with CaptureQueriesContext(connection) as more:
+            rows = self.get_leads()
+
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(len(more), len(few))
+
+    def test_fields(self):
+        lead = self.get_leads(fields="first_name,status")[0]
+
+        self.assertEqual(set(lead), {"id", "first_name", "status"})
+
+    def test_expand(self):
+        lead = self.get_leads(expand="assigned_to,teams")[0]
+
+        self.assertEqual(lead["assigned_to"][0]["role"], "ADMIN")
+        self.assertEqual(
+            lead["teams"][0]["users"][0]["user_details"]["email"], "sparse@test.com"
+        )
+        self.assertNotIn("org", lead["contacts"][0])
+
+    def test_comments_only_when_expanded(self):
+        lead = Lead.objects.filter(org=self.org).first()
+        Comment.objects.create(
+            content_type=ContentType.objects.get_for_model(Lead),
+            object_id=lead.id,
+            comment="Called back",
+            commented_by=self.profile,
+            org=self.org,
+        )
+
+        self.assertNotIn("lead_comments", self.get_leads()[0])
+        rows = {
+            row["id"]: row for row in self.get_leads(expand="lead_comments")
+        }
+        self.assertEqual(
+            [c["comment"] for c in rows[str(lead.id)]["lead_comments"]],
+            ["Called back"],
+        )
+        self.assertEqual(sum(len(row["lead_comments"]) for row in rows.values()), 1)
+
+        with CaptureQueriesContext(connection) as few:
+            self.get_leads(expand="lead_comments,lead_attachment")
+        self.create_leads(6)
+        with CaptureQueriesContext(connection) as more:
+            self.get_leads(expand="lead_comments,lead_attachment")
+        self.assertEqual(len(more), len(few))
+
+    @skipUnless(LEADS_PAGE.exists(), "frontend not checked out")
+    def test_rows_have_what_the_leads_page_reads(self):
+        source = LEADS_PAGE.read_text()
+        match = re.search(r"append\('expand', '([^']*)'\)", source)
+        expand = match.group(1) if match else ""
+        # updated_at falls back to created_at
+        read = set(re.findall(r"\blead\.([a-z_]+)", source)) - {"updated_at"}
+
+        lead = self.get_leads(expand=expand)[0]
+
+        self.assertEqual(read - set(lead), set())
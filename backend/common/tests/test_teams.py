@@ -0,0 +1,60 @@
+"""
+Tests for the set-based team membership propagation tasks.
+
+Run with: pytest common/tests/test_teams.py -v
+"""
+
+from django.test import override_settings
+
+from accounts.models import Account
+from common.models import Teams
+from common.tasks import remove_users, update_team_users
+from common.tests.base import OrgTestCase
+from common.visibility import filter_visible
+from leads.models import Lead
+from opportunity.models import Opportunity
+
+
+@override_settings(TEAM_PROPAGATION_CHUNK_SIZE=2)
+class TestTeamPropagation(OrgTestCase):
+    org_name = "Team Org"
+
+    def setUp(self):
+        super().setUp()
+        self.members = [self.create_profile(f"member{i}@test.com") for i in range(2)]
+        self.team = Teams.objects.create(name="Sales", description="", org=self.org)
+        self.team.users.add(*self.members)
+
+        self.leads = [
+            Lead.objects.create(first_name=f"Lead {i}", org=self.org) for i in range(5)
+        ]
+        self.opportunity = Opportunity.objects.create(name="Deal", org=self.org)
+        self.account = Account.objects.create(name="Acme", org=self.org)
+        for record in [*self.leads, self.opportunity, self.account]:
+            record.teams.add(self.team)
+        self.leads[0].assigned_to.add(self.members[0])
+
+    def test_update_team_users(self):
+        updated_at = self.leads[1].updated_at
+        result = update_team_users.apply((str(self.team.id), str(self.org.id)))
+
+        self.assertEqual(result.state, "SUCCESS")
+        for member in self.members:
+            self.assertEqual(member.lead_assigned_users.count(), 5)
+            self.assertEqual(member.opportunity_assigned_users.count(), 1)
+            self.assertEqual(filter_visible(Lead.objects.all(), member).count(), 5)
+        self.assertEqual(self.account.assigned_to.count(), 2)
+        # Reassigned records get a new ETag (common.conditional)
+        self.leads[1].refresh_from_db()
+        self.assertGreater(self.leads[1].updated_at, updated_at)
+
+    def test_remove_users(self):
+        update_team_users.apply((str(self.team.id), str(self.org.id)))
+
+        remove_users.apply(
+            ([str(self.members[0].id)], str(self.team.id), str(self.org.id))
+        )
+
+        self.assertEqual(self.members[0].lead_assigned_users.count(), 0)
+        self.assertEqual(filter_visible(Lead.objects.all(), self.members[0]).count(), 0)
+        self.assertEqual(self.members[1].lead_assigned_users.count(), 5)
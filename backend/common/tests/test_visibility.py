@@ -0,0 +1,83 @@
+"""
+Tests for the precomputed record visibility of non-admin users.
+
+Run with: pytest common/tests/test_visibility.py -v
+"""
+
+from crum import impersonate
+
+from common.models import RecordVisibility
+from common.tests.base import OrgTestCase
+from common.visibility import filter_visible, sync_visibility
+from leads.models import Lead
+
+
+class TestRecordVisibility(OrgTestCase):
+    org_name = "Visibility Org"
+
+    def setUp(self):
+        super().setUp()
+        self.profile = self.create_profile("visibility@test.com")
+        self.user = self.profile.user
+        self.other = self.create_profile("other@test.com")
+
+        with impersonate(self.user):
+            self.created = Lead.objects.create(
+                first_name="Own", last_name="Lead", org=self.org
+            )
+        self.assigned = Lead.objects.create(
+            first_name="Assigned", last_name="Lead", org=self.org
+        )
+        self.assigned.assigned_to.add(self.profile)
+        self.hidden = Lead.objects.create(
+            first_name="Hidden", last_name="Lead", org=self.org
+        )
+        self.hidden.assigned_to.add(self.other)
+
+        self.client = self.client_for(self.profile)
+
+    def visible(self, profile):
+        return sorted(
+            filter_visible(Lead.objects.all(), profile).values_list(
+                "first_name", flat=True
+            )
+        )
+
+    def test_created_and_assigned_records_are_visible(self):
+        self.assertEqual(self.visible(self.profile), ["Assigned", "Own"])
+        self.assertEqual(self.visible(self.other), ["Hidden"])
+
+    def test_list_view_uses_visibility(self):
+        response = self.client.get("/api/leads/")
+
+        self.assertEqual(response.status_code, 200)
+        leads = response.json()["open_leads"]["open_leads"]
+        self.assertEqual(
+            sorted(lead["first_name"] for lead in leads), ["Assigned", "Own"]
+        )
+
+    def test_assignment_changes_update_rows(self):
+        self.hidden.assigned_to.add(self.profile)
+        self.assertIn("Hidden", self.visible(self.profile))
+
+        self.assigned.assigned_to.remove(self.profile)
+        self.assertNotIn("Assigned", self.visible(self.profile))
+
+        self.profile.lead_assigned_users.clear()
+        self.assertEqual(self.visible(self.profile), ["Own"])
+
+    def test_delete_removes_rows(self):
+        self.assigned.delete()
+
+        self.assertFalse(
+            RecordVisibility.objects.filter(object_id=self.assigned.pk).exists()
+        )
+
+    def test_sync_after_bulk_write(self):
+        through = Lead.assigned_to.through
+        through.objects.create(lead=self.hidden, profile=self.profile)
+        self.assertNotIn("Hidden", self.visible(self.profile))
+
+        sync_visibility(Lead, [self.hidden.pk])
+
+        self.assertIn("Hidden", self.visible(self.profile))
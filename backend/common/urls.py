@@ -9,8 +9,13 @@ from common.views.auth_views import (
     OrgSwitchView,
     RegisterView,
 )
-from common.views.dashboard_views import ActivityListView, ApiHomeView
+from common.views.dashboard_views import (
+    ActivityListView,
+    ApiHomeView,
+    PipelineTrendView,
+)
 from common.views.document_views import DocumentDetailView, DocumentListView
+from common.views.meta_views import MetaLookupsView, MetaView
 from common.views.organization_views import (
     OrgProfileCreateView,
     OrgUpdateView,
@@ -33,6 +38,9 @@ app_name = "api_common"
 
 urlpatterns = [
     path("dashboard/", ApiHomeView.as_view()),
+    path("dashboard/trends/<str:metric>/", PipelineTrendView.as_view()),
+    path("meta/", MetaView.as_view(), name="meta"),
+    path("meta/lookups/", MetaLookupsView.as_view(), name="meta_lookups"),
     # JWT Authentication endpoints for SvelteKit integration
     path("auth/login/", LoginView.as_view(), name="login"),
     path("auth/register/", RegisterView.as_view(), name="register"),
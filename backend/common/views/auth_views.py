@@ -11,10 +11,10 @@ from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from common import serializer
+from common.external_auth import OrgAwareJWTAuthentication
 from common.models import Org, Profile, User
 from common.serializer import OrgAwareRefreshToken
 
@@ -286,8 +286,9 @@ class MeView(APIView):
     Get current authenticated user details
     """
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [OrgAwareJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    org_context_required = False
 
     @extend_schema(
         description="Get current authenticated user with organizations",
@@ -408,8 +409,9 @@ class OrgSwitchView(APIView):
     organization and issues new tokens with the org_id claim.
     """
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [OrgAwareJWTAuthentication]
     permission_classes = [IsAuthenticated]
+    org_context_required = False
 
     @extend_schema(
         description="Switch to a different organization and get new JWT tokens",
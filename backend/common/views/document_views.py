@@ -3,14 +3,15 @@ from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, inline_serializer
 
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.utils import json
 from rest_framework.views import APIView
 
 from common import swagger_params
+from common.facets import facet_counts
 from common.models import Document, Profile, Teams
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from common.serializer import (
     DocumentCreateSerializer,
@@ -21,7 +22,7 @@ from common.serializer import (
 )
 
 
-class DocumentListView(APIView, LimitOffsetPagination):
+class DocumentListView(APIView, CRMListPagination):
     permission_classes = (IsAuthenticated, HasOrgContext)
     model = Document
 
@@ -73,44 +74,47 @@ class DocumentListView(APIView, LimitOffsetPagination):
             search = True
         context["search"] = search
 
+        # Bucket counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(
+                queryset,
+                buckets={"active": Q(status="active"), "inactive": Q(status="inactive")},
+            )
+        context["facets"] = facets
+
         queryset_documents_active = queryset.filter(status="active")
-        results_documents_active = self.paginate_queryset(
-            queryset_documents_active.distinct(), self.request, view=self
+        results_documents_active, page = self.paginate_list(
+            queryset_documents_active.distinct(),
+            self.request,
+            "documents_active",
+            count=facets["buckets"]["active"] if facets else None,
         )
         documents_active = DocumentSerializer(results_documents_active, many=True).data
-        if results_documents_active:
-            offset = queryset_documents_active.filter(
-                id__gte=results_documents_active[-1].id
-            ).count()
-            if offset == queryset_documents_active.count():
-                offset = None
-        else:
-            offset = 0
         context["documents_active"] = {
-            "documents_active_count": self.count,
+            "documents_active_count": page["count"],
             "documents_active": documents_active,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         queryset_documents_inactive = queryset.filter(status="inactive")
-        results_documents_inactive = self.paginate_queryset(
-            queryset_documents_inactive.distinct(), self.request, view=self
+        results_documents_inactive, page = self.paginate_list(
+            queryset_documents_inactive.distinct(),
+            self.request,
+            "documents_inactive",
+            count=facets["buckets"]["inactive"] if facets else None,
         )
         documents_inactive = DocumentSerializer(
             results_documents_inactive, many=True
         ).data
-        if results_documents_inactive:
-            offset = queryset_documents_inactive.filter(
-                id__gte=results_documents_active[-1].id
-            ).count()
-            if offset == queryset_documents_inactive.count():
-                offset = None
-        else:
-            offset = 0
         context["documents_inactive"] = {
-            "documents_inactive_count": self.count,
+            "documents_inactive_count": page["count"],
             "documents_inactive": documents_inactive,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         context["users"] = ProfileSerializer(profiles, many=True).data
@@ -120,13 +124,15 @@ class DocumentListView(APIView, LimitOffsetPagination):
     @extend_schema(
         tags=["documents"],
         operation_id="documents_list",
-        parameters=swagger_params.document_get_params,
+        parameters=swagger_params.document_get_params
+        + swagger_params.cursor_pagination_params,
         responses={200: inline_serializer(
             name="DocumentListResponse",
             fields={
                 "search": serializers.BooleanField(),
                 "documents_active": serializers.DictField(),
                 "documents_inactive": serializers.DictField(),
+                "facets": serializers.DictField(allow_null=True),
                 "users": ProfileSerializer(many=True),
                 "status_choices": serializers.ListField(),
             }
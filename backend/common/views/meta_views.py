@@ -0,0 +1,61 @@
+from django.conf import settings
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from common.conditional import make_etag, not_modified, set_validators
+from common.meta import org_lookups, static_bundle
+from common.permissions import HasOrgContext
+
+# A ?v=<version> URL always returns the same content
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class MetaView(APIView):
+    """Static choice lists (see common.meta). Public and cacheable."""
+
+    authentication_classes = []
+    permission_classes = (AllowAny,)
+    org_context_required = False
+
+    @extend_schema(
+        tags=["Meta"],
+        operation_id="meta_retrieve",
+        parameters=[OpenApiParameter("v", OpenApiTypes.STR, OpenApiParameter.QUERY)],
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+    )
+    def get(self, request, *args, **kwargs):
+        data, etag = static_bundle()
+        if request.query_params.get("v") == data["version"]:
+            cache_control = IMMUTABLE
+        else:
+            max_age = getattr(settings, "META_CACHE_MAX_AGE", 3600)
+            cache_control = f"public, max-age={max_age}"
+        if not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        return set_validators(response, etag, cache_control)
+
+
+class MetaLookupsView(APIView):
+    """Per-org lookup lists (see common.meta), revalidated on every use."""
+
+    permission_classes = (IsAuthenticated, HasOrgContext)
+
+    @extend_schema(
+        tags=["Meta"],
+        operation_id="meta_lookups_retrieve",
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+    )
+    def get(self, request, *args, **kwargs):
+        data = org_lookups(request.profile)
+        etag = make_etag(data)
+        if not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        return set_validators(response, etag, "private, no-cache")
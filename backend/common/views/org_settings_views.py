@@ -15,6 +15,7 @@ class OrgSettingsView(APIView):
     """
 
     permission_classes = (IsAuthenticated,)
+    org_context_required = False
 
     def get(self, request):
         """Get current organization settings."""
@@ -7,9 +7,9 @@ from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from common import serializer, swagger_params
+from common.external_auth import OrgAwareJWTAuthentication
 from common.models import Org, Profile
 from common.serializer import (
     CreateProfileSerializer,
@@ -22,6 +22,7 @@ from common.serializer import (
 
 class OrgProfileCreateView(APIView):
     permission_classes = (IsAuthenticated,)
+    org_context_required = False
 
     model1 = Org
     model2 = Profile
@@ -90,6 +91,7 @@ class OrgUpdateView(APIView):
     """
 
     permission_classes = (IsAuthenticated,)
+    org_context_required = False
 
     @extend_schema(
         operation_id="org_update",
@@ -297,7 +299,7 @@ class ProfileDetailView(APIView):
     Requires org header
     """
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [OrgAwareJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
@@ -1,13 +1,13 @@
 from drf_spectacular.utils import extend_schema, inline_serializer
 
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from common import swagger_params
 from common.models import Profile, Teams
+from common.pagination import CRMListPagination
 from common.serializer import (
     TeamCreateSerializer,
     TeamsSerializer,
@@ -16,7 +16,7 @@ from common.serializer import (
 from common.tasks import remove_users, update_team_users
 
 
-class TeamsListView(APIView, LimitOffsetPagination):
+class TeamsListView(APIView, CRMListPagination):
     model = Teams
     permission_classes = (IsAuthenticated,)
 
@@ -34,34 +34,38 @@ class TeamsListView(APIView, LimitOffsetPagination):
                 queryset = queryset.filter(users__id__in=params.get("assigned_users"))
 
         context = {}
-        results_teams = self.paginate_queryset(
-            queryset.distinct(), self.request, view=self
+        results_teams, page = self.paginate_list(
+            queryset.distinct(), self.request, "teams"
         )
         teams = TeamsSerializer(results_teams, many=True).data
-        if results_teams:
-            offset = queryset.filter(id__gte=results_teams[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
-        context.update({"teams_count": self.count, "offset": offset})
+        context.update(
+            {
+                "teams_count": page["count"],
+                "offset": page["offset"],
+                "next_cursor": page["next_cursor"],
+                "previous_cursor": page["previous_cursor"],
+            }
+        )
         context["teams"] = teams
         return context
 
     @extend_schema(
         tags=["Teams"],
         operation_id="teams_list",
-        parameters=swagger_params.teams_list_get_params,
+        parameters=swagger_params.teams_list_get_params
+        + swagger_params.cursor_pagination_params,
         responses={200: inline_serializer(
             name="TeamsListResponse",
             fields={
                 "per_page": serializers.IntegerField(),
                 "page_number": serializers.ListField(),
-                "teams_count": serializers.IntegerField(),
+                "teams_count": serializers.IntegerField(allow_null=True),
                 "offset": serializers.IntegerField(allow_null=True),
+                "next_cursor": serializers.CharField(allow_null=True),
+                "previous_cursor": serializers.CharField(allow_null=True),
                 "teams": TeamsSerializer(many=True),
             }
         )},
@@ -170,8 +174,7 @@ class TeamsDetailView(APIView):
             )
         params = request.data
         self.team = self.get_object(pk)
-        actual_users = self.team.get_users()
-        removed_users = []
+        actual_users = set(self.team.users.values_list("id", flat=True))
         serializer = TeamCreateSerializer(
             data=params, instance=self.team, request_obj=request
         )
@@ -187,11 +190,13 @@ class TeamsDetailView(APIView):
                 if profiles:
                     team_obj.users.add(*profiles)
             update_team_users.delay(pk, str(request.profile.org.id))
-            latest_users = team_obj.get_users()
-            for user in actual_users:
-                if user not in latest_users:
-                    removed_users.append(user)
-            remove_users.delay(removed_users, pk, str(request.profile.org.id))
+            removed_users = actual_users - set(
+                team_obj.users.values_list("id", flat=True)
+            )
+            if removed_users:
+                remove_users.delay(
+                    [str(i) for i in removed_users], pk, str(request.profile.org.id)
+                )
             return Response(
                 {"error": False, "message": "Team Updated Successfully"},
                 status=status.HTTP_200_OK,
@@ -1,10 +1,10 @@
 from django.conf import settings
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema, inline_serializer
 
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -12,7 +12,9 @@ from rest_framework.views import APIView
 from cases.models import Case
 from cases.serializer import CaseSerializer
 from common import swagger_params
+from common.facets import facet_counts
 from common.models import Profile, Teams
+from common.pagination import CRMListPagination
 from common.serializer import (
     BillingAddressSerializer,
     CommentSerializer,
@@ -59,7 +61,7 @@ class GetTeamsAndUsersView(APIView):
         return Response(data)
 
 
-class UsersListView(APIView, LimitOffsetPagination):
+class UsersListView(APIView, CRMListPagination):
 
     permission_classes = (IsAuthenticated,)
 
@@ -119,12 +121,14 @@ class UsersListView(APIView, LimitOffsetPagination):
 
     @extend_schema(
         tags=["users"],
-        parameters=swagger_params.user_list_params,
+        parameters=swagger_params.user_list_params
+        + swagger_params.cursor_pagination_params,
         responses={200: inline_serializer(
             name="UsersListResponse",
             fields={
                 "active_users": serializers.DictField(),
                 "inactive_users": serializers.DictField(),
+                "facets": serializers.DictField(allow_null=True),
                 "admin_email": serializers.CharField(),
                 "roles": serializers.ListField(),
                 "status": serializers.ListField(),
@@ -155,42 +159,46 @@ class UsersListView(APIView, LimitOffsetPagination):
                 queryset = queryset.filter(is_active=params.get("status"))
 
         context = {}
+        # Bucket and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(
+                queryset,
+                buckets={"active": Q(is_active=True), "inactive": Q(is_active=False)},
+                fields=["role"],
+            )
+        context["facets"] = facets
+
         queryset_active_users = queryset.filter(is_active=True)
-        results_active_users = self.paginate_queryset(
-            queryset_active_users.distinct(), self.request, view=self
+        results_active_users, page = self.paginate_list(
+            queryset_active_users.distinct(),
+            self.request,
+            "active_users",
+            count=facets["buckets"]["active"] if facets else None,
         )
         active_users = ProfileSerializer(results_active_users, many=True).data
-        if results_active_users:
-            offset = queryset_active_users.filter(
-                id__gte=results_active_users[-1].id
-            ).count()
-            if offset == queryset_active_users.count():
-                offset = None
-        else:
-            offset = 0
         context["active_users"] = {
-            "active_users_count": self.count,
+            "active_users_count": page["count"],
             "active_users": active_users,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         queryset_inactive_users = queryset.filter(is_active=False)
-        results_inactive_users = self.paginate_queryset(
-            queryset_inactive_users.distinct(), self.request, view=self
+        results_inactive_users, page = self.paginate_list(
+            queryset_inactive_users.distinct(),
+            self.request,
+            "inactive_users",
+            count=facets["buckets"]["inactive"] if facets else None,
         )
         inactive_users = ProfileSerializer(results_inactive_users, many=True).data
-        if results_inactive_users:
-            offset = queryset_inactive_users.filter(
-                id__gte=results_inactive_users[-1].id
-            ).count()
-            if offset == queryset_inactive_users.count():
-                offset = None
-        else:
-            offset = 0
         context["inactive_users"] = {
-            "inactive_users_count": self.count,
+            "inactive_users_count": page["count"],
             "inactive_users": inactive_users,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         context["admin_email"] = settings.ADMIN_EMAIL
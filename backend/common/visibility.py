@@ -0,0 +1,119 @@
+"""
+Record visibility for non-admin users.
+
+A non-admin sees the leads, contacts, accounts, opportunities, cases and
+tasks they created or are assigned to. Checking that per query is an OR
+across the assigned_to join plus DISTINCT, which defeats the indexes for
+users with large books. Instead, RecordVisibility holds one row per
+(profile, record) and the list queries become one indexed semi-join:
+
+    WHERE id IN (SELECT object_id FROM record_visibility
+                 WHERE profile_id = ... AND content_type_id = ...)
+
+Rows are recomputed per record (sync_visibility) from the change points:
+assigned_to changes (m2m_changed, which also covers team propagation),
+record creation, a creator's profile joining the org, and deletion.
+Bulk writes that bypass signals must call sync_visibility themselves.
+
+Usage:
+    from common.visibility import filter_visible
+
+    if profile.role != "ADMIN" and not profile.is_admin:
+        queryset = filter_visible(queryset, profile)
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+# Models whose visibility is tracked (creator + assigned_to)
+VISIBILITY_MODELS = (
+    "leads.Lead",
+    "contacts.Contact",
+    "accounts.Account",
+    "opportunity.Opportunity",
+    "cases.Case",
+    "tasks.Task",
+)
+
+
+def filter_visible(queryset, profile):
+    """Rows of queryset that profile created or is assigned to."""
+    from common.models import RecordVisibility
+
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    return queryset.filter(
+        pk__in=RecordVisibility.objects.filter(
+            profile=profile, content_type=content_type
+        ).values("object_id")
+    )
+
+
+def visibility_rows(model, ids):
+    """(org_id, profile_id, object_id) rows that records ids of model need."""
+    from common.models import Profile
+
+    creator = Profile.objects.filter(
+        user_id=OuterRef("created_by_id"), org_id=OuterRef("org_id")
+    ).values("pk")[:1]
+    rows = set(
+        model._default_manager.filter(pk__in=ids, created_by__isnull=False)
+        .annotate(creator=Subquery(creator))
+        .exclude(creator=None)
+        .values_list("org_id", "creator", "pk")
+    )
+
+    field = model._meta.get_field("assigned_to")
+    record, profile = field.m2m_field_name(), field.m2m_reverse_field_name()
+    rows.update(
+        field.remote_field.through.objects.filter(**{f"{record}__in": ids})
+        .values_list(f"{record}__org_id", f"{profile}_id", f"{record}_id")
+    )
+    return rows
+
+
+def sync_visibility(model, ids):
+    """
+    Recompute the RecordVisibility rows of records ids of model.
+
+    Set-based: one query per source, then one delete and one insert for
+    the difference.
+    """
+    from common.models import RecordVisibility
+
+    ids = list(ids)
+    if not ids:
+        return
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        wanted = visibility_rows(model, ids)
+        existing = {
+            (org_id, profile_id, object_id): pk
+            for pk, org_id, profile_id, object_id in RecordVisibility.objects.filter(
+                content_type=content_type, object_id__in=ids
+            ).values_list("pk", "org_id", "profile_id", "object_id")
+        }
+        stale = [pk for row, pk in existing.items() if row not in wanted]
+        if stale:
+            RecordVisibility.objects.filter(pk__in=stale).delete()
+        RecordVisibility.objects.bulk_create(
+            [
+                RecordVisibility(
+                    org_id=org_id,
+                    profile_id=profile_id,
+                    content_type=content_type,
+                    object_id=object_id,
+                )
+                for org_id, profile_id, object_id in wanted - existing.keys()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def clear_visibility(model, ids):
+    """Remove the RecordVisibility rows of deleted records."""
+    from common.models import RecordVisibility
+
+    RecordVisibility.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id__in=ids
+    ).delete()
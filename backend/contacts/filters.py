@@ -0,0 +1,22 @@
+from common.filters import (
+    ContainsFilter,
+    Filter,
+    FilterSet,
+    RelatedFilter,
+    SearchFilter,
+)
+from contacts.models import Contact
+
+
+class ContactFilterSet(FilterSet):
+    model = Contact
+
+    name = ContainsFilter("first_name")
+    city = ContainsFilter("city")
+    phone = ContainsFilter("phone")
+    email = ContainsFilter("email")
+    assigned_to = RelatedFilter("assigned_to")
+    tags = RelatedFilter("tags")
+    search = SearchFilter()
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
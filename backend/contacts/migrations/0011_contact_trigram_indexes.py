@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contacts", "0010_contact_contact_search_idx"),
+    ]
+
+    operations = [
+        add_trigram_indexes("contacts.Contact", ("first_name", "email", "phone", "city")),
+    ]
@@ -3,15 +3,27 @@ from django.utils.translation import gettext_lazy as _
 
 from common.base import AssignableMixin, BaseModel
 from common.models import Org, Profile, Tags, Teams
+from common.search import search_index
 from common.utils import COUNTRIES
 
 
+# Columns of the full-text `search` by weight (common.search)
+CONTACT_SEARCH_FIELDS = {
+    "A": ("first_name", "last_name", "organization"),
+    "B": ("email", "phone"),
+}
+
+
 class Contact(AssignableMixin, BaseModel):
     """
     Contact model for CRM - Streamlined for modern sales workflow
     Based on Twenty CRM and Salesforce patterns
     """
 
+    SEARCH_FIELDS = CONTACT_SEARCH_FIELDS
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("first_name", "email", "phone", "city")
+
     # Core Contact Information
     first_name = models.CharField(_("First name"), max_length=255)
     last_name = models.CharField(_("Last name"), max_length=255)
@@ -69,6 +81,7 @@ class Contact(AssignableMixin, BaseModel):
         ordering = ("-created_at",)
         indexes = [
             models.Index(fields=["org", "-created_at"]),
+            search_index(CONTACT_SEARCH_FIELDS, "contact_search_idx"),
         ]
 
     def __str__(self):
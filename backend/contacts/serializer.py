@@ -1,11 +1,19 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from common.serializer import (
+    ATTACHMENT_RELATION,
+    ORG_RELATION,
+    PROFILE_RELATION,
+    TEAM_RELATION,
     AttachmentsSerializer,
     OrganizationSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
 )
+from common.sparse_fields import Relation, SparseFieldsMixin, SparseListSerializer
 from contacts.models import Contact
 
 
@@ -61,6 +69,70 @@ class ContactSerializer(serializers.ModelSerializer):
         )
 
 
+class ContactListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Contact for list rows (see common.sparse_fields)"""
+
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    contact_attachment = AttachmentsSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Contact
+        list_serializer_class = SparseListSerializer
+        fields = (
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "phone",
+            "organization",
+            "title",
+            "department",
+            "do_not_call",
+            "linkedin_url",
+            "address_line",
+            "city",
+            "state",
+            "postcode",
+            "country",
+            "assigned_to",
+            "teams",
+            "tags",
+            "description",
+            "created_by",
+            "created_at",
+            "is_active",
+            "org",
+            "account",
+            "contact_attachment",
+        )
+        relations = {
+            "assigned_to": PROFILE_RELATION,
+            "teams": TEAM_RELATION,
+            "org": ORG_RELATION,
+            "contact_attachment": ATTACHMENT_RELATION,
+        }
+
+
+class ContactSummarySerializer(serializers.ModelSerializer):
+    """Compact contact for the list rows of other entities"""
+
+    class Meta:
+        model = Contact
+        fields = ("id", "first_name", "last_name", "email")
+
+
+CONTACT_RELATION = Relation(
+    Contact.objects.only("id", "first_name", "last_name", "email"),
+    expanded=ContactSerializer,
+    expanded_queryset=Contact.objects.select_related("org").prefetch_related(
+        Prefetch("assigned_to", queryset=PROFILE_RELATION.expanded_queryset),
+        Prefetch("teams", queryset=TEAM_RELATION.expanded_queryset),
+        "tags",
+    ),
+)
+
+
 class CreateContactSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating Contact data"""
 
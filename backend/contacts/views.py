@@ -1,28 +1,32 @@
 import json
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema, inline_serializer
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from rest_framework.views import APIView
 
+from common.conditional import conditional_detail
+from common.meta import include_reference_data
 from common.models import Attachments, Comment, Profile, Tags, Teams
 from common.serializer import AttachmentsSerializer, CommentSerializer
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
 from common.utils import COUNTRIES
+from common.visibility import filter_visible
 from contacts import swagger_params
+from contacts.filters import ContactFilterSet
 from contacts.models import Contact, Profile
 from contacts.serializer import *
 from contacts.tasks import send_email_to_assigned_user
 from tasks.serializer import TaskSerializer
 
 
-class ContactsListView(APIView, LimitOffsetPagination):
+class ContactsListView(APIView, CRMListPagination):
     permission_classes = (IsAuthenticated, HasOrgContext)
     model = Contact
 
@@ -32,60 +36,33 @@ class ContactsListView(APIView, LimitOffsetPagination):
             "-id"
         )
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
-            queryset = queryset.filter(
-                Q(assigned_to__in=[self.request.profile])
-                | Q(created_by=self.request.profile.user)
-            ).distinct()
-
-        if params:
-            if params.get("name"):
-                queryset = queryset.filter(first_name__icontains=params.get("name"))
-            if params.get("city"):
-                queryset = queryset.filter(address__city__icontains=params.get("city"))
-            if params.get("phone"):
-                queryset = queryset.filter(phone__icontains=params.get("phone"))
-            if params.get("email"):
-                queryset = queryset.filter(email__icontains=params.get("email"))
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.get("assigned_to")
-                ).distinct()
-            if params.get("tags"):
-                queryset = queryset.filter(tags__id__in=params.getlist("tags")).distinct()
-            if params.get("search"):
-                search = params.get("search")
-                queryset = queryset.filter(
-                    Q(first_name__icontains=search)
-                    | Q(last_name__icontains=search)
-                    | Q(email__icontains=search)
-                    | Q(phone__icontains=search)
-                )
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
+            queryset = filter_visible(queryset, self.request.profile)
+
+        queryset = ContactFilterSet(params, queryset).filter_queryset()
 
         context = {}
-        results_contact = self.paginate_queryset(
-            queryset.distinct(), self.request, view=self
+        options = ContactListSerializer.sparse_options(self.request)
+        results_contact, page = self.paginate_list(
+            ContactListSerializer.setup_queryset(queryset, **options),
+            self.request,
+            "contacts",
         )
-        contacts = ContactSerializer(results_contact, many=True).data
-        if results_contact:
-            offset = queryset.filter(id__gte=results_contact[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        contacts = ContactListSerializer(results_contact, many=True, **options).data
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
         # Standard DRF pagination format for frontend compatibility
-        context["count"] = self.count
+        context["count"] = page["count"]
         context["results"] = contacts
+        context["next_cursor"] = page["next_cursor"]
+        context["previous_cursor"] = page["previous_cursor"]
         # Legacy format for backwards compatibility
-        context["contacts_count"] = self.count
-        context["offset"] = offset
+        context["contacts_count"] = page["count"]
+        context["offset"] = page["offset"]
         context["contact_obj_list"] = contacts
+        if not include_reference_data(self.request):
+            return context
+
         context["countries"] = COUNTRIES
         users = Profile.objects.filter(
             is_active=True, org=self.request.profile.org
@@ -97,18 +74,22 @@ class ContactsListView(APIView, LimitOffsetPagination):
     @extend_schema(
         operation_id="contacts_list",
         tags=["contacts"],
-        parameters=swagger_params.contact_list_get_params,
+        parameters=swagger_params.contact_list_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
         responses={
             200: inline_serializer(
                 name="ContactListResponse",
                 fields={
-                    "count": serializers.IntegerField(),
-                    "results": ContactSerializer(many=True),
+                    "count": serializers.IntegerField(allow_null=True),
+                    "results": ContactListSerializer(many=True),
+                    "next_cursor": serializers.CharField(allow_null=True),
+                    "previous_cursor": serializers.CharField(allow_null=True),
                     "per_page": serializers.IntegerField(),
                     "page_number": serializers.IntegerField(),
-                    "contacts_count": serializers.IntegerField(),
+                    "contacts_count": serializers.IntegerField(allow_null=True),
                     "offset": serializers.IntegerField(allow_null=True),
-                    "contact_obj_list": ContactSerializer(many=True),
+                    "contact_obj_list": ContactListSerializer(many=True),
                 },
             )
         },
@@ -314,6 +295,14 @@ class ContactDetailView(APIView):
             )
         },
     )
+    @conditional_detail(
+        Contact,
+        related=[
+            ("tasks.Task", "contacts"),
+            ("common.Tags", "contact_tags"),
+            ("common.Profile", "contact_assigned_users"),
+        ],
+    )
     def get(self, request, pk, format=None):
         context = {}
         contact_obj = self.get_object(pk)
@@ -369,7 +358,8 @@ class ContactDetailView(APIView):
             "postcode": contact_obj.postcode,
             "country": contact_obj.country,
         }
-        context["countries"] = COUNTRIES
+        if include_reference_data(request):
+            context["countries"] = COUNTRIES
         contact_content_type = ContentType.objects.get_for_model(Contact)
         comments = Comment.objects.filter(
             content_type=contact_content_type,
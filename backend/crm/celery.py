@@ -19,3 +19,5 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+# The tasks app keeps its tasks in celery_tasks.py
+app.autodiscover_tasks(["tasks"], related_name="celery_tasks")
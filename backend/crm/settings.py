@@ -1,8 +1,10 @@
 import os
 from datetime import timedelta
 
+from celery.schedules import crontab
 from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
+from kombu import Queue
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,8 +55,14 @@ MIDDLEWARE = [
     "crum.CurrentRequestUserMiddleware",
     "common.middleware.get_company.GetProfileAndOrg",
     "common.middleware.rls_context.RequireOrgContext",  # RLS: Enforce org context + set PostgreSQL session variable
+    "common.middleware.activity.ActivityBatchMiddleware",  # After RequireOrgContext
 ]
 
+# How RequireOrgContext applies app.current_org: "session" (set + reset per
+# request) or "transaction" (SET LOCAL inside a per-request transaction,
+# safe behind transaction-mode poolers such as PgBouncer).
+RLS_CONTEXT_MODE = os.environ.get("RLS_CONTEXT_MODE", "session")
+
 ROOT_URLCONF = "crm.urls"
 
 TEMPLATES = [
@@ -144,6 +152,77 @@ ADMIN_EMAIL = os.environ["ADMIN_EMAIL"]
 # celery Tasks
 CELERY_BROKER_URL = os.environ["CELERY_BROKER_URL"]
 CELERY_RESULT_BACKEND = os.environ["CELERY_RESULT_BACKEND"]
+# Queues, so that bulk work never delays the emails a user is waiting for.
+# Give each its own workers, e.g.
+#   celery -A crm worker -Q email,celery --prefetch-multiplier 4
+#   celery -A crm worker -Q bulk_email --prefetch-multiplier 1 -c 8
+#   celery -A crm worker -Q imports,maintenance --prefetch-multiplier 1 -c 2
+# (a worker without -Q consumes all of them).
+CELERY_TASK_QUEUES = (
+    Queue("celery"),  # anything not routed
+    Queue("email"),  # transactional: account, assignment and mention emails
+    Queue("bulk_email"),  # account email campaigns
+    Queue("imports"),  # file imports
+    Queue("maintenance"),  # periodic and bookkeeping jobs
+)
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+# Priorities 0 (first) to 9 within a queue; redis emulates them with one
+# list per step
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+CELERY_TASK_ROUTES = {
+    "common.tasks.send_email_to_new_user": {"queue": "email", "priority": 0},
+    "common.tasks.resend_activation_link_to_user": {"queue": "email", "priority": 0},
+    "common.tasks.send_email_user_status": {"queue": "email", "priority": 1},
+    "common.tasks.send_email_user_delete": {"queue": "email", "priority": 1},
+    "common.tasks.send_email_user_mentions": {"queue": "email", "priority": 3},
+    "invoices.tasks.send_invoice_email": {"queue": "email", "priority": 2},
+    "invoices.tasks.send_invoice_email_cancel": {"queue": "email", "priority": 2},
+    "accounts.tasks.send_email": {"queue": "bulk_email"},
+    "accounts.tasks.send_email_chunk": {"queue": "bulk_email"},
+    "accounts.tasks.send_scheduled_emails": {"queue": "maintenance", "priority": 1},
+    "leads.tasks.create_lead_from_file": {"queue": "imports"},
+    "common.tasks.remove_users": {"queue": "maintenance"},
+    "common.tasks.update_team_users": {"queue": "maintenance"},
+    "common.tasks.write_security_audit_logs": {"queue": "maintenance"},
+    "common.tasks.snapshot_pipelines": {"queue": "maintenance", "priority": 7},
+    "invoices.tasks.create_invoice_history": {"queue": "maintenance"},
+    # Assignment notifications and the other send_email tasks
+    "*.send_*": {"queue": "email", "priority": 3},
+}
+# Tasks safe to run twice are acknowledged after they finish, so a lost
+# worker's task is redelivered instead of dropped. The others (emails
+# without a sent log, imports) keep the early ack: no duplicates.
+CELERY_TASK_ANNOTATIONS = {
+    name: {"acks_late": True, "reject_on_worker_lost": True}
+    for name in (
+        "accounts.tasks.send_email",
+        "accounts.tasks.send_email_chunk",
+        "accounts.tasks.send_scheduled_emails",
+        "common.tasks.remove_users",
+        "common.tasks.update_team_users",
+        "common.tasks.snapshot_pipelines",
+    )
+}
+# Periodic tasks (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    "snapshot-pipelines": {
+        "task": "common.tasks.snapshot_pipelines",
+        "schedule": crontab(
+            hour=int(os.environ.get("PIPELINE_SNAPSHOT_HOUR", "23")), minute=30
+        ),
+    },
+    "send-scheduled-emails": {
+        "task": "accounts.tasks.send_scheduled_emails",
+        "schedule": int(os.environ.get("SCHEDULED_EMAIL_POLL_SECONDS", "60")),
+    },
+}
+# Due scheduled account emails claimed per org by each dispatcher run
+SCHEDULED_EMAIL_BATCH_SIZE = int(os.environ.get("SCHEDULED_EMAIL_BATCH_SIZE", "100"))
 
 
 LOGGING = {
@@ -227,7 +306,7 @@ SETTINGS_EXPORT = ["APPLICATION_NAME"]
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "common.external_auth.OrgAwareJWTAuthentication",
         "common.external_auth.APIKeyAuthentication",
         # "rest_framework.authentication.SessionAuthentication",
         # "rest_framework.authentication.BasicAuthentication",
@@ -328,6 +407,57 @@ SIMPLE_JWT = {
 # it is needed in custome middlewere to get the user from the token
 JWT_ALGO = "HS256"
 
+# Per-process cache of (user, org) memberships used by GetProfileAndOrg.
+# Set MEMBERSHIP_CACHE_TTL=0 to disable.
+MEMBERSHIP_CACHE_TTL = int(os.environ.get("MEMBERSHIP_CACHE_TTL", "60"))
+MEMBERSHIP_CACHE_MAX_SIZE = int(os.environ.get("MEMBERSHIP_CACHE_MAX_SIZE", "10000"))
+# Short-lived per-process cache of resolved org API keys. 0 disables.
+API_KEY_CACHE_TTL = int(os.environ.get("API_KEY_CACHE_TTL", "30"))
+API_KEY_CACHE_MAX_SIZE = int(os.environ.get("API_KEY_CACHE_MAX_SIZE", "1000"))
+# Per-process cache of /api/dashboard/ summaries. The TTL bounds how stale a
+# summary can be after a change made in another process. 0 disables.
+DASHBOARD_CACHE_TTL = int(os.environ.get("DASHBOARD_CACHE_TTL", "60"))
+DASHBOARD_CACHE_MAX_SIZE = int(os.environ.get("DASHBOARD_CACHE_MAX_SIZE", "1000"))
+# Rows in each "recent" list of the dashboard
+DASHBOARD_RECENT_LIMIT = int(os.environ.get("DASHBOARD_RECENT_LIMIT", "10"))
+# Exchange rates (common.fx): default file of `manage.py load_fx_rates`, and
+# how long each process caches the rate table
+FX_RATES_FILE = os.environ.get(
+    "FX_RATES_FILE", os.path.join(BASE_DIR, "fx_rates.json")
+)
+FX_RATE_CACHE_TTL = int(os.environ.get("FX_RATE_CACHE_TTL", "300"))
+# Records per bulk statement when team membership is propagated (common.teams)
+TEAM_PROPAGATION_CHUNK_SIZE = int(os.environ.get("TEAM_PROPAGATION_CHUNK_SIZE", "1000"))
+# Notification emails (common.notifications): emails per org and minute in
+# each worker process (0 disables), and the retries of a failed send, the
+# first after NOTIFICATION_RETRY_BACKOFF seconds and doubling from there
+NOTIFICATION_RATE_LIMIT = int(os.environ.get("NOTIFICATION_RATE_LIMIT", "100"))
+NOTIFICATION_MAX_RETRIES = int(os.environ.get("NOTIFICATION_MAX_RETRIES", "5"))
+NOTIFICATION_RETRY_BACKOFF = int(os.environ.get("NOTIFICATION_RETRY_BACKOFF", "30"))
+# Account email campaigns (accounts.tasks.send_email): recipients per
+# subtask, and subtasks of one campaign running at the same time
+ACCOUNT_EMAIL_CHUNK_SIZE = int(os.environ.get("ACCOUNT_EMAIL_CHUNK_SIZE", "200"))
+ACCOUNT_EMAIL_CONCURRENCY = int(os.environ.get("ACCOUNT_EMAIL_CONCURRENCY", "4"))
+# Seconds after which a recipient claimed by a campaign subtask that never
+# finished may be claimed by another one
+ACCOUNT_EMAIL_CLAIM_TIMEOUT = int(os.environ.get("ACCOUNT_EMAIL_CLAIM_TIMEOUT", "900"))
+
+# Security audit log sink: "buffered" (batched by a background thread),
+# "celery" (batches handed to a task) or "sync" (one INSERT per event).
+AUDIT_LOG_SINK = os.environ.get("AUDIT_LOG_SINK", "buffered")
+AUDIT_LOG_BATCH_SIZE = int(os.environ.get("AUDIT_LOG_BATCH_SIZE", "100"))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.environ.get("AUDIT_LOG_FLUSH_INTERVAL", "2"))
+AUDIT_LOG_MAX_QUEUE = int(os.environ.get("AUDIT_LOG_MAX_QUEUE", "10000"))
+
+# Whether list/detail responses still embed the reference data served by
+# /api/meta/ (choice lists, org tags/users/contacts/...). Clients can
+# override per request with ?reference_data=true|false.
+API_INCLUDE_REFERENCE_DATA = (
+    os.environ.get("API_INCLUDE_REFERENCE_DATA", "True").lower() == "true"
+)
+# max-age of the static /api/meta/ bundle (a ?v=<version> URL is immutable)
+META_CACHE_MAX_AGE = int(os.environ.get("META_CACHE_MAX_AGE", "3600"))
+
 
 DOMAIN_NAME = os.environ["DOMAIN_NAME"]
 SWAGGER_ROOT_URL = os.environ["SWAGGER_ROOT_URL"]
@@ -12,12 +12,14 @@ from drf_spectacular.views import (
 )
 from rest_framework import permissions
 
+from common.middleware.route_policy import org_context_exempt
+
 app_name = "crm"
 
 urlpatterns = [
     url(
         r"^healthz/$",
-        TemplateView.as_view(template_name="healthz.html"),
+        org_context_exempt(TemplateView.as_view(template_name="healthz.html")),
         name="healthz",
     ),
     path("api/", include("common.app_urls", namespace="common_urls")),
@@ -25,16 +27,16 @@ urlpatterns = [
         "logout/", views.LogoutView.as_view(), {"next_page": "/login/"}, name="logout"
     ),
     path("admin/", admin.site.urls),
-    path("schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("schema/", org_context_exempt(SpectacularAPIView.as_view()), name="schema"),
     # Optional UI:
     path(
         "swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        org_context_exempt(SpectacularSwaggerView.as_view(url_name="schema")),
         name="swagger-ui",
     ),
     path(
         "api/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        org_context_exempt(SpectacularRedocView.as_view(url_name="schema")),
         name="redoc",
     ),
 ]
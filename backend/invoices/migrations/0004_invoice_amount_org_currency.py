@@ -0,0 +1,22 @@
+# Generated by Django 4.2.27 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0003_add_currency_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='total_amount_org_currency',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['org', 'status'], include=('total_amount_org_currency',), name='invoice_org_status_amt_idx'),
+        ),
+    ]
@@ -43,6 +43,10 @@ class Invoice(BaseModel):
     total_amount = models.DecimalField(
         blank=True, null=True, max_digits=12, decimal_places=2
     )
+    # total_amount in the org's default currency (common.fx)
+    total_amount_org_currency = models.DecimalField(
+        blank=True, null=True, max_digits=14, decimal_places=2, editable=False
+    )
     tax = models.DecimalField(blank=True, null=True, max_digits=12, decimal_places=2)
     currency = models.CharField(
         max_length=3, choices=CURRENCY_CODES, blank=True, null=True
@@ -69,6 +73,14 @@ class Invoice(BaseModel):
         verbose_name_plural = "Invoices"
         db_table = "invoice"
         ordering = ("-created_at",)
+        indexes = [
+            # Revenue sums by status from the index alone
+            models.Index(
+                fields=["org", "status"],
+                include=["total_amount_org_currency"],
+                name="invoice_org_status_amt_idx",
+            ),
+        ]
 
     def __str__(self):
         """Unicode representation of Invoice."""
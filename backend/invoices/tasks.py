@@ -1,74 +1,74 @@
-from celery import Celery
+import logging
+
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.shortcuts import reverse
 from django.template.loader import render_to_string
 
 from common.models import User
+from common.notifications import notify_profiles, render_messages, send_messages
 from common.tasks import set_rls_context
+from crm.celery import app
 from invoices.models import Invoice, InvoiceHistory
 
-app = Celery("redis://")
+logger = logging.getLogger(__name__)
 
 
-@app.task
-def send_email(invoice_id, recipients, org_id, domain="demo.django-crm.io", protocol="http"):
+@app.task(bind=True)
+def send_email(
+    self,
+    invoice_id,
+    recipients,
+    org_id,
+    domain="demo.django-crm.io",
+    protocol="http",
+    accounts_sent=False,
+):
+    """
+    Send Mail To assigned Profiles and open accounts when an invoice is shared.
+
+    Deferred calls and retries for the profiles left get accounts_sent=True.
+    """
     set_rls_context(org_id)
-    invoice = Invoice.objects.filter(id=invoice_id).first()
+    invoice = Invoice.objects.select_related("created_by").filter(id=invoice_id).first()
     if not invoice:
-        return
-    created_by = invoice.created_by
-    for user in recipients:
-        recipients_list = []
-        user = User.objects.filter(id=user, is_active=True).first()
-        if user:
-            recipients_list.append(user.email)
-            subject = "Shared an invoice with you."
-            context = {}
-            context["invoice_title"] = invoice.invoice_title
-            context["invoice_id"] = invoice_id
-            context["invoice_created_by"] = invoice.created_by
-            context["url"] = (
-                protocol
-                + "://"
-                + domain
-                + reverse("invoices:invoice_details", args=(invoice.id,))
-            )
-
-            context["user"] = user
-            html_content = render_to_string(
-                "assigned_to_email_template.html", context=context
-            )
-            msg = EmailMessage(subject=subject, body=html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
-    recipients = invoice.accounts.filter(status="open")
-    if recipients.count() > 0:
-        subject = "Shared an invoice with you."
-        context = {}
-        context["invoice_title"] = invoice.invoice_title
-        context["invoice_id"] = invoice_id
-        context["invoice_created_by"] = invoice.created_by
-        context["url"] = (
+        return 0
+    subject = "Shared an invoice with you."
+    template_name = "assigned_to_email_template.html"
+    context = {
+        "invoice_title": invoice.invoice_title,
+        "invoice_id": invoice_id,
+        "invoice_created_by": invoice.created_by,
+        "url": (
             protocol
             + "://"
             + domain
             + reverse("invoices:invoice_details", args=(invoice.id,))
+        ),
+    }
+    if not accounts_sent:
+        # Accounts are mailed once, outside the rate limit
+        emails = {
+            account.email: account.email
+            for account in invoice.accounts.filter(is_active=True)
+            if account.email
+        }
+        unsent, _ = send_messages(
+            render_messages(subject, template_name, context, emails),
+            org_id,
+            rate_limited=False,
         )
-        for recipient in recipients:
-            context["user"] = recipient.email
-            html_content = render_to_string(
-                "assigned_to_email_template.html", context=context
-            )
-            msg = EmailMessage(
-                subject=subject,
-                body=html_content,
-                to=[
-                    recipient.email,
-                ],
-            )
-            msg.content_subtype = "html"
-            msg.send()
+        if unsent:
+            logger.warning("Invoice %s not sent to accounts %s", invoice_id, unsent)
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        subject,
+        template_name,
+        context,
+        follow_up={"accounts_sent": True},
+    )
 
 
 @app.task
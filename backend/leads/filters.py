@@ -0,0 +1,27 @@
+from common.filters import (
+    ContainsFilter,
+    Filter,
+    FilterSet,
+    RelatedFilter,
+    SearchFilter,
+)
+from leads.models import Lead
+
+
+class LeadFilterSet(FilterSet):
+    model = Lead
+
+    name = ContainsFilter("first_name", "last_name")
+    salutation = ContainsFilter("salutation")
+    source = Filter("source")
+    assigned_to = RelatedFilter("assigned_to")
+    status = Filter("status")
+    tags = RelatedFilter("tags")
+    city = ContainsFilter("city")
+    email = ContainsFilter("email")
+    rating = Filter("rating")
+    search = SearchFilter()
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
+    close_date__gte = Filter("close_date", "gte")
+    close_date__lte = Filter("close_date", "lte")
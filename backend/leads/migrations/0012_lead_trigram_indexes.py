@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0011_lead_lead_search_idx"),
+    ]
+
+    operations = [
+        add_trigram_indexes("leads.Lead", ("first_name", "last_name", "email", "city")),
+    ]
@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 
 from common.base import AssignableMixin, BaseModel
 from common.models import Org, Profile, Tags, Teams
+from common.search import search_index
 from common.utils import (
     COUNTRIES,
     CURRENCY_CODES,
@@ -20,12 +21,23 @@ from contacts.models import Contact
 # - Removed 'created_on_arrow' property (frontend computes its own timestamps)
 
 
+# Columns of the full-text `search` by weight (common.search)
+LEAD_SEARCH_FIELDS = {
+    "A": ("first_name", "last_name", "company_name"),
+    "B": ("email", "phone"),
+}
+
+
 class Lead(AssignableMixin, BaseModel):
     """
     Lead model for CRM - Streamlined for modern sales workflow
     Based on Twenty CRM and Salesforce patterns
     """
 
+    SEARCH_FIELDS = LEAD_SEARCH_FIELDS
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("first_name", "last_name", "email", "city")
+
     # Core Lead Information
     title = models.CharField(
         _("Title"), max_length=255, blank=True, null=True,
@@ -68,6 +80,10 @@ class Lead(AssignableMixin, BaseModel):
     opportunity_amount = models.DecimalField(
         _("Deal Value"), decimal_places=2, max_digits=12, blank=True, null=True
     )
+    # opportunity_amount in the org's default currency (common.fx)
+    opportunity_amount_org_currency = models.DecimalField(
+        decimal_places=2, max_digits=14, blank=True, null=True, editable=False
+    )
     currency = models.CharField(
         _("Currency"), max_length=3, choices=CURRENCY_CODES, blank=True, null=True
     )
@@ -112,6 +128,13 @@ class Lead(AssignableMixin, BaseModel):
             models.Index(fields=["status"]),
             models.Index(fields=["source"]),
             models.Index(fields=["org", "-created_at"]),
+            # Forecast sums by status from the index alone
+            models.Index(
+                fields=["org", "status"],
+                include=["opportunity_amount_org_currency", "probability"],
+                name="lead_org_status_amt_idx",
+            ),
+            search_index(LEAD_SEARCH_FIELDS, "lead_search_idx"),
         ]
 
     def __str__(self):
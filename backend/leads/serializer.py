@@ -2,15 +2,28 @@ from rest_framework import serializers
 
 from accounts.models import Account
 from common.serializer import (
+    ATTACHMENT_RELATION,
+    COMMENT_RELATION,
+    PROFILE_RELATION,
+    TAG_RELATION,
+    TEAM_RELATION,
+    USER_RELATION,
     AttachmentsSerializer,
     LeadCommentSerializer,
     OrganizationSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TagsSerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
     UserSerializer,
 )
-from contacts.serializer import ContactSerializer
+from common.sparse_fields import SparseFieldsMixin, SparseListSerializer
+from contacts.serializer import (
+    CONTACT_RELATION,
+    ContactSerializer,
+    ContactSummarySerializer,
+)
 from leads.models import Lead
 
 
@@ -72,6 +85,69 @@ class LeadSerializer(serializers.ModelSerializer):
         )
 
 
+class LeadListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Lead for list rows (see common.sparse_fields)"""
+
+    contacts = ContactSummarySerializer(read_only=True, many=True)
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    created_by = UserSerializer(read_only=True)
+    tags = TagsSerializer(read_only=True, many=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    lead_attachment = AttachmentsSerializer(read_only=True, many=True)
+    lead_comments = LeadCommentSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Lead
+        list_serializer_class = SparseListSerializer
+        fields = (
+            "id",
+            "title",
+            "salutation",
+            "first_name",
+            "last_name",
+            "email",
+            "phone",
+            "job_title",
+            "website",
+            "linkedin_url",
+            "status",
+            "source",
+            "industry",
+            "rating",
+            "opportunity_amount",
+            "currency",
+            "probability",
+            "close_date",
+            "address_line",
+            "city",
+            "state",
+            "postcode",
+            "country",
+            "assigned_to",
+            "teams",
+            "last_contacted",
+            "next_follow_up",
+            "description",
+            "contacts",
+            "lead_attachment",
+            "lead_comments",
+            "tags",
+            "created_by",
+            "created_at",
+            "is_active",
+            "company_name",
+        )
+        relations = {
+            "contacts": CONTACT_RELATION,
+            "assigned_to": PROFILE_RELATION,
+            "created_by": USER_RELATION,
+            "tags": TAG_RELATION,
+            "teams": TEAM_RELATION,
+            "lead_attachment": ATTACHMENT_RELATION,
+            "lead_comments": COMMENT_RELATION,
+        }
+
+
 class LeadCreateSerializer(serializers.ModelSerializer):
     probability = serializers.IntegerField(
         max_value=100, required=False, allow_null=True
@@ -1,18 +1,17 @@
 import re
 
-from celery import Celery
 from django.conf import settings
-from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives
 from django.db.models import Q
 from django.template.loader import render_to_string
 
 from accounts.models import Account
 from common.models import Org, Profile
+from common.notifications import notify_profiles
 from common.tasks import set_rls_context
+from crm.celery import app
 from leads.models import Lead
 
-app = Celery("redis://")
-
 
 def get_rendered_html(template_name, context={}):
     html_content = render_to_string(template_name, context)
@@ -45,61 +44,48 @@ def send_email(
     email.send()
 
 
-@app.task
-def send_lead_assigned_emails(lead_id, new_assigned_to_list, site_address, org_id):
+@app.task(bind=True)
+def send_lead_assigned_emails(self, lead_id, recipients, site_address, org_id):
     set_rls_context(org_id)
     lead_instance = Lead.objects.filter(
         ~Q(status="converted"), pk=lead_id, is_active=True
     ).first()
-    if not (lead_instance and new_assigned_to_list):
+    if not (lead_instance and recipients):
         return False
 
-    users = Profile.objects.filter(id__in=new_assigned_to_list).distinct()
-    subject = "Lead '%s' has been assigned to you" % lead_instance
-    from_email = settings.DEFAULT_FROM_EMAIL
-    template_name = "assigned_to/leads_assigned.html"
-
-    url = site_address
-    url += "/leads/" + str(lead_instance.id) + "/view/"
-
-    context = {
-        "lead_instance": lead_instance,
-        "lead_detail_url": url,
-    }
-    mail_kwargs = {"subject": subject, "from_email": from_email}
-    for profile in users:
-        if profile.user.email:
-            context["user"] = profile.user
-            html_content = get_rendered_html(template_name, context)
-            mail_kwargs["html_content"] = html_content
-            mail_kwargs["recipients"] = [profile.user.email]
-            send_email.delay(**mail_kwargs)
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        "Lead '%s' has been assigned to you" % lead_instance,
+        "assigned_to/leads_assigned.html",
+        {
+            "lead": lead_instance,
+            "url": site_address + "/leads/" + str(lead_instance.id) + "/view/",
+        },
+    )
 
 
-@app.task
-def send_email_to_assigned_user(recipients, lead_id, org_id, source=""):
+@app.task(bind=True)
+def send_email_to_assigned_user(self, recipients, lead_id, org_id, source=""):
     """Send Mail To Users When they are assigned to a lead"""
     set_rls_context(org_id)
-    lead = Lead.objects.get(id=lead_id)
-    created_by = lead.created_by
-    for user in recipients:
-        recipients_list = []
-        profile = Profile.objects.filter(id=user, is_active=True).first()
-        if profile:
-            recipients_list.append(profile.user.email)
-            context = {}
-            context["url"] = settings.DOMAIN_NAME
-            context["user"] = profile.user
-            context["lead"] = lead
-            context["created_by"] = created_by
-            context["source"] = source
-            subject = "Assigned a lead for you. "
-            html_content = render_to_string(
-                "assigned_to/leads_assigned.html", context=context
-            )
-            msg = EmailMessage(subject, html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
+    lead = Lead.objects.select_related("created_by").filter(id=lead_id).first()
+    if not lead:
+        return 0
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        "Assigned a lead for you. ",
+        "assigned_to/leads_assigned.html",
+        {
+            "url": settings.DOMAIN_NAME,
+            "lead": lead,
+            "created_by": lead.created_by,
+            "source": source,
+        },
+    )
 
 
 @app.task
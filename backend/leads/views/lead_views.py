@@ -3,12 +3,15 @@ from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.conditional import conditional_detail
+from common.facets import facet_counts
+from common.meta import include_reference_data
 from common.models import Attachments, Comment, Profile, Tags, Teams, User
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from common.serializer import (
     AttachmentsSerializer,
@@ -17,21 +20,25 @@ from common.serializer import (
     ProfileSerializer,
     TeamsSerializer,
 )
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
 from common.utils import COUNTRIES, INDCHOICES, LEAD_SOURCE, LEAD_STATUS
+from common.visibility import filter_visible
 from contacts.models import Contact
 from leads import swagger_params
+from leads.filters import LeadFilterSet
 from leads.models import Lead
 from leads.serializer import (
     LeadCreateSerializer,
     LeadCreateSwaggerSerializer,
     LeadDetailEditSwaggerSerializer,
+    LeadListSerializer,
     LeadSerializer,
     TagsSerializer,
 )
 from leads.tasks import send_email_to_assigned_user
 
 
-class LeadListView(APIView, LimitOffsetPagination):
+class LeadListView(APIView, CRMListPagination):
     model = Lead
     permission_classes = (IsAuthenticated, HasOrgContext)
 
@@ -47,89 +54,63 @@ class LeadListView(APIView, LimitOffsetPagination):
             )
         ).order_by("-id")
         if self.request.profile.role != "ADMIN" and not self.request.user.is_superuser:
-            queryset = queryset.filter(
-                Q(assigned_to__in=[self.request.profile])
-                | Q(created_by=self.request.profile.user)
-            )
+            queryset = filter_visible(queryset, self.request.profile)
+
+        queryset = LeadFilterSet(params, queryset).filter_queryset()
 
-        if params:
-            if params.get("name"):
-                queryset = queryset.filter(
-                    Q(first_name__icontains=params.get("name"))
-                    & Q(last_name__icontains=params.get("name"))
-                )
-            if params.get("salutation"):
-                queryset = queryset.filter(salutation__icontains=params.get("salutation"))
-            if params.get("source"):
-                queryset = queryset.filter(source=params.get("source"))
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.get("assigned_to")
-                )
-            if params.get("status"):
-                queryset = queryset.filter(status=params.get("status"))
-            if params.get("tags"):
-                queryset = queryset.filter(tags__in=params.get("tags"))
-            if params.get("city"):
-                queryset = queryset.filter(city__icontains=params.get("city"))
-            if params.get("email"):
-                queryset = queryset.filter(email__icontains=params.get("email"))
-            if params.get("rating"):
-                queryset = queryset.filter(rating=params.get("rating"))
-            if params.get("search"):
-                search = params.get("search")
-                queryset = queryset.filter(
-                    Q(first_name__icontains=search)
-                    | Q(last_name__icontains=search)
-                    | Q(company_name__icontains=search)
-                    | Q(email__icontains=search)
-                )
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
-            if params.get("close_date__gte"):
-                queryset = queryset.filter(close_date__gte=params.get("close_date__gte"))
-            if params.get("close_date__lte"):
-                queryset = queryset.filter(close_date__lte=params.get("close_date__lte"))
         context = {}
+        # Bucket and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(
+                queryset,
+                buckets={"open": ~Q(status="closed"), "close": Q(status="closed")},
+                fields=["status", "source", "rating"],
+            )
+        context["facets"] = facets
+
+        options = LeadListSerializer.sparse_options(self.request)
+        queryset = LeadListSerializer.setup_queryset(queryset, **options)
         queryset_open = queryset.exclude(status="closed")
-        results_leads_open = self.paginate_queryset(
-            queryset_open.distinct(), self.request, view=self
+        results_leads_open, page = self.paginate_list(
+            queryset_open,
+            self.request,
+            "open_leads",
+            count=facets["buckets"]["open"] if facets else None,
         )
-        open_leads = LeadSerializer(results_leads_open, many=True).data
-        if results_leads_open:
-            offset = queryset_open.filter(id__gte=results_leads_open[-1].id).count()
-            if offset == queryset_open.count():
-                offset = None
-        else:
-            offset = 0
+        open_leads = LeadListSerializer(results_leads_open, many=True, **options).data
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
         context["open_leads"] = {
-            "leads_count": self.count,
+            "leads_count": page["count"],
             "open_leads": open_leads,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
 
         queryset_close = queryset.filter(status="closed")
-        results_leads_close = self.paginate_queryset(
-            queryset_close.distinct(), self.request, view=self
+        results_leads_close, page = self.paginate_list(
+            queryset_close,
+            self.request,
+            "close_leads",
+            count=facets["buckets"]["close"] if facets else None,
         )
-        close_leads = LeadSerializer(results_leads_close, many=True).data
-        if results_leads_close:
-            offset = queryset_close.filter(id__gte=results_leads_close[-1].id).count()
-            if offset == queryset_close.count():
-                offset = None
-        else:
-            offset = 0
+        close_leads = LeadListSerializer(
+            results_leads_close, many=True, **options
+        ).data
 
         context["close_leads"] = {
-            "leads_count": self.count,
+            "leads_count": page["count"],
             "close_leads": close_leads,
-            "offset": offset,
+            "offset": page["offset"],
+            "next_cursor": page["next_cursor"],
+            "previous_cursor": page["previous_cursor"],
         }
+        if not include_reference_data(self.request):
+            return context
+
         contacts = Contact.objects.filter(org=self.request.profile.org).values(
             "id", "first_name"
         )
@@ -152,7 +133,9 @@ class LeadListView(APIView, LimitOffsetPagination):
     @extend_schema(
         tags=["Leads"],
         operation_id="leads_list",
-        parameters=swagger_params.lead_list_get_params,
+        parameters=swagger_params.lead_list_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
         responses={
             200: inline_serializer(
                 name="LeadListResponse",
@@ -161,6 +144,7 @@ class LeadListView(APIView, LimitOffsetPagination):
                     "page_number": serializers.IntegerField(),
                     "open_leads": serializers.DictField(),
                     "close_leads": serializers.DictField(),
+                    "facets": serializers.DictField(allow_null=True),
                     "contacts": serializers.ListField(),
                     "status": serializers.ListField(),
                     "source": serializers.ListField(),
@@ -379,12 +363,13 @@ class LeadDetailView(APIView):
         context["users_excluding_team"] = ProfileSerializer(
             users_excluding_team, many=True
         ).data
-        context["source"] = LEAD_SOURCE
-        context["status"] = LEAD_STATUS
-        context["teams"] = TeamsSerializer(
-            Teams.objects.filter(org=self.request.profile.org), many=True
-        ).data
-        context["countries"] = COUNTRIES
+        if include_reference_data(self.request):
+            context["source"] = LEAD_SOURCE
+            context["status"] = LEAD_STATUS
+            context["teams"] = TeamsSerializer(
+                Teams.objects.filter(org=self.request.profile.org), many=True
+            ).data
+            context["countries"] = COUNTRIES
 
         return context
 
@@ -412,6 +397,14 @@ class LeadDetailView(APIView):
             )
         },
     )
+    @conditional_detail(
+        Lead,
+        related=[
+            ("contacts.Contact", "lead_contacts"),
+            ("common.Tags", "lead_tags"),
+            ("common.Profile", "lead_assigned_users"),
+        ],
+    )
     def get(self, request, pk, **kwargs):
         self.lead_obj = self.get_object(pk)
         context = self.get_context_data(**kwargs)
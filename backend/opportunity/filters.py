@@ -0,0 +1,26 @@
+from common.filters import (
+    ContainsFilter,
+    Filter,
+    FilterSet,
+    RelatedFilter,
+    SearchFilter,
+)
+from opportunity.models import Opportunity
+
+
+class OpportunityFilterSet(FilterSet):
+    model = Opportunity
+
+    name = ContainsFilter("name")
+    account = Filter("account")
+    stage = Filter("stage")
+    lead_source = Filter("lead_source")
+    tags = RelatedFilter("tags")
+    assigned_to = RelatedFilter("assigned_to")
+    search = SearchFilter()
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
+    closed_on__gte = Filter("closed_on", "gte")
+    closed_on__lte = Filter("closed_on", "lte")
+    amount__gte = Filter("amount", "gte")
+    amount__lte = Filter("amount", "lte")
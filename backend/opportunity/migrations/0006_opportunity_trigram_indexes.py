@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("opportunity", "0005_opportunity_opportunity_search_idx"),
+    ]
+
+    operations = [
+        add_trigram_indexes("opportunity.Opportunity", ("name",)),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.27 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opportunity', '0006_opportunity_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='opportunity',
+            name='amount_org_currency',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='opportunity',
+            index=models.Index(fields=['org', 'stage'], include=('amount_org_currency', 'probability'), name='opportunity_org_stage_amt_idx'),
+        ),
+    ]
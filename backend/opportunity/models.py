@@ -6,16 +6,25 @@ from django.utils.translation import pgettext_lazy
 from accounts.models import Account
 from common.base import AssignableMixin, BaseModel
 from common.models import Org, Profile, Tags, Teams
+from common.search import search_index
 from common.utils import CURRENCY_CODES, OPPORTUNITY_TYPES, SOURCES, STAGES
 from contacts.models import Contact
 
 
+# Columns of the full-text `search` by weight (common.search)
+OPPORTUNITY_SEARCH_FIELDS = {"A": ("name",)}
+
+
 class Opportunity(AssignableMixin, BaseModel):
     """
     Opportunity model for CRM - Sales pipeline management
     Based on Twenty CRM and Salesforce patterns
     """
 
+    SEARCH_FIELDS = OPPORTUNITY_SEARCH_FIELDS
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("name",)
+
     # Core Opportunity Information
     name = models.CharField(_("Opportunity Name"), max_length=255)
     account = models.ForeignKey(
@@ -39,6 +48,10 @@ class Opportunity(AssignableMixin, BaseModel):
     amount = models.DecimalField(
         _("Amount"), decimal_places=2, max_digits=12, blank=True, null=True
     )
+    # amount in the org's default currency (common.fx)
+    amount_org_currency = models.DecimalField(
+        decimal_places=2, max_digits=14, blank=True, null=True, editable=False
+    )
     probability = models.IntegerField(
         _("Probability (%)"), default=0, blank=True, null=True
     )
@@ -87,6 +100,13 @@ class Opportunity(AssignableMixin, BaseModel):
         indexes = [
             models.Index(fields=["stage"]),
             models.Index(fields=["org", "-created_at"]),
+            # Pipeline sums by stage from the index alone
+            models.Index(
+                fields=["org", "stage"],
+                include=["amount_org_currency", "probability"],
+                name="opportunity_org_stage_amt_idx",
+            ),
+            search_index(OPPORTUNITY_SEARCH_FIELDS, "opportunity_search_idx"),
         ]
 
     def __str__(self):
@@ -1,16 +1,32 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from accounts.serializer import AccountSerializer
+from accounts.serializer import (
+    ACCOUNT_RELATION,
+    AccountSerializer,
+    AccountSummarySerializer,
+)
 from common.serializer import (
+    ORG_RELATION,
+    PROFILE_RELATION,
+    TAG_RELATION,
+    TEAM_RELATION,
+    USER_RELATION,
     AttachmentsSerializer,
     OrganizationSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TagsSerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
     UserSerializer,
 )
-from contacts.serializer import ContactSerializer
+from common.sparse_fields import SparseFieldsMixin
+from contacts.serializer import (
+    CONTACT_RELATION,
+    ContactSerializer,
+    ContactSummarySerializer,
+)
 from opportunity.models import Opportunity
 
 
@@ -70,6 +86,59 @@ class OpportunitySerializer(serializers.ModelSerializer):
         )
 
 
+class OpportunityListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Opportunity for list rows (see common.sparse_fields)"""
+
+    account = AccountSummarySerializer(read_only=True)
+    closed_by = ProfileSummarySerializer(read_only=True)
+    created_by = UserSerializer(read_only=True)
+    tags = TagsSerializer(read_only=True, many=True)
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    contacts = ContactSummarySerializer(read_only=True, many=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    created_on_arrow = serializers.SerializerMethodField()
+
+    @extend_schema_field(str)
+    def get_created_on_arrow(self, obj):
+        return obj.created_on_arrow
+
+    class Meta:
+        model = Opportunity
+        fields = (
+            "id",
+            "name",
+            "account",
+            "stage",
+            "opportunity_type",
+            "currency",
+            "amount",
+            "probability",
+            "closed_on",
+            "lead_source",
+            "contacts",
+            "assigned_to",
+            "teams",
+            "closed_by",
+            "tags",
+            "description",
+            "created_by",
+            "created_at",
+            "is_active",
+            "org",
+            "created_on_arrow",
+        )
+        relations = {
+            "account": ACCOUNT_RELATION,
+            "closed_by": PROFILE_RELATION,
+            "created_by": USER_RELATION,
+            "tags": TAG_RELATION,
+            "assigned_to": PROFILE_RELATION,
+            "contacts": CONTACT_RELATION,
+            "teams": TEAM_RELATION,
+            "org": ORG_RELATION,
+        }
+
+
 class OpportunityCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating Opportunity data"""
 
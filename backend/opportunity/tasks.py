@@ -1,36 +1,27 @@
-from celery import Celery
 from django.conf import settings
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
 
-from common.models import Profile
+from common.notifications import notify_profiles
 from common.tasks import set_rls_context
+from crm.celery import app
 from opportunity.models import Opportunity
 
-app = Celery("redis://")
 
-
-@app.task
-def send_email_to_assigned_user(recipients, opportunity_id, org_id):
+@app.task(bind=True)
+def send_email_to_assigned_user(self, recipients, opportunity_id, org_id):
     """Send Mail To Users When they are assigned to an opportunity"""
     set_rls_context(org_id)
-    opportunity = Opportunity.objects.get(id=opportunity_id)
-    created_by = opportunity.created_by
-    for user in recipients:
-        recipients_list = []
-        profile = Profile.objects.filter(id=user, is_active=True).first()
-        if profile:
-            recipients_list.append(profile.user.email)
-            context = {}
-            context["url"] = settings.DOMAIN_NAME
-            context["user"] = profile.user
-            context["opportunity"] = opportunity
-            context["created_by"] = created_by
-            subject = "Assigned an opportunity for you."
-            html_content = render_to_string(
-                "assigned_to/opportunity_assigned.html", context=context
-            )
-
-            msg = EmailMessage(subject, html_content, to=recipients_list)
-            msg.content_subtype = "html"
-            msg.send()
+    opportunity = Opportunity.objects.select_related("created_by").filter(id=opportunity_id).first()
+    if not opportunity:
+        return 0
+    return notify_profiles(
+        self,
+        recipients,
+        org_id,
+        "Assigned an opportunity for you.",
+        "assigned_to/opportunity_assigned.html",
+        {
+            "url": settings.DOMAIN_NAME,
+            "opportunity": opportunity,
+            "created_by": opportunity.created_by,
+        },
+    )
@@ -1,36 +1,42 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account
-from accounts.serializer import AccountSerializer, TagsSerializer
+from accounts.serializer import AccountListSerializer, TagsSerializer
+from common.conditional import conditional_detail
+from common.facets import facet_counts
+from common.meta import include_reference_data
 from common.models import Attachments, Comment, Profile, Tags, Teams
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from common.serializer import (
     AttachmentsSerializer,
     CommentSerializer,
     ProfileSerializer,
 )
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
 from common.utils import CURRENCY_CODES, SOURCES, STAGES
+from common.visibility import filter_visible
 from contacts.models import Contact
-from contacts.serializer import ContactSerializer
+from contacts.serializer import ContactListSerializer, ContactSerializer
 from opportunity import swagger_params
+from opportunity.filters import OpportunityFilterSet
 from opportunity.models import Opportunity
 from opportunity.serializer import (
     OpportunityCreateSerializer,
     OpportunityCreateSwaggerSerializer,
     OpportunityDetailEditSwaggerSerializer,
+    OpportunityListSerializer,
     OpportunitySerializer,
 )
 from opportunity.tasks import send_email_to_assigned_user
 
 
-class OpportunityListView(APIView, LimitOffsetPagination):
+class OpportunityListView(APIView, CRMListPagination):
 
     permission_classes = (IsAuthenticated, HasOrgContext)
     model = Opportunity
@@ -43,74 +49,50 @@ class OpportunityListView(APIView, LimitOffsetPagination):
         accounts = Account.objects.filter(org=self.request.profile.org)
         contacts = Contact.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.user.is_superuser:
-            queryset = queryset.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-            accounts = accounts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-            contacts = contacts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-
-        if params:
-            if params.get("name"):
-                queryset = queryset.filter(name__icontains=params.get("name"))
-            if params.get("account"):
-                queryset = queryset.filter(account=params.get("account"))
-            if params.get("stage"):
-                queryset = queryset.filter(stage__contains=params.get("stage"))
-            if params.get("lead_source"):
-                queryset = queryset.filter(
-                    lead_source__contains=params.get("lead_source")
-                )
-            if params.get("tags"):
-                queryset = queryset.filter(tags__in=params.get("tags")).distinct()
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.getlist("assigned_to")
-                ).distinct()
-            if params.get("search"):
-                queryset = queryset.filter(name__icontains=params.get("search"))
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
-            if params.get("closed_on__gte"):
-                queryset = queryset.filter(closed_on__gte=params.get("closed_on__gte"))
-            if params.get("closed_on__lte"):
-                queryset = queryset.filter(closed_on__lte=params.get("closed_on__lte"))
-            if params.get("amount__gte"):
-                queryset = queryset.filter(amount__gte=params.get("amount__gte"))
-            if params.get("amount__lte"):
-                queryset = queryset.filter(amount__lte=params.get("amount__lte"))
+            queryset = filter_visible(queryset, self.request.profile)
+            accounts = filter_visible(accounts, self.request.profile)
+            contacts = filter_visible(contacts, self.request.profile)
+
+        queryset = OpportunityFilterSet(params, queryset).filter_queryset()
 
         context = {}
-        results_opportunities = self.paginate_queryset(
-            queryset.distinct(), self.request, view=self
+        # Total and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(queryset, fields=["stage"])
+        context["facets"] = facets
+
+        options = OpportunityListSerializer.sparse_options(self.request)
+        results_opportunities, page = self.paginate_list(
+            OpportunityListSerializer.setup_queryset(queryset, **options),
+            self.request,
+            "opportunities",
+            count=facets["total"] if facets else None,
         )
-        opportunities = OpportunitySerializer(results_opportunities, many=True).data
-        if results_opportunities:
-            offset = queryset.filter(id__gte=results_opportunities[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        opportunities = OpportunityListSerializer(
+            results_opportunities, many=True, **options
+        ).data
         context["per_page"] = 10
         page_number = (int(self.offset / 10) + 1,)
         context["page_number"] = page_number
         context.update(
             {
-                "opportunities_count": self.count,
-                "offset": offset,
+                "opportunities_count": page["count"],
+                "offset": page["offset"],
+                "next_cursor": page["next_cursor"],
+                "previous_cursor": page["previous_cursor"],
             }
         )
         context["opportunities"] = opportunities
-        context["accounts_list"] = AccountSerializer(accounts, many=True).data
-        context["contacts_list"] = ContactSerializer(contacts, many=True).data
+        if not include_reference_data(self.request):
+            return context
+
+        context["accounts_list"] = AccountListSerializer(
+            AccountListSerializer.setup_queryset(accounts), many=True
+        ).data
+        context["contacts_list"] = ContactListSerializer(
+            ContactListSerializer.setup_queryset(contacts), many=True
+        ).data
         context["tags"] = TagsSerializer(
             Tags.objects.filter(org=self.request.profile.org), many=True
         ).data
@@ -123,22 +105,27 @@ class OpportunityListView(APIView, LimitOffsetPagination):
     @extend_schema(
         operation_id="opportunities_list",
         tags=["Opportunities"],
-        parameters=swagger_params.opportunity_list_get_params,
+        parameters=swagger_params.opportunity_list_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
         responses={
             200: inline_serializer(
                 name="OpportunityListResponse",
                 fields={
-                    "opportunities_count": serializers.IntegerField(),
+                    "opportunities_count": serializers.IntegerField(allow_null=True),
                     "offset": serializers.IntegerField(allow_null=True),
+                    "next_cursor": serializers.CharField(allow_null=True),
+                    "previous_cursor": serializers.CharField(allow_null=True),
                     "per_page": serializers.IntegerField(),
                     "page_number": serializers.IntegerField(),
-                    "opportunities": OpportunitySerializer(many=True),
-                    "accounts_list": AccountSerializer(many=True),
-                    "contacts_list": ContactSerializer(many=True),
+                    "opportunities": OpportunityListSerializer(many=True),
+                    "accounts_list": AccountListSerializer(many=True),
+                    "contacts_list": ContactListSerializer(many=True),
                     "tags": TagsSerializer(many=True),
                     "stage": serializers.ListField(),
                     "lead_source": serializers.ListField(),
                     "currency": serializers.ListField(),
+                    "facets": serializers.DictField(allow_null=True),
                 },
             )
         },
@@ -416,6 +403,14 @@ class OpportunityDetailView(APIView):
             )
         },
     )
+    @conditional_detail(
+        Opportunity,
+        related=[
+            ("contacts.Contact", "opportunity_contacts"),
+            ("common.Tags", "opportunity_tags"),
+            ("common.Profile", "opportunity_assigned_users"),
+        ],
+    )
     def get(self, request, pk, format=None):
         self.opportunity = self.get_object(pk=pk)
         context = {}
@@ -479,19 +474,24 @@ class OpportunityDetailView(APIView):
                 "contacts": ContactSerializer(
                     self.opportunity.contacts.all(), many=True
                 ).data,
-                "users": ProfileSerializer(
-                    Profile.objects.filter(
-                        is_active=True, org=self.request.profile.org
-                    ).order_by("user__email"),
-                    many=True,
-                ).data,
-                "stage": STAGES,
-                "lead_source": SOURCES,
-                "currency": CURRENCY_CODES,
                 "comment_permission": comment_permission,
                 "users_mention": users_mention,
             }
         )
+        if include_reference_data(self.request):
+            context.update(
+                {
+                    "users": ProfileSerializer(
+                        Profile.objects.filter(
+                            is_active=True, org=self.request.profile.org
+                        ).order_by("user__email"),
+                        many=True,
+                    ).data,
+                    "stage": STAGES,
+                    "lead_source": SOURCES,
+                    "currency": CURRENCY_CODES,
+                }
+            )
         return Response(context)
 
     @extend_schema(
@@ -0,0 +1,21 @@
+from common.filters import ContainsFilter, Filter, FilterSet, RelatedFilter
+from tasks.models import Task
+
+
+class TaskFilterSet(FilterSet):
+    model = Task
+
+    title = ContainsFilter("title")
+    status = Filter("status")
+    priority = Filter("priority")
+    assigned_to = RelatedFilter("assigned_to")
+    tags = RelatedFilter("tags")
+    search = ContainsFilter("title")
+    due_date__gte = Filter("due_date", "gte")
+    due_date__lte = Filter("due_date", "lte")
+    created_at__gte = Filter("created_at", "gte")
+    created_at__lte = Filter("created_at", "lte")
+    account = Filter("account")
+    opportunity = Filter("opportunity")
+    case = Filter("case")
+    lead = Filter("lead")
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from common.filters import add_trigram_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_alter_board_created_by_alter_board_updated_by_and_more"),
+    ]
+
+    operations = [
+        add_trigram_indexes("tasks.Task", ("title",)),
+    ]
@@ -206,6 +206,9 @@ class Task(AssignableMixin, BaseModel):
 
     PRIORITY_CHOICES = (("Low", "Low"), ("Medium", "Medium"), ("High", "High"))
 
+    # Substring filters with a trigram index (common.filters)
+    TRIGRAM_FIELDS = ("title",)
+
     title = models.CharField(_("title"), max_length=200)
     status = models.CharField(_("status"), max_length=50, choices=STATUS_CHOICES)
     priority = models.CharField(_("priority"), max_length=50, choices=PRIORITY_CHOICES)
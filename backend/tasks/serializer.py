@@ -2,14 +2,27 @@ from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from common.serializer import (
+    ATTACHMENT_RELATION,
+    COMMENT_RELATION,
+    PROFILE_RELATION,
+    TAG_RELATION,
+    TEAM_RELATION,
+    USER_RELATION,
     AttachmentsSerializer,
     CommentSerializer,
     ProfileSerializer,
+    ProfileSummarySerializer,
     TagsSerializer,
     TeamsSerializer,
+    TeamSummarySerializer,
     UserSerializer,
 )
-from contacts.serializer import ContactSerializer
+from common.sparse_fields import SparseFieldsMixin, SparseListSerializer
+from contacts.serializer import (
+    CONTACT_RELATION,
+    ContactSerializer,
+    ContactSummarySerializer,
+)
 from tasks.models import Board, BoardColumn, BoardMember, BoardTask, Task
 
 
@@ -171,6 +184,51 @@ class TaskSerializer(serializers.ModelSerializer):
         )
 
 
+class TaskListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact Task for list rows (see common.sparse_fields)"""
+
+    created_by = UserSerializer(read_only=True)
+    assigned_to = ProfileSummarySerializer(read_only=True, many=True)
+    contacts = ContactSummarySerializer(read_only=True, many=True)
+    teams = TeamSummarySerializer(read_only=True, many=True)
+    tags = TagsSerializer(read_only=True, many=True)
+    task_attachment = AttachmentsSerializer(read_only=True, many=True)
+    task_comments = CommentSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Task
+        list_serializer_class = SparseListSerializer
+        fields = (
+            "id",
+            "title",
+            "status",
+            "priority",
+            "due_date",
+            "description",
+            "account",
+            "opportunity",
+            "case",
+            "lead",
+            "created_by",
+            "created_at",
+            "contacts",
+            "teams",
+            "assigned_to",
+            "tags",
+            "task_attachment",
+            "task_comments",
+        )
+        relations = {
+            "created_by": USER_RELATION,
+            "assigned_to": PROFILE_RELATION,
+            "contacts": CONTACT_RELATION,
+            "teams": TEAM_RELATION,
+            "tags": TAG_RELATION,
+            "task_attachment": ATTACHMENT_RELATION,
+            "task_comments": COMMENT_RELATION,
+        }
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     def __init__(self, *args, **kwargs):
         request_obj = kwargs.pop("request_obj", None)
@@ -1,17 +1,19 @@
 import json
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import serializers, status
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.models import Account
-from accounts.serializer import AccountSerializer
+from accounts.serializer import AccountListSerializer
+from common.conditional import conditional_detail
+from common.facets import facet_counts
+from common.meta import include_reference_data
 from common.models import Attachments, Comment, Profile, Tags, Teams
+from common.pagination import CRMListPagination
 from common.permissions import HasOrgContext
 from common.serializer import (
     AttachmentsSerializer,
@@ -19,21 +21,25 @@ from common.serializer import (
     ProfileSerializer,
     TeamsSerializer,
 )
+from common.swagger_params import cursor_pagination_params, sparse_fieldset_params
+from common.visibility import filter_visible
 from contacts.models import Contact
-from contacts.serializer import ContactSerializer
+from contacts.serializer import ContactListSerializer
 from tasks import swagger_params
+from tasks.filters import TaskFilterSet
 from tasks.models import Task
 from tasks.serializer import (
     TaskCommentEditSwaggerSerializer,
     TaskCreateSerializer,
     TaskCreateSwaggerSerializer,
     TaskDetailEditSwaggerSerializer,
+    TaskListSerializer,
     TaskSerializer,
 )
 from tasks.utils import PRIORITY_CHOICES, STATUS_CHOICES
 
 
-class TaskListView(APIView, LimitOffsetPagination):
+class TaskListView(APIView, CRMListPagination):
     model = Task
     permission_classes = (IsAuthenticated, HasOrgContext)
 
@@ -45,89 +51,69 @@ class TaskListView(APIView, LimitOffsetPagination):
         accounts = Account.objects.filter(org=self.request.profile.org)
         contacts = Contact.objects.filter(org=self.request.profile.org)
         if self.request.profile.role != "ADMIN" and not self.request.profile.is_admin:
-            queryset = queryset.filter(
-                Q(assigned_to__in=[self.request.profile])
-                | Q(created_by=self.request.profile.user)
-            )
-            accounts = accounts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-            contacts = contacts.filter(
-                Q(created_by=self.request.profile.user)
-                | Q(assigned_to=self.request.profile)
-            ).distinct()
-
-        if params:
-            if params.get("title"):
-                queryset = queryset.filter(title__icontains=params.get("title"))
-            if params.get("status"):
-                queryset = queryset.filter(status=params.get("status"))
-            if params.get("priority"):
-                queryset = queryset.filter(priority=params.get("priority"))
-            if params.getlist("assigned_to"):
-                queryset = queryset.filter(
-                    assigned_to__id__in=params.getlist("assigned_to")
-                ).distinct()
-            if params.get("tags"):
-                queryset = queryset.filter(tags__id__in=params.getlist("tags")).distinct()
-            if params.get("search"):
-                queryset = queryset.filter(title__icontains=params.get("search"))
-            if params.get("due_date__gte"):
-                queryset = queryset.filter(due_date__gte=params.get("due_date__gte"))
-            if params.get("due_date__lte"):
-                queryset = queryset.filter(due_date__lte=params.get("due_date__lte"))
-            if params.get("created_at__gte"):
-                queryset = queryset.filter(created_at__gte=params.get("created_at__gte"))
-            if params.get("created_at__lte"):
-                queryset = queryset.filter(created_at__lte=params.get("created_at__lte"))
-            if params.get("account"):
-                queryset = queryset.filter(account_id=params.get("account"))
-            if params.get("opportunity"):
-                queryset = queryset.filter(opportunity_id=params.get("opportunity"))
-            if params.get("case"):
-                queryset = queryset.filter(case_id=params.get("case"))
-            if params.get("lead"):
-                queryset = queryset.filter(lead_id=params.get("lead"))
+            queryset = filter_visible(queryset, self.request.profile)
+            accounts = filter_visible(accounts, self.request.profile)
+            contacts = filter_visible(contacts, self.request.profile)
+
+        queryset = TaskFilterSet(params, queryset).filter_queryset()
+
         context = {}
-        results_tasks = self.paginate_queryset(
-            queryset.distinct(), self.request, view=self
+        # Total and sidebar counts in one query (skipped in cursor mode)
+        facets = None
+        if not self.use_cursor(self.request):
+            facets = facet_counts(queryset, fields=["status", "priority"])
+        context["facets"] = facets
+
+        options = TaskListSerializer.sparse_options(self.request)
+        results_tasks, page = self.paginate_list(
+            TaskListSerializer.setup_queryset(queryset, **options),
+            self.request,
+            "tasks",
+            count=facets["total"] if facets else None,
         )
-        tasks = TaskSerializer(results_tasks, many=True).data
-        if results_tasks:
-            offset = queryset.filter(id__gte=results_tasks[-1].id).count()
-            if offset == queryset.count():
-                offset = None
-        else:
-            offset = 0
+        tasks = TaskListSerializer(results_tasks, many=True, **options).data
         context.update(
             {
-                "tasks_count": self.count,
-                "offset": offset,
+                "tasks_count": page["count"],
+                "offset": page["offset"],
+                "next_cursor": page["next_cursor"],
+                "previous_cursor": page["previous_cursor"],
             }
         )
         context["tasks"] = tasks
+        if not include_reference_data(self.request):
+            return context
+
         context["status"] = STATUS_CHOICES
         context["priority"] = PRIORITY_CHOICES
-        context["accounts_list"] = AccountSerializer(accounts, many=True).data
-        context["contacts_list"] = ContactSerializer(contacts, many=True).data
+        context["accounts_list"] = AccountListSerializer(
+            AccountListSerializer.setup_queryset(accounts), many=True
+        ).data
+        context["contacts_list"] = ContactListSerializer(
+            ContactListSerializer.setup_queryset(contacts), many=True
+        ).data
         return context
 
     @extend_schema(
         tags=["Tasks"],
         operation_id="tasks_list",
-        parameters=swagger_params.task_list_get_params,
+        parameters=swagger_params.task_list_get_params
+        + cursor_pagination_params
+        + sparse_fieldset_params,
         responses={
             200: inline_serializer(
                 name="TaskListResponse",
                 fields={
-                    "tasks_count": serializers.IntegerField(),
+                    "tasks_count": serializers.IntegerField(allow_null=True),
                     "offset": serializers.IntegerField(allow_null=True),
-                    "tasks": TaskSerializer(many=True),
+                    "next_cursor": serializers.CharField(allow_null=True),
+                    "previous_cursor": serializers.CharField(allow_null=True),
+                    "tasks": TaskListSerializer(many=True),
                     "status": serializers.ListField(),
                     "priority": serializers.ListField(),
-                    "accounts_list": AccountSerializer(many=True),
-                    "contacts_list": ContactSerializer(many=True),
+                    "accounts_list": AccountListSerializer(many=True),
+                    "contacts_list": ContactListSerializer(many=True),
+                    "facets": serializers.DictField(allow_null=True),
                 },
             )
         },
@@ -317,7 +303,10 @@ class TaskDetailView(APIView):
         context["users_excluding_team"] = ProfileSerializer(
             users_excluding_team, many=True
         ).data
-        context["teams"] = TeamsSerializer(Teams.objects.filter(org=self.request.profile.org), many=True).data
+        if include_reference_data(self.request):
+            context["teams"] = TeamsSerializer(
+                Teams.objects.filter(org=self.request.profile.org), many=True
+            ).data
         return context
 
     @extend_schema(
@@ -340,6 +329,14 @@ class TaskDetailView(APIView):
             )
         },
     )
+    @conditional_detail(
+        Task,
+        related=[
+            ("contacts.Contact", "task_contacts"),
+            ("common.Tags", "task_tags"),
+            ("common.Profile", "task_assigned_users"),
+        ],
+    )
     def get(self, request, pk, **kwargs):
         self.task_obj = self.get_object(pk)
         context = self.get_context_data(**kwargs)
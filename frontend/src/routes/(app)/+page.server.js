@@ -29,7 +29,8 @@ export async function load({ locals, cookies }) {
 		// Django returns:
 		// {
 		//   accounts_count, contacts_count, leads_count, opportunities_count,
-		//   accounts: [], contacts: [], leads: [], opportunities: []
+		//   opportunities_amount,
+		//   accounts: [], contacts: [], leads: [], opportunities: [] (most recent first)
 		// }
 
 		// Transform recent leads
@@ -59,11 +60,9 @@ export async function load({ locals, cookies }) {
 				: null
 		}));
 
-		// Calculate opportunity revenue (sum of all opportunity amounts)
-		const opportunityRevenue = (dashboardResponse.opportunities || []).reduce(
-			(sum, opp) => sum + (opp.amount ? parseFloat(opp.amount) : 0),
-			0
-		);
+		// Opportunity revenue (sum of all opportunity amounts in org currency,
+		// computed server-side; the opportunities list only holds the most recent ones)
+		const opportunityRevenue = dashboardResponse.opportunities_amount || 0;
 
 		// Tasks and activities now come from dashboard response (no separate API calls)
 		// Transform tasks from dashboard response
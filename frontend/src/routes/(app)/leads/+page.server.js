@@ -51,6 +51,8 @@ export async function load({ url, cookies, locals }) {
 	filters.tags.forEach((id) => queryParams.append('tags', id));
 	if (filters.created_at_gte) queryParams.append('created_at__gte', filters.created_at_gte);
 	if (filters.created_at_lte) queryParams.append('created_at__lte', filters.created_at_lte);
+	// Comments and attachments (drawer) are only in expanded rows
+	queryParams.append('expand', 'lead_comments,lead_attachment');
 
 	try {
 		// Django leads endpoint with filter params